@@ -0,0 +1,179 @@
+import asyncio
+import time
+
+import discord
+from discord.ext import commands
+
+import cache
+import comum
+import config
+import dados
+import db
+import encontros
+import envio
+import gateway
+import rng
+import shards
+import simulador
+import xp
+
+# ----------------------------
+# Fábrica do bot
+# ----------------------------
+# Importar este módulo (ou qualquer cog) não abre o banco nem conecta ao
+# Discord: criar_bot() só monta o bot a partir da Config, o banco abre na
+# primeira consulta (db.py) e os comandos vêm das extensões em cogs/, que
+# podem ser recarregadas com o bot no ar (!recarregar). Cada etapa da subida
+# fica medida em bot.partida (ms desde criar_bot()).
+class BotRPG(commands.Bot):
+    def __init__(self, cfg, escritor=None, **opcoes):
+        # Intents e caches do perfil de gateway da config (gateway.py; padrão: enxuto, sem cache de membros)
+        super().__init__(command_prefix=cfg.prefixo, help_command=None, **gateway.opcoes(cfg.gateway), **opcoes)
+        self.config = cfg
+        self.escritor = escritor   # shards.Cliente quando as escritas vão para o processo escritor
+        self.criado_em = time.perf_counter()
+        self.partida = {}
+
+    def _marcar(self, etapa):
+        self.partida[etapa] = (time.perf_counter() - self.criado_em) * 1000
+
+    # As respostas dos comandos de texto saem pela fila de envio do canal (envio.py)
+    async def get_context(self, origem, *, cls=envio.Contexto):
+        return await super().get_context(origem, cls=cls)
+
+    async def setup_hook(self):
+        if self.escritor is not None:
+            # Antes de carregar os caches: o que outro shard mudar daqui em diante já chega
+            self.escritor.escutar(asyncio.get_running_loop())
+        for extensao in self.config.extensoes:
+            await self.load_extension(extensao)
+        self._marcar("extensoes")
+        # Aquece o cache de personagens ativos e os índices de autocomplete antes do
+        # primeiro comando chegar (a primeira consulta também migra o banco, se precisar)
+        await comum.carregar_ativos()
+        await comum.carregar_indices()
+        self._marcar("banco")
+        # Registra os comandos de barra (/skill, /usar, /set...) no Discord
+        if self.config.sincronizar:
+            try:
+                await self.tree.sync()
+            except discord.HTTPException as e:
+                print(f"[SLASH] Falha ao sincronizar comandos de barra: {e}")
+            self._marcar("comandos_barra")
+
+    async def on_ready(self):
+        # on_ready volta a disparar a cada reconexão; a subida só é medida na primeira
+        if "pronto" not in self.partida:
+            self._marcar("pronto")
+            etapas = " | ".join(f"{etapa} {ms:.0f} ms" for etapa, ms in self.partida.items())
+            print(f"[PARTIDA] {etapas}")
+            if self.shard_count:
+                ids = getattr(self, "shard_ids", None) or [self.shard_id]
+                print(f"[SHARDS] Shards {', '.join(map(str, ids))} de {self.shard_count} prontos.")
+        print(f'✅ Bot RPG {self.user} online e completo!')
+
+    async def recarregar(self, extensao=None):
+        """
+        Recarrega uma extensão ("skills" ou "cogs.skills") ou todas as carregadas,
+        sem reiniciar o bot. Só o módulo da extensão é relido (comum.py e os
+        outros módulos continuam os mesmos). Retorna [(extensão, ms)].
+        """
+        if extensao:
+            alvos = [extensao if "." in extensao else f"cogs.{extensao}"]
+        else:
+            alvos = list(self.extensions)
+        tempos = []
+        for nome in alvos:
+            inicio = time.perf_counter()
+            if nome in self.extensions:
+                await self.reload_extension(nome)
+            else:
+                await self.load_extension(nome)
+            tempos.append((nome, (time.perf_counter() - inicio) * 1000))
+        return tempos
+
+    # ----------------------------
+    # Handler global de erros de comando
+    # ----------------------------
+    async def on_command_error(self, ctx, error):
+        # Evita duplicar mensagens se outro handler já tratou
+        if hasattr(ctx.command, "on_error"):
+            return
+
+        # Comando não encontrado -> sugere helpdados
+        if isinstance(error, commands.CommandNotFound):
+            await ctx.send(f"❓ Comando não reconhecido. Dê uma olhada em `!helpdados` para os comandos disponíveis.")
+            return
+
+        # Falta de argumento obrigatório
+        if isinstance(error, commands.MissingRequiredArgument):
+            await ctx.send(f"❌ Faltou um argumento: `{error.param}`. Veja `!helpdados` para o formato correto do comando.")
+            return
+
+        # Argumento inválido (tipo errado)
+        if isinstance(error, commands.BadArgument):
+            await ctx.send("❌ Argumento inválido. Verifique os tipos/valores e consulte `!helpdados`.")
+            return
+
+        # Muitos argumentos
+        if isinstance(error, commands.TooManyArguments):
+            await ctx.send("❌ Muitos argumentos fornecidos. Confira o formato em `!helpdados`.")
+            return
+
+        # Permissões
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("🔒 Você não tem permissão para usar este comando.")
+            return
+
+        # Erros inesperados: loga no console e avisa o usuário de forma genérica
+        # (mantemos a mensagem curta para não vazar detalhes internos)
+        print(f"[ERROR] Comando: {ctx.command} | Usuário: {ctx.author} | Erro: {error}")
+        await ctx.send("⚠️ Ocorreu um erro ao executar o comando. Tente novamente ou consulte `!helpdados`.")
+
+class BotRPGShards(BotRPG, commands.AutoShardedBot):
+    """BotRPG com vários shards num processo só (RPG_SHARDS); RPG_SHARD_IDS escolhe quais."""
+
+    def __init__(self, cfg, escritor=None):
+        super().__init__(cfg, escritor, shard_count=cfg.shards or None,
+                         shard_ids=list(cfg.shard_ids) if cfg.shard_ids is not None else None)
+
+def _carregar_config():
+    # Variável de ambiente mal formada: sai com a mensagem, sem traceback
+    try:
+        return config.carregar()
+    except ValueError as e:
+        raise SystemExit(f"❌ Configuração inválida: {e}")
+
+def criar_bot(cfg=None, escritor=None):
+    """
+    Monta o bot a partir da Config (por padrão, das variáveis de ambiente) sem
+    abrir banco nem conexão. `escritor` é um shards.Cliente quando este
+    processo é um dos shards de rodar() com RPG_PROCESSOS > 1.
+    """
+    cfg = cfg or _carregar_config()
+    db.DB_FILE = cfg.banco
+    xp.carregar_curvas(cfg.curvas_xp)
+    dados.configurar(cfg.limite_dados, cfg.limite_faces)
+    cache.fichas.limite = cfg.cache_fichas
+    if escritor is not None:
+        db.usar_escritor(escritor)
+    classe = BotRPG if cfg.shards is None else BotRPGShards
+    return classe(cfg, escritor)
+
+def _rodar_bot(cfg, escritor=None):
+    # escritor: (endereço, chave) do processo escritor, vindo de shards.rodar_processos()
+    cliente = shards.Cliente(*escritor) if escritor is not None else None
+    criar_bot(cfg, cliente).run(cfg.token)
+    asyncio.run(encontros.descarregar())
+    asyncio.run(rng.descarregar())
+    simulador.fechar()
+    db.fechar()
+
+def rodar(cfg=None):
+    cfg = cfg or _carregar_config()
+    if not cfg.token:
+        raise SystemExit("❌ Defina o token do bot em RPG_TOKEN (ou DISCORD_TOKEN).")
+    if cfg.processos > 1:
+        shards.rodar_processos(cfg, _rodar_bot)
+    else:
+        _rodar_bot(cfg)
@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import busca
+import db
+
+# ----------------------------
+# Benchmark: busca de skills (LIKE x FTS5)
+# ----------------------------
+# !skills <filtro>: LIKE '%x%' em nome/descrição (caminho antigo, varre todas as
+# skills do personagem) x índice FTS5 skills_busca com relevância, primeira página.
+# Uso: python benchmarks/bench_busca.py [skills_por_personagem] [repeticoes]
+SILABAS = ["fo", "go", "ge", "lo", "ra", "io", "cu", "ve", "ne", "som", "bra", "luz", "ter", "ven",
+           "san", "lâ", "mi", "na", "es", "cu", "do", "po", "ção", "gri", "to", "gol", "pe", "chu", "va", "mu"]
+PERSONAGENS = 20
+UID, NOME = "0", "P0"
+
+def vocabulario(rng, tamanho=3000):
+    palavras = set()
+    while len(palavras) < tamanho:
+        palavras.add("".join(rng.choices(SILABAS, k=rng.randint(2, 4))))
+    return sorted(palavras)
+
+def popular(conn, por_personagem):
+    rng = random.Random(1)
+    palavras = vocabulario(rng)
+    # Frequência tipo Zipf: poucas palavras muito comuns, a maioria rara
+    pesos = [1 / (i + 1) for i in range(len(palavras))]
+    linhas = []
+    for p in range(PERSONAGENS):
+        for i in range(por_personagem):
+            nome = " ".join(rng.choices(palavras, pesos, k=2)) + f" {i}"
+            desc = " ".join(rng.choices(palavras, pesos, k=12))
+            linhas.append((str(p), f"P{p}", nome, "2d6", desc, "dano"))
+    conn.executemany("""INSERT INTO skills (user_id, nome_personagem, nome_skill, dano_formula, descricao, tipo)
+                        VALUES (?, ?, ?, ?, ?, ?)""", linhas)
+    conn.commit()
+
+def like(conn, termo):
+    padrao = f"%{termo}%"
+    return conn.execute("""SELECT nome_skill, dano_formula, descricao, tipo FROM skills
+                           WHERE user_id = ? AND nome_personagem = ? AND
+                           (LOWER(nome_skill) LIKE ? OR LOWER(descricao) LIKE ?)
+                           ORDER BY nome_skill LIMIT 13""", (UID, NOME, padrao, padrao)).fetchall()
+
+def fts(conn, termo):
+    return conn.execute(f"""SELECT {busca.RELEVANCIA}, s.id, s.nome_skill, s.dano_formula, s.descricao, s.tipo
+                            FROM skills_busca JOIN skills s ON s.id = skills_busca.rowid
+                            WHERE skills_busca MATCH ? AND s.user_id = ? AND s.nome_personagem = ?
+                            ORDER BY {busca.RELEVANCIA}, s.id LIMIT 13""",
+                        (busca.consulta_prefixo(termo), UID, NOME)).fetchall()
+
+def medir(fn, conn, termos, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for termo in termos:
+            fn(conn, termo)
+    return (time.perf_counter() - inicio) * 1000 / (repeticoes * len(termos))
+
+def main(por_personagem, repeticoes):
+    with tempfile.TemporaryDirectory() as pasta:
+        db.DB_FILE = os.path.join(pasta, "bench.db")
+        db.iniciar_db()
+        conn = db.abrir_conexao()
+        popular(conn, por_personagem)
+        print(f"{PERSONAGENS * por_personagem} skills ({por_personagem} por personagem)")
+        palavras = vocabulario(random.Random(1))
+        comum, media, rara = palavras[0], palavras[len(palavras) // 10], palavras[-1]
+        print(f"{'termo':<16} {'LIKE (ms)':>10} {'FTS5 (ms)':>10}")
+        for termo in (comum, media, rara, rara[:3], f"{media} {rara[:3]}", "xyz"):
+            print(f"{termo:<16} {medir(like, conn, [termo], repeticoes):>10.2f} {medir(fts, conn, [termo], repeticoes):>10.2f}")
+        conn.close()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20)
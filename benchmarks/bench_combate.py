@@ -0,0 +1,98 @@
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+import db
+import encontros
+import rng
+
+# ----------------------------
+# Benchmark: gravação da vida em combate
+# ----------------------------
+# Combates por turnos (encontros.py) em vários canais ao mesmo tempo, com a
+# vida gravada no banco de dois jeitos:
+#   • a cada golpe (uma transação por acerto, como se cada golpe virasse um
+#     !ferimento);
+#   • no fim da rodada (o que o encontro faz): uma transação com o dano de
+#     todos os participantes.
+# Cada canal tem `participantes` personagens e cada um ataca uma vez por
+# rodada; a vida é alta para ninguém cair. Mede golpes por segundo, commits e
+# a espera de cada gravação, e confere se o dano em memória bate com o banco.
+# Uso: python benchmarks/bench_combate.py [canais] [participantes] [rodadas]
+CONSTITUICAO = 200_000
+
+def popular(caminho, canais, participantes):
+    db.DB_FILE = caminho
+    db.iniciar_db()
+    conn = sqlite3.connect(caminho)
+    conn.executemany("""INSERT INTO fichas (user_id, nome, foto_url, forca, velocidade, esquiva, constituicao,
+                        atordoamento, peste, doencas, sangramento, debuff, vida, arma_equipada)
+                        VALUES (?, ?, '', 15, ?, 5, ?, 0, 0, 0, 0, 0, NULL, 'Espada')""",
+                     [(str(c * 1000 + p), f"P{c}-{p}", p, CONSTITUICAO)
+                      for c in range(canais) for p in range(participantes)])
+    conn.executemany("INSERT INTO armas (user_id, nome_personagem, item_nome, nivel, d6) VALUES (?, ?, 'Espada', 3, 3)",
+                     [(str(c * 1000 + p), f"P{c}-{p}") for c in range(canais) for p in range(participantes)])
+    conn.commit()
+    conn.close()
+
+async def _canal(canal, participantes, rodadas, por_golpe, esperas):
+    fichas = []
+    for p in range(participantes):
+        user_id = canal * 1000 + p
+        fichas.append((user_id, await db.obter_ficha(user_id, f"P{canal}-{p}")))
+    fluxo = rng.Fluxo(f"bench-{canal}", registrar=False)
+    atual = encontros.iniciar(fluxo, canal, 0, fichas)
+    golpes = 0
+    while atual.rodada <= rodadas:
+        atacante = atual.atual
+        alvo = atual.ordem[(atual.vez + 1) % len(atual.ordem)]
+        encontros.atacar(fluxo, atacante, alvo)
+        golpes += 1
+        fechou = atual.avancar()
+        if (por_golpe or fechou) and any(p.dano_pendente for p in atual.ordem):
+            inicio = time.perf_counter()
+            await encontros.gravar(atual)
+            esperas.append(time.perf_counter() - inicio)
+        else:
+            await asyncio.sleep(0)   # outros canais também jogam entre um golpe e outro
+    dano = sum(p.vida_max - p.vida for p in atual.ordem)
+    await encontros.encerrar(canal)
+    return golpes, dano
+
+async def rodada(canais, participantes, rodadas, por_golpe):
+    esperas = []
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(_canal(c, participantes, rodadas, por_golpe, esperas) for c in range(canais)))
+    return time.perf_counter() - inicio, resultados, esperas
+
+def conferir(caminho):
+    conn = sqlite3.connect(caminho)
+    dano = conn.execute("SELECT SUM(constituicao * 5 - vida) FROM fichas").fetchone()[0]
+    conn.close()
+    return dano
+
+def main(canais, participantes, rodadas):
+    print(f"{canais} canais x {participantes} participantes x {rodadas} rodadas")
+    print(f"{'gravação':<14} {'golpes/s':>10} {'commits':>8} {'espera p50 (ms)':>16} {'p99 (ms)':>9} {'banco confere':>14}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for i, (rotulo, por_golpe) in enumerate((("a cada golpe", True), ("por rodada", False))):
+            caminho = os.path.join(pasta, f"combate{i}.db")
+            popular(caminho, canais, participantes)
+            segundos, resultados, esperas = asyncio.run(rodada(canais, participantes, rodadas, por_golpe))
+            db.fechar()
+            golpes = sum(g for g, _ in resultados)
+            confere = conferir(caminho) == sum(d for _, d in resultados)
+            esperas.sort()
+            print(f"{rotulo:<14} {golpes / segundos:>10.0f} {len(esperas):>8} {statistics.median(esperas) * 1000:>16.2f} "
+                  f"{esperas[int(len(esperas) * 0.99)] * 1000:>9.2f} {'sim' if confere else 'NÃO':>14}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 6,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 50)
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db
+
+UID, NOME = "1", "Kael"
+
+# ----------------------------
+# Benchmark: conexão por consulta x conexões persistentes
+# ----------------------------
+# Latência por comando: uma conexão nova por consulta (como era antes) x conexões persistentes do db.py.
+# Uso: python benchmarks/bench_conexao.py [repeticoes]
+
+async def popular():
+    db.iniciar_db()
+    await db.executar("""INSERT OR REPLACE INTO fichas (user_id, nome, foto_url, forca, velocidade, esquiva, constituicao,
+                   atordoamento, peste, doencas, sangramento, debuff, vida, arma_equipada, armadura_equipada)
+                   VALUES (?, ?, '', 10, 12, 15, 10, 0, 0, 0, 0, 5, 50, 'Espada', 'Couraça')""", (UID, NOME))
+    await db.executar("INSERT OR REPLACE INTO ativo VALUES (?, ?)", (UID, NOME))
+    await db.executar("INSERT OR REPLACE INTO armas VALUES (?, ?, 'Espada', 2, 2)", (UID, NOME))
+    await db.executar("INSERT OR REPLACE INTO armaduras VALUES (?, ?, 'Couraça', 1, 1, 2, 0)", (UID, NOME))
+
+def ficha_antes():
+    # get_ativo + ficha + equipamento, cada um com o próprio connect/close
+    conn = sqlite3.connect(db.DB_FILE)
+    conn.execute("SELECT nome_personagem FROM ativo WHERE user_id = ?", (UID,)).fetchone()
+    conn.close()
+    conn = sqlite3.connect(db.DB_FILE)
+    conn.execute("SELECT * FROM fichas WHERE user_id = ? AND nome = ?", (UID, NOME)).fetchone()
+    conn.close()
+    conn = sqlite3.connect(db.DB_FILE)
+    conn.execute("SELECT nivel, d6 FROM armas WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?", (UID, NOME, "Espada")).fetchone()
+    conn.execute("SELECT nivel, d6, bonus_esquiva, bonus_velocidade FROM armaduras WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?", (UID, NOME, "Couraça")).fetchone()
+    conn.close()
+
+async def ficha_depois():
+    await db.buscar_um("SELECT nome_personagem FROM ativo WHERE user_id = ?", (UID,))
+    await db.buscar_um("SELECT * FROM fichas WHERE user_id = ? AND nome = ?", (UID, NOME))
+    await db.buscar_um("SELECT nivel, d6 FROM armas WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?", (UID, NOME, "Espada"))
+    await db.buscar_um("SELECT nivel, d6, bonus_esquiva, bonus_velocidade FROM armaduras WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?", (UID, NOME, "Couraça"))
+
+def receber_antes():
+    conn = sqlite3.connect(db.DB_FILE)
+    conn.execute("SELECT nome_personagem FROM ativo WHERE user_id = ?", (UID,)).fetchone()
+    conn.close()
+    conn = sqlite3.connect(db.DB_FILE)
+    saldo = conn.execute("SELECT saldo FROM fichas WHERE user_id = ? AND nome = ?", (UID, NOME)).fetchone()[0]
+    conn.execute("UPDATE fichas SET saldo = ? WHERE user_id = ? AND nome = ?", (saldo + 1, UID, NOME))
+    conn.commit()
+    conn.close()
+
+async def receber_depois():
+    await db.buscar_um("SELECT nome_personagem FROM ativo WHERE user_id = ?", (UID,))
+    saldo = (await db.buscar_um("SELECT saldo FROM fichas WHERE user_id = ? AND nome = ?", (UID, NOME)))[0]
+    await db.executar("UPDATE fichas SET saldo = ? WHERE user_id = ? AND nome = ?", (saldo + 1, UID, NOME))
+
+async def medir(fn, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        if asyncio.iscoroutinefunction(fn):
+            await fn()
+        else:
+            fn()
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+async def main(repeticoes):
+    await popular()
+    print(f"{'comando':<10} {'antes (µs)':>12} {'depois (µs)':>12}")
+    for nome, antes, depois in (("!ficha", ficha_antes, ficha_depois), ("!receber", receber_antes, receber_depois)):
+        print(f"{nome:<10} {await medir(antes, repeticoes):>12.1f} {await medir(depois, repeticoes):>12.1f}")
+
+if __name__ == "__main__":
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as pasta:
+        db.DB_FILE = os.path.join(pasta, "bench.db")
+        asyncio.run(main(repeticoes))
+        db.fechar()
@@ -0,0 +1,77 @@
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dados
+import rng
+
+# ----------------------------
+# Benchmark: parse e rolagem de fórmulas
+# ----------------------------
+# Vazão de parse + rolagem: regex XdY refeito a cada chamada (como era antes) x
+# compilar a fórmula sempre (sem cache) x fórmula compilada vinda do cache.
+# Depois, paradas grandes: um randint por dado x sorteio em lote (numpy ou
+# random.choices, o que estiver disponível). Por fim, o d20 do !rolar: randint
+# global x lote pré-sorteado do fluxo do canal (rng.py) x fórmula com semente
+# derivada do fluxo.
+# Uso: python benchmarks/bench_dados.py [repeticoes]
+FORMULAS = ["2d6", "1d20", "3d8", "4d6kh3", "2d6+3", "(1d8+2)*2"]
+
+def antes(formula):
+    match = re.match(r"^\s*(\d+)\s*d\s*(\d+)\s*$", formula.lower())
+    if not match:
+        return None
+    qtd, faces = int(match.group(1)), int(match.group(2))
+    rolagens = [random.randint(1, faces) for _ in range(qtd)]
+    return rolagens, sum(rolagens)
+
+def sem_cache(formula):
+    return dados._compilar.__wrapped__(dados._normalizar(formula)).rolar()
+
+def com_cache(formula):
+    return dados.rolar(formula)
+
+def medir(fn, formulas, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for formula in formulas:
+            fn(formula)
+    return repeticoes * len(formulas) / (time.perf_counter() - inicio)
+
+def main(repeticoes):
+    simples = [f for f in FORMULAS if re.match(r"^\d+d\d+$", f)]
+    print(f"{'caminho':<26} {'fórmulas':<10} {'rolagens/s':>12}")
+    print(f"{'regex XdY (antigo)':<26} {'XdY':<10} {medir(antes, simples, repeticoes):>12,.0f}")
+    for nome, fn in (("compila sempre", sem_cache), ("cache de compiladas", com_cache)):
+        print(f"{nome:<26} {'XdY':<10} {medir(fn, simples, repeticoes):>12,.0f}")
+        print(f"{nome:<26} {'todas':<10} {medir(fn, FORMULAS, repeticoes):>12,.0f}")
+    print(dados._compilar.cache_info())
+
+    print(f"\n{'parada':<14} {'randint (ms)':>13} {'lote (ms)':>10}   backend: {'numpy' if dados.np is not None else 'random.choices'}")
+    for qtd in (1000, 100000, 1000000):
+        inicio = time.perf_counter()
+        sum(random.randint(1, 6) for _ in range(qtd))
+        t_antes = (time.perf_counter() - inicio) * 1000
+        inicio = time.perf_counter()
+        dados.rolar(f"{qtd}d6")
+        t_lote = (time.perf_counter() - inicio) * 1000
+        print(f"{f'{qtd}d6':<14} {t_antes:>13.1f} {t_lote:>10.1f}")
+
+    fluxo = rng.Fluxo("bench", registrar=False)
+    compilada = dados.compilar("1d20")
+
+    def formula_do_fluxo(_):
+        _, gerador = fluxo.gerador()
+        return compilada.rolar(gerador)
+
+    print(f"\n{'d20':<26} {'rolagens/s':>12}")
+    for nome, fn in (("random.randint", lambda _: random.randint(1, 20)),
+                     ("fluxo: lote de d20", lambda _: fluxo.dado(20)),
+                     ("fluxo: fórmula 1d20", formula_do_fluxo)):
+        print(f"{nome:<26} {medir(fn, [None], repeticoes * 5):>12,.0f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
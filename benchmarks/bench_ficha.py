@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db
+
+UID, NOME = "1", "Kael"
+
+# ----------------------------
+# Benchmark: leitura da !ficha
+# ----------------------------
+# !ficha: ficha + arma + armadura em três SELECTs (caminho antigo) x uma consulta na
+# visão fichas_equipadas x obter_ficha() com o cache quente.
+# Uso: python benchmarks/bench_ficha.py [repeticoes]
+
+async def popular():
+    db.iniciar_db()
+    await db.executar("""INSERT OR REPLACE INTO fichas (user_id, nome, foto_url, forca, velocidade, esquiva, constituicao,
+                   atordoamento, peste, doencas, sangramento, debuff, vida, arma_equipada, armadura_equipada)
+                   VALUES (?, ?, '', 10, 12, 15, 10, 0, 0, 0, 0, 5, 50, 'Espada', 'Couraça')""", (UID, NOME))
+    await db.executar("INSERT OR REPLACE INTO armas VALUES (?, ?, 'Espada', 2, 2)", (UID, NOME))
+    await db.executar("INSERT OR REPLACE INTO armaduras VALUES (?, ?, 'Couraça', 1, 1, 2, 0)", (UID, NOME))
+
+async def tres_consultas():
+    ficha = await db.buscar_um("SELECT * FROM fichas WHERE user_id = ? AND nome = ?", (UID, NOME))
+    await db.buscar_um("SELECT nivel, d6 FROM armas WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?", (UID, NOME, "Espada"))
+    await db.buscar_um("SELECT nivel, d6, bonus_esquiva, bonus_velocidade FROM armaduras WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?", (UID, NOME, "Couraça"))
+    return ficha
+
+async def uma_consulta():
+    return await db.buscar_um("SELECT * FROM fichas_equipadas WHERE user_id = ? AND nome = ?", (UID, NOME))
+
+async def com_cache():
+    return await db.obter_ficha(UID, NOME)
+
+async def medir(fn, repeticoes):
+    await fn()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        await fn()
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+async def main(repeticoes):
+    await popular()
+    print(f"{'caminho':<30} {'µs/!ficha':>10}")
+    for nome, fn in (("3 consultas (antigo)", tres_consultas),
+                     ("1 consulta (fichas_equipadas)", uma_consulta),
+                     ("obter_ficha (cache quente)", com_cache)):
+        print(f"{nome:<30} {await medir(fn, repeticoes):>10.1f}")
+
+if __name__ == "__main__":
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as pasta:
+        db.DB_FILE = os.path.join(pasta, "bench.db")
+        asyncio.run(main(repeticoes))
+        db.fechar()
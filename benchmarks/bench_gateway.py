@@ -0,0 +1,82 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from discord.state import ConnectionState
+
+import gateway
+
+# ----------------------------
+# Benchmark: memória por perfil de gateway
+# ----------------------------
+# Memória residente do discord.py num servidor grande sintético, por perfil de
+# gateway (gateway.py): "completo" (Intents.all(), lista de membros inteira no
+# cache, presença dos que estão online) x "enxuto" (sem membros nem presenças,
+# cache de mensagens menor). Os eventos passam pelo ConnectionState de verdade:
+# um GUILD_CREATE (no completo já com todos os membros, como fica depois do
+# chunking) e uma leva de MESSAGE_CREATE de jogadores rolando dados.
+# Uso: python benchmarks/bench_gateway.py [membros] [mensagens]
+GUILD_ID, CANAL_ID = 10 ** 17, 10 ** 17 + 1
+ONLINE = 0.3  # fração dos membros com presença (só chega no perfil completo)
+
+def usuario(i):
+    return {"id": str(2 * 10 ** 17 + i), "username": f"jogador{i}", "discriminator": "0",
+            "global_name": f"Jogador {i}", "avatar": None}
+
+def membro(i):
+    return {"user": usuario(i), "roles": [], "joined_at": "2024-01-01T00:00:00+00:00",
+            "deaf": False, "mute": False, "nick": None, "flags": 0}
+
+def presenca(i):
+    return {"user": {"id": usuario(i)["id"]}, "status": "online", "client_status": {"desktop": "online"},
+            "activities": [{"name": "Jogando RPG", "type": 0, "created_at": 0}]}
+
+def servidor(membros, completo):
+    return {
+        "id": str(GUILD_ID), "name": "Servidor grande", "member_count": membros, "large": True,
+        "roles": [{"id": str(GUILD_ID), "name": "@everyone", "permissions": "0", "position": 0,
+                   "color": 0, "hoist": False, "managed": False, "mentionable": False}],
+        "channels": [{"id": str(CANAL_ID), "type": 0, "name": "mesa", "position": 0,
+                      "permission_overwrites": [], "nsfw": False}],
+        "members": [membro(i) for i in range(membros)] if completo else [],
+        "presences": [presenca(i) for i in range(int(membros * ONLINE))] if completo else [],
+        "emojis": [], "stickers": [], "features": [], "threads": [], "voice_states": [],
+    }
+
+def mensagem(i, membros):
+    autor = i * 7919 % membros
+    return {"id": str(3 * 10 ** 17 + i), "channel_id": str(CANAL_ID), "guild_id": str(GUILD_ID),
+            "author": usuario(autor), "member": {k: v for k, v in membro(autor).items() if k != "user"},
+            "content": "!rolar 1d20+3", "timestamp": "2024-01-01T00:00:00+00:00", "edited_timestamp": None,
+            "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+            "attachments": [], "embeds": [], "pinned": False, "type": 0}
+
+def medir(perfil, membros, mensagens):
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    estado = ConnectionState(dispatch=lambda *a, **k: None, handlers={}, hooks={}, http=None,
+                             **gateway.opcoes(perfil))
+    estado._add_guild_from_data(servidor(membros, perfil == "completo"))
+    for i in range(mensagens):
+        estado.parse_message_create(mensagem(i, membros))
+    segundos = time.perf_counter() - inicio
+    gc.collect()
+    atual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    guild = estado._get_guild(GUILD_ID)
+    return atual, pico, segundos, len(guild.members), len(estado._messages or ())
+
+def main(membros, mensagens):
+    print(f"{membros} membros, {mensagens} mensagens")
+    print(f"{'perfil':<10} {'residente (MB)':>15} {'pico (MB)':>10} {'tempo (s)':>10} {'membros':>9} {'msgs':>6}")
+    for perfil in ("completo", "enxuto"):
+        atual, pico, segundos, n_membros, n_msgs = medir(perfil, membros, mensagens)
+        print(f"{perfil:<10} {atual / 2**20:>15.1f} {pico / 2**20:>10.1f} {segundos:>10.2f} {n_membros:>9} {n_msgs:>6}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
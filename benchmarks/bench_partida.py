@@ -0,0 +1,77 @@
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+import db
+
+# ----------------------------
+# Benchmark: partida a frio
+# ----------------------------
+# Partida a frio: cada rodada é um processo Python novo que importa app.py,
+# monta o bot com criar_bot() e roda o setup_hook (extensões de cogs/,
+# primeira consulta com migração do banco, cache de ativos e índices de
+# autocomplete), sem conectar ao Discord nem sincronizar os comandos de barra.
+# Mede banco novo (migração do zero) e banco já populado.
+# Uso: python benchmarks/bench_partida.py [fichas] [rodadas]
+FILHO = """
+import asyncio, json, sys, time
+inicio = time.perf_counter()
+import app, config, db
+importado = time.perf_counter()
+async def subir():
+    bot = app.criar_bot(config.carregar({"RPG_DB": sys.argv[1], "RPG_SINCRONIZAR_COMANDOS": "0"}))
+    montado = (time.perf_counter() - bot.criado_em) * 1000
+    await bot.setup_hook()
+    return {"criar_bot": montado, **bot.partida}
+partida = asyncio.run(subir())
+db.fechar()
+print(json.dumps({"importacao": (importado - inicio) * 1000, **partida}))
+"""
+ETAPAS = ("importacao", "criar_bot", "extensoes", "banco")
+
+def popular(caminho, fichas):
+    db.DB_FILE = caminho
+    db.iniciar_db()
+    conn = sqlite3.connect(caminho)
+    conn.executemany("""INSERT INTO fichas (user_id, nome, foto_url, forca, velocidade, esquiva, constituicao,
+                        atordoamento, peste, doencas, sangramento, debuff, vida)
+                        VALUES (?, ?, '', 10, 10, 10, 10, 0, 0, 0, 0, 0, 50)""",
+                     [(str(i // 3), f"P{i}") for i in range(fichas)])
+    conn.executemany("INSERT INTO ativo (user_id, nome_personagem) VALUES (?, ?)",
+                     [(str(i // 3), f"P{i}") for i in range(0, fichas, 3)])
+    conn.executemany("""INSERT INTO skills (user_id, nome_personagem, nome_skill, dano_formula, descricao, tipo)
+                        VALUES (?, ?, ?, '2d6', '', 'dano')""",
+                     [(str(i // 3), f"P{i}", f"skill {j}") for i in range(fichas) for j in range(5)])
+    conn.commit()
+    conn.close()
+
+def rodada(caminho):
+    saida = subprocess.run([sys.executable, "-c", FILHO, caminho], cwd=RAIZ, capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+def main(fichas, rodadas):
+    print(f"{'banco':<22} " + " ".join(f"{e + ' (ms)':>17}" for e in ETAPAS))
+    with tempfile.TemporaryDirectory() as pasta:
+        populado = os.path.join(pasta, "populado.db")
+        popular(populado, fichas)
+        for rotulo, caminho in (("novo (migração)", None), (f"{fichas} fichas", populado)):
+            medidas = []
+            for i in range(rodadas):
+                alvo = caminho or os.path.join(pasta, f"novo{i}.db")
+                medidas.append(rodada(alvo))
+            # extensoes e banco são marcas acumuladas desde criar_bot(): mostra a duração de cada etapa
+            linha = {"importacao": statistics.median(m["importacao"] for m in medidas),
+                     "criar_bot": statistics.median(m["criar_bot"] for m in medidas),
+                     "extensoes": statistics.median(m["extensoes"] - m["criar_bot"] for m in medidas),
+                     "banco": statistics.median(m["banco"] - m["extensoes"] for m in medidas)}
+            print(f"{rotulo:<22} " + " ".join(f"{linha[e]:>17.1f}" for e in ETAPAS))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 5)
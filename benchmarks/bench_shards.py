@@ -0,0 +1,162 @@
+import asyncio
+import multiprocessing
+import os
+import secrets
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+import dados
+import db
+import shards
+
+# ----------------------------
+# Benchmark: vazão com shards em vários processos
+# ----------------------------
+# Vazão com shards em vários processos (shards.py). Cada comando simulado rola
+# uma fórmula (CPU do processo) e lê a ficha (cache/WAL local); um a cada
+# `por_escrita` comandos também grava um `UPDATE fichas ... RETURNING`
+# (db.atualizar_ficha), já que a maior parte do que chega são rolagens e
+# consultas. Compara:
+#   • 1 processo, escrita local (o bot sem RPG_PROCESSOS);
+#   • P processos mandando as escritas para o processo escritor;
+#   • P processos escrevendo direto no arquivo, disputando o lock do SQLite.
+# No fim confere o banco (integrity_check) e se nenhuma escrita se perdeu:
+# cada escrita tira 1 de vida, então a soma tem de bater com o total.
+# Numa máquina com menos núcleos que processos a vazão medida só mostra o
+# custo do IPC; por isso sai também a CPU gasta por comando nos shards e por
+# transação no escritor, e o teto que isso dá com um núcleo por processo
+# (o escritor satura em 1 / CPU por transação). A CPU do escritor sai de
+# /proc (Linux).
+# Uso: python benchmarks/bench_shards.py [processos] [comandos por processo] [por_escrita] [fichas]
+VIDA = 1_000_000
+SIMULTANEOS = 8   # comandos em andamento por processo
+SQL_DANO = "UPDATE fichas SET vida = vida - 1 WHERE user_id = ? AND nome = ? RETURNING *"
+
+def popular(caminho, fichas):
+    db.DB_FILE = caminho
+    db.iniciar_db()
+    conn = sqlite3.connect(caminho)
+    conn.executemany("""INSERT INTO fichas (user_id, nome, foto_url, forca, velocidade, esquiva, constituicao,
+                        atordoamento, peste, doencas, sangramento, debuff, vida)
+                        VALUES (?, ?, '', 10, 10, 10, 10, 0, 0, 0, 0, 0, ?)""",
+                     [(str(i), f"P{i}", VIDA) for i in range(fichas)])
+    conn.commit()
+    conn.close()
+
+async def _comandos(indice, comandos, por_escrita, fichas):
+    latencias = []
+    fila = iter(range(comandos))
+
+    async def trabalhador():
+        for n in fila:
+            alvo = (indice * 7919 + n * 31) % fichas
+            dados.rolar("4d6k3+2")
+            await db.obter_ficha(alvo, f"P{alvo}")
+            if n % por_escrita:
+                continue
+            inicio = time.perf_counter()
+            await db.atualizar_ficha(alvo, f"P{alvo}", SQL_DANO, (str(alvo), f"P{alvo}"))
+            latencias.append(time.perf_counter() - inicio)
+
+    await asyncio.gather(*(trabalhador() for _ in range(SIMULTANEOS)))
+    return latencias
+
+def _processo(caminho, indice, comandos, por_escrita, fichas, escritor, largada, saida):
+    db.DB_FILE = caminho
+    if escritor is not None:
+        db.usar_escritor(shards.Cliente(*escritor))
+    largada.wait()
+    cpu = time.process_time()
+    latencias = asyncio.run(_comandos(indice, comandos, por_escrita, fichas))
+    cpu = time.process_time() - cpu
+    db.fechar()
+    saida.send((latencias, cpu))
+    saida.close()
+
+def rodada(caminho, processos, comandos, por_escrita, fichas, modo):
+    contexto = multiprocessing.get_context("spawn")
+    escritor = endereco = None
+    if modo == "escritor":
+        chave = secrets.token_bytes(32)
+        recebe, envia = contexto.Pipe(duplex=False)
+        escritor = contexto.Process(target=shards._processo_escritor, args=(caminho, chave, envia))
+        escritor.start()
+        envia.close()
+        endereco = (recebe.recv(), chave)
+    # Todos largam juntos depois de subir (spawn e importações ficam fora da medida)
+    largada = contexto.Barrier(processos + 1)
+    canais, filhos = [], []
+    for i in range(processos):
+        recebe, envia = contexto.Pipe(duplex=False)
+        filhos.append(contexto.Process(target=_processo, args=(caminho, i, comandos, por_escrita, fichas, endereco, largada, envia)))
+        canais.append(recebe)
+    for filho in filhos:
+        filho.start()
+    largada.wait()
+    inicio = time.perf_counter()
+    cpu_escritor = _cpu(escritor.pid) if escritor is not None else 0.0
+    latencias, cpu_shards = [], 0.0
+    for canal in canais:
+        medidas, cpu = canal.recv()
+        latencias += medidas
+        cpu_shards += cpu
+    segundos = time.perf_counter() - inicio
+    if escritor is not None:
+        cpu_escritor = _cpu(escritor.pid) - cpu_escritor
+    for filho in filhos:
+        filho.join()
+    if escritor is not None:
+        shards.parar_escritor(*endereco)
+        escritor.join()
+    return segundos, latencias, cpu_shards, cpu_escritor
+
+def _cpu(pid):
+    # utime + stime de /proc/<pid>/stat, em segundos
+    with open(f"/proc/{pid}/stat") as arquivo:
+        campos = arquivo.read().rsplit(")", 1)[1].split()
+    return (int(campos[11]) + int(campos[12])) / os.sysconf("SC_CLK_TCK")
+
+def conferir(caminho, esperado):
+    conn = sqlite3.connect(caminho)
+    integridade = conn.execute("PRAGMA integrity_check").fetchone()[0]
+    gasto = conn.execute("SELECT SUM(? - vida) FROM fichas", (VIDA,)).fetchone()[0]
+    conn.close()
+    return integridade, gasto == esperado
+
+def main(processos, comandos, por_escrita, fichas):
+    print(f"{processos} processos x {comandos} comandos (1 escrita a cada {por_escrita}), {fichas} fichas, "
+          f"{os.cpu_count()} núcleos")
+    print(f"{'modo':<28} {'comandos/s':>11} {'escrita p50 (ms)':>17} {'p99 (ms)':>9} {'banco':>6} {'perdas':>7} "
+          f"{'CPU/comando (µs)':>17} {'CPU/escrita no escritor (µs)':>29} {'teto (comandos/s)':>18}")
+    cenarios = (("1 processo", 1, processos * comandos, "local"),
+                (f"{processos} processos + escritor", processos, comandos, "escritor"),
+                (f"{processos} processos, direto", processos, comandos, "direto"))
+    with tempfile.TemporaryDirectory() as pasta:
+        for i, (rotulo, n, por_processo, modo) in enumerate(cenarios):
+            caminho = os.path.join(pasta, f"shards{i}.db")
+            popular(caminho, fichas)
+            db.fechar()
+            segundos, latencias, cpu_shards, cpu_escritor = rodada(caminho, n, por_processo, por_escrita, fichas, modo)
+            escritas = len(latencias)
+            integridade, completo = conferir(caminho, escritas)
+            latencias.sort()
+            total = n * por_processo
+            p50 = statistics.median(latencias) * 1000
+            p99 = latencias[int(escritas * 0.99)] * 1000
+            por_comando = cpu_shards / total
+            # Um núcleo por processo; escrevendo direto o lock do arquivo também limita, sem teto simples
+            teto = "-" if modo == "direto" else f"{min(n / por_comando, total / cpu_escritor if cpu_escritor else float('inf')):.0f}"
+            print(f"{rotulo:<28} {total / segundos:>11.0f} {p50:>17.2f} {p99:>9.2f} "
+                  f"{integridade:>6} {'não' if completo else 'SIM':>7} {por_comando * 1e6:>17.0f} "
+                  f"{cpu_escritor / escritas * 1e6:>29.0f} {teto:>18}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4000,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 4,
+         int(sys.argv[4]) if len(sys.argv) > 4 else 500)
@@ -0,0 +1,83 @@
+import ast
+import glob
+import os
+import re
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+import db
+
+# ----------------------------
+# Planos de consulta (EXPLAIN QUERY PLAN)
+# ----------------------------
+# Confere com EXPLAIN QUERY PLAN que nenhuma consulta dos comandos varre tabela inteira.
+# Extrai o SQL literal passado para db.buscar_um / buscar_todos / executar e cursor.execute
+# nos módulos do bot e roda o plano num banco temporário com o esquema atual.
+# Consultas sem WHERE (leituras completas de propósito) e as dos passos de migração
+# (_m<N>_..., que reescrevem a tabela inteira uma vez só) são ignoradas, assim como
+# o "SCAN ... VIRTUAL TABLE" das buscas FTS5 (o MATCH usa o índice de texto).
+# Uso: python benchmarks/planos_consulta.py [arquivos.py ...]  (sai com código 1 se achar SCAN)
+# Também roda no pytest (tests/test_planos_consulta.py).
+FUNCOES_SQL = {"buscar_um", "buscar_todos", "executar", "execute", "executemany"}
+
+def _texto_sql(no):
+    if isinstance(no, ast.Constant) and isinstance(no.value, str):
+        return no.value
+    if isinstance(no, ast.JoinedStr):
+        # f-strings só interpolam nomes de coluna: troca por rowid, que toda tabela tem
+        partes = []
+        for valor in no.values:
+            partes.append(valor.value if isinstance(valor, ast.Constant) else "rowid")
+        return "".join(partes)
+    return None
+
+def _linhas_de_migracao(arvore):
+    linhas = set()
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.FunctionDef) and re.match(r"_m\d+_", no.name):
+            linhas.update(range(no.lineno, no.end_lineno + 1))
+    return linhas
+
+def extrair_consultas(caminho):
+    arvore = ast.parse(open(caminho, encoding="utf-8").read(), caminho)
+    migracao = _linhas_de_migracao(arvore)
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.Call) and no.lineno not in migracao and isinstance(no.func, ast.Attribute) and no.func.attr in FUNCOES_SQL and no.args:
+            sql = _texto_sql(no.args[0])
+            if sql and re.match(r"\s*(SELECT|UPDATE|DELETE|INSERT|WITH)\b", sql, re.I):
+                yield no.lineno, " ".join(sql.split())
+
+def linhas_com_scan(conn, sql):
+    params = (None,) * sql.count("?")
+    plano = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [linha[-1] for linha in plano if linha[-1].startswith("SCAN")
+            and "CONSTANT ROW" not in linha[-1] and "VIRTUAL TABLE" not in linha[-1]]
+
+def arquivos_do_bot():
+    return sorted(
+        f for f in glob.glob(os.path.join(RAIZ, "**", "*.py"), recursive=True)
+        if os.sep + "benchmarks" + os.sep not in f and os.sep + "tests" + os.sep not in f
+    )
+
+def main(arquivos=None):
+    problemas = 0
+    with tempfile.TemporaryDirectory() as pasta:
+        db.DB_FILE = os.path.join(pasta, "planos.db")
+        db.iniciar_db()
+        conn = db.abrir_conexao()
+        for caminho in arquivos or arquivos_do_bot():
+            for linha, sql in extrair_consultas(caminho):
+                if not re.search(r"\bWHERE\b", sql, re.I):
+                    continue
+                scans = linhas_com_scan(conn, sql)
+                if scans:
+                    problemas += 1
+                    print(f"{os.path.relpath(caminho, RAIZ)}:{linha}: {'; '.join(scans)}\n    {sql}")
+        conn.close()
+    print("OK: nenhuma consulta varre tabela." if not problemas else f"{problemas} consulta(s) com SCAN.")
+    return 1 if problemas else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
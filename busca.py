@@ -0,0 +1,19 @@
+import re
+
+# ----------------------------
+# Busca de skills (FTS5)
+# ----------------------------
+# O texto digitado vira uma consulta FTS5 segura: cada palavra entra entre
+# aspas (nada do que o usuário digita é operador) com * de prefixo, e todas
+# precisam aparecer ("bola fo" acha "Bola de Fogo"). O nome pesa mais que a
+# descrição na relevância (bm25).
+PESO_NOME = 10.0
+PESO_DESCRICAO = 1.0
+RELEVANCIA = f"bm25(skills_busca, {PESO_NOME}, {PESO_DESCRICAO})"
+
+def consulta_prefixo(texto):
+    """Consulta MATCH para `texto`, ou None se não sobrou nenhuma palavra."""
+    palavras = re.findall(r"\w+", texto.lower())
+    if not palavras:
+        return None
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
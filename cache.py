@@ -0,0 +1,129 @@
+from collections import OrderedDict
+
+# ----------------------------
+# Personagem ativo (user_id -> nome do personagem)
+# ----------------------------
+# Espelho em memória da tabela `ativo`. É carregado inteiro na subida do bot e
+# só muda nos caminhos que escrevem na tabela (!set, !cadastrar, !excluirficha),
+# então depois de carregado uma ausência no dicionário significa "sem ativo".
+_ativos = {}
+_ativos_carregados = False
+
+def ativos_carregados():
+    return _ativos_carregados
+
+def carregar_ativos(linhas):
+    """Substitui o conteúdo do cache pelas linhas (user_id, nome_personagem) da tabela ativo."""
+    global _ativos_carregados
+    _ativos.clear()
+    for user_id, nome in linhas:
+        _ativos[str(user_id)] = nome
+    _ativos_carregados = True
+
+def ativo(user_id):
+    return _ativos.get(str(user_id))
+
+def definir_ativo(user_id, nome):
+    _ativos[str(user_id)] = nome
+
+def remover_ativo(user_id, nome=None):
+    """Remove o ativo do usuário; se `nome` for dado, só remove quando for esse o personagem ativo."""
+    chave = str(user_id)
+    if nome is None or _ativos.get(chave) == nome:
+        _ativos.pop(chave, None)
+
+# ----------------------------
+# Fichas (LRU de fichas completas por (user_id, nome))
+# ----------------------------
+class CacheFichas:
+    """
+    LRU limitado de fichas já lidas do banco. Leituras passam por aqui antes do
+    SQLite; escritas atualizam a entrada com a linha relida depois do commit.
+    Cada chave tem uma versão que muda a cada escrita: uma leitura que começou
+    antes de uma escrita só é guardada se a versão não mudou no meio do caminho,
+    assim uma ficha velha nunca sobrescreve a nova.
+
+    As versões saem de um contador único e só ficam guardadas para as chaves
+    que estão no LRU; quando uma chave sai (despejo ou remoção), a versão dela
+    vira o piso, que é a versão de toda chave sem entrada. Uma escrita sempre
+    deixa a chave numa versão acima de qualquer uma anterior, então a leitura
+    que começou antes dela não casa mais, e o dicionário de versões fica do
+    tamanho do LRU.
+    """
+
+    def __init__(self, limite=256, nome=None):
+        self.limite = limite
+        self.nome = nome       # nome do cache neste módulo (ver __reduce__)
+        self.acertos = 0
+        self.falhas = 0
+        self._itens = OrderedDict()
+        self._versoes = {}
+        self._ultima = 0       # última versão dada a uma escrita
+        self._piso = 0         # versão das chaves sem entrada em _versoes
+
+    def __reduce__(self):
+        # Invalidações que o db.py manda para os outros shards caem no cache de lá
+        if self.nome is None:
+            raise TypeError("Só o cache deste módulo pode ir para outro processo")
+        return self.nome
+
+    @staticmethod
+    def _chave(user_id, nome):
+        return (str(user_id), nome)
+
+    def obter(self, user_id, nome):
+        chave = self._chave(user_id, nome)
+        ficha = self._itens.get(chave)
+        if ficha is None:
+            self.falhas += 1
+            return None
+        self._itens.move_to_end(chave)
+        self.acertos += 1
+        return ficha
+
+    def versao(self, user_id, nome):
+        return self._versoes.get(self._chave(user_id, nome), self._piso)
+
+    def guardar(self, user_id, nome, ficha, versao):
+        """Guarda o resultado de uma leitura feita quando a chave estava em `versao`."""
+        chave = self._chave(user_id, nome)
+        if self._versoes.get(chave, self._piso) != versao:
+            return
+        self._colocar(chave, ficha)
+
+    def atualizar(self, user_id, nome, ficha):
+        """Write-through: registra a ficha pós-escrita (None remove a entrada)."""
+        chave = self._chave(user_id, nome)
+        self._ultima += 1
+        if ficha is None:
+            self._itens.pop(chave, None)
+            self._versoes.pop(chave, None)
+            self._piso = self._ultima
+        else:
+            self._versoes[chave] = self._ultima
+            self._colocar(chave, ficha)
+
+    def _colocar(self, chave, ficha):
+        self._itens[chave] = ficha
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.limite:
+            despejada, _ = self._itens.popitem(last=False)
+            self._piso = max(self._piso, self._versoes.pop(despejada, self._piso))
+
+    def limpar(self):
+        self._itens.clear()
+        self._versoes.clear()
+        self._piso = self._ultima
+
+    def estatisticas(self):
+        total = self.acertos + self.falhas
+        return {
+            "itens": len(self._itens),
+            "limite": self.limite,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": (self.acertos / total) if total else 0.0,
+        }
+
+# O limite vem de RPG_CACHE_FICHAS (config.py) e é aplicado em criar_bot()
+fichas = CacheFichas(limite=256, nome="fichas")
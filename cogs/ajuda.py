@@ -0,0 +1,294 @@
+import discord
+from discord.ext import commands
+
+# ----------------------------
+# Comandos de Ajuda organizados
+# ----------------------------
+class Ajuda(commands.Cog):
+    """Comandos de ajuda (!helpdados e seções)."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command()
+    async def helpdados(self, ctx):
+        embed = discord.Embed(title="📖 Manual Rápido do Aventureiro", color=discord.Color.gold())
+        embed.description = (
+            "Resumo dos comandos principais. Use os comandos abaixo para ver seções detalhadas.\n\n"
+            "• `!ficha` — Mostra a sua ficha com as principais informações do personagem.\n"
+            "• `!chance [atributo bônus | fórmula | skill]` — Calcula suas chances antes de rolar.\n"
+            "• `!helpcombate` — Regras e comandos de combate, HP e estresse.\n"
+            "• `!helpskills` — Como criar, editar, listar, usar e excluir skills.\n"
+            "• `!helpcadastro` — Como cadastrar personagem.\n"
+            "• `!helpmestre` — Comandos e utilitários do Mestre/DM.\n"
+            "• `!helpinventario` — Gerenciar itens e bolsa.\n"
+            "• `!receber` / `!gastar` — Sistema monetário e carteira.\n\n"
+            "Dica: sempre use `!set [Nome]` ao entrar no servidor para ativar seu personagem.\n"
+            "Também por barra, com sugestões dos seus nomes enquanto digita: `/set`, `/skill`, `/skillinfo`, "
+            "`/removeskill`, `/usar`, `/remover`, `/excluirficha`."
+        )
+        embed.set_footer(text="Use aspas se o nome tiver espaços. Comandos entre colchetes [] são parâmetros.")
+        await ctx.send(embed=embed)
+
+    @commands.command()
+    async def helpcadastro(self, ctx):
+        """Guia de cadastro e comandos relacionados a equipamentos"""
+        embed = discord.Embed(title="📝 Guia de Cadastro de Ficha", color=discord.Color.blue())
+        embed.description = "Siga a ordem exata para o bot registrar seus atributos corretamente. Use aspas se o nome tiver espaços."
+        embed.add_field(
+            name="📋 Comando de cadastro",
+            value="`!cadastrar \"Nome\" LinkDaFoto Nivel FRC VEL ESQ CST ATD PST DOE SAN DBF`",
+            inline=False
+        )
+        embed.add_field(
+            name="💡 Exemplo de cadastro",
+            value="`!cadastrar \"Kael\" http://foto.com/kael.png 5 10 12 15 10 0 0 0 0 5`",
+            inline=False
+        )
+        embed.add_field(
+            name="⚔️ Como adicionar armas",
+            value=(
+                "• `!adicionar arma \"Nome da Arma\" Nivel D6`\n"
+                "  • **Nome:** use aspas se tiver espaços.\n"
+                "  • **Nivel:** inteiro (ex.: 1, 2, 3).\n"
+                "  • **D6:** número de d6 que a arma usa para ataque (ex.: `2` para `2d6`).\n"
+                "  • **Exemplo:** `!adicionar arma \"Espada Longa\" 2 2` — cadastra e equipa uma arma Nível 2 que causa 2d6 de ataque."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="🛡️ Como adicionar armaduras",
+            value=(
+                "• `!adicionar armadura \"Nome da Armadura\" Nivel D6 [bonus_esq] [bonus_vel]`\n"
+                "  • **Nivel:** inteiro.\n"
+                "  • **D6:** número de d6 que a armadura usa para defesa (ex.: `1` para `1d6`).\n"
+                "  • **bonus_esq / bonus_vel:** opcionais; inteiros que somam em Esquiva e Velocidade do personagem.\n"
+                "  • **Exemplo:** `!adicionar armadura \"Couraça\" 1 1 2 0` — cadastra e equipa uma armadura Nível 1 (1d6 defesa) que dá +2 Esquiva."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="🗑️ Como remover arma ou armadura",
+            value=(
+                "• `!remover arma \"Nome da Arma\"` — remove a arma do banco de dados do personagem (use aspas se necessário).\n"
+                "• `!remover armadura \"Nome da Armadura\"` — remove a armadura do banco de dados do personagem.\n"
+                "  • **Exemplo:** `!remover arma \"Espada Longa\"`"
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="⬆️ Como upar arma e armadura (sem remover)",
+            value=(
+                "• `!upararma \"Nome da Arma\" nivel_inc d6_inc` — incrementa nível e d6 da arma (pode ser negativo).\n"
+                "  • **Exemplo:** `!upararma \"Espada Longa\" 1 1` — aumenta nível em 1 e d6 em 1.\n"
+                "• `!upararmadura \"Nome da Armadura\" nivel_inc d6_inc bonus_esq_inc bonus_vel_inc` — atualiza armadura existente.\n"
+                "  • **Exemplo:** `!upararmadura \"Couraça\" 1 0 2 0` — +1 nível, +0 d6, +2 Esquiva."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="🔎 Dicas importantes",
+            value=(
+                "• Use `!set [Nome]` após cadastrar para ativar o personagem.\n"
+                "• `!ficha` mostra Vida, Estresse, Equipamento e Carteira.\n"
+                "• Atualizar (`upararma` / `upararmadura`) preserva histórico e evita recriar itens.\n"
+                "• Remoções e upgrades podem exigir permissão de Mestre/ADM dependendo da implementação."
+            ),
+            inline=False
+        )
+        embed.set_footer(text="Qualquer dúvida sobre o formato, consulte o mestre ou use !helpdados para ver outras seções.")
+        await ctx.send(embed=embed)
+
+    @commands.command()
+    async def helpinventario(self, ctx):
+        """Ajuda sobre comandos de inventário e gerenciamento de bolsa"""
+        embed = discord.Embed(title="🎒 Ajuda — Inventário", color=discord.Color.dark_green())
+        embed.description = "Comandos para gerenciar itens, espaço da bolsa e uso de consumíveis."
+        embed.add_field(
+            name="Visualizar",
+            value=(
+                "• `!inv` ou `!inventario` — Mostra os itens do personagem ativo e o espaço ocupado.\n"
+                "• Exemplo: `!inv`"
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Adicionar / Guardar",
+            value=(
+                "• `!inv adicionar [item] [qtd]` — Adiciona um item à bolsa (respeita o limite de espaço).\n"
+                "• Exemplo: `!inv adicionar Poção 2`"
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Usar / Consumir",
+            value=(
+                "• `!usar [item] [qtd]` — Usa/consome um item do inventário (reduz quantidade).\n"
+                "• Exemplo: `!usar Poção 1`"
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Observações úteis",
+            value=(
+                "• Itens com o mesmo nome se acumulam (mesmo nome, mesma entrada).\n"
+                "• Use nomes simples ou sem acentos para evitar problemas; o bot armazena itens em minúsculas.\n"
+                "• Se a bolsa estiver cheia, `!inv adicionar` retornará erro informando falta de espaço."
+            ),
+            inline=False
+        )
+        embed.set_footer(text="Dica: use `!ficha` para ver o espaço total da bolsa do personagem ativo.")
+        await ctx.send(embed=embed)
+
+    @commands.command()
+    async def helpcombate(self, ctx):
+        """Ajuda detalhada sobre combate, HP, estresse e comandos relacionados"""
+        embed = discord.Embed(title="⚔️ Ajuda — Combate e Estado", color=discord.Color.red())
+        embed.add_field(
+            name="Vida (HP)",
+            value=(
+                "• **HP máximo = Constituição × 5**.\n"
+                "• `!ferimento [valor]` — causa dano ao personagem ativo (reduz HP atual).\n"
+                "• `!curou [valor]` — cura HP do personagem ativo (não ultrapassa o máximo).\n"
+                "• `!ficha` mostra Vida atual e HP máximo."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Estresse / Sanidade",
+            value=(
+                "• `!estressou [valor]` — aumenta Estresse (0 → 200).\n"
+                "• `!desestressou [valor]` — reduz Estresse (mín 0).\n"
+                "• Ao atingir **200**: o bot envia mensagem de sanidade e GIF automático."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Ataque e Defesa",
+            value=(
+                "• `!atacar [modificador]` — rola os d6 da arma equipada (ex.: `!atacar +2`, `!atacar kh1`).\n"
+                "• `!atacar @alvo` — em combate, ataca na sua vez (veja abaixo).\n"
+                "• `!defender [modificador]` — rola os d6 da armadura equipada."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Combate por turnos",
+            value=(
+                "• `!combate iniciar @Jog1 @Jog2 ...` — abre um combate no canal com os personagens ativos (ordem por velocidade).\n"
+                "• `!atacar @alvo` — na sua vez: d20 ≤ força para acertar (1 = crítico, dano em dobro; 20 = erro), "
+                "o alvo tenta esquivar com d20 ≤ esquiva e o dano é a arma (d6) menos a armadura (d6).\n"
+                "• `!combate` — ordem, vida e de quem é a vez. `!combate passar` — passa a vez.\n"
+                "• `!combate encerrar` — quem abriu o combate ou um ADM encerra.\n"
+                "• A vida vai para a ficha no fim de cada rodada e quando o combate acaba."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Skills de Cura",
+            value=(
+                "• `!addskill \"Nome\" XdY cura [Descrição]` — cadastra skill do tipo cura (ex.: `2d6`).\n"
+                "• `!skill \"Nome da Skill\" @Jogador` — executa a skill; se for cura, aplica no personagem ativo do jogador mencionado.\n"
+                "• Se omitir o alvo, `!skill` aplica no personagem ativo do autor."
+            ),
+            inline=False
+        )
+        embed.set_footer(text="Use estes comandos durante a sessão para controlar vida e sanidade dos personagens.")
+        await ctx.send(embed=embed)
+    @commands.command()
+    async def helpmestre(self, ctx):
+        """Painel de comandos do Mestre / Administrador"""
+        embed = discord.Embed(title="🧙 Painel do Mestre (ADM)", color=discord.Color.red())
+        embed.description = "Comandos reservados para Mestres/Administradores. Use com responsabilidade."
+        embed.add_field(
+            name="🎯 Distribuição de XP",
+            value=(
+                "• `!darxp @Jogador [valor]` — Dá XP ao personagem ativo do jogador mencionado.\n"
+                "• `!darxpmulti [valor] @Jog1 @Jog2 ...` — Dá XP para vários mencionados de uma vez."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="🎒 Inventário / Bolsa",
+            value=(
+                "• `!inv expandir @membro [qtd]` — Aumenta o espaço da bolsa do personagem ativo do membro."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="🧪 Balanceamento",
+            value=(
+                "• `!simular @Jog1 \"Personagem\" [lutas]` — Simula milhares de lutas entre dois personagens e mostra taxa de vitória e dano."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="🎲 Sessões de rolagem",
+            value=(
+                "• `!semente [texto]` — Abre uma sessão de rolagens no canal (semente aleatória ou escolhida).\n"
+                "• `!auditar [sessão]` — Refaz as rolagens da sessão pela semente e confere com o registro (auditar a sessão atual abre uma nova)."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="📮 Envio e manutenção",
+            value=(
+                "• `!fila` — Mostra a fila de mensagens do bot: respostas esperando, juntadas e tempo de espera.\n"
+                "• `!recarregar [extensão]` — Recarrega os comandos (todos ou uma extensão, ex.: `skills`) sem reiniciar o bot."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="⚠️ Permissões",
+            value=(
+                "Estes comandos exigem permissão de Administrador no servidor. Se você não for ADM, verá uma mensagem de permissão."
+            ),
+            inline=False
+        )
+        embed.set_footer(text="Use estes comandos para gerenciar sessões, recompensas e recursos dos jogadores.")
+        await ctx.send(embed=embed)
+
+    @commands.command()
+    async def helpskills(self, ctx):
+        """Ajuda detalhada sobre criação, edição, listagem e remoção de skills"""
+        embed = discord.Embed(title="🛠️ Ajuda — Skills", color=discord.Color.blue())
+        embed.add_field(
+            name="Cadastrar Skill",
+            value=(
+                "• `!addskill \"Nome\" XdY [tipo] [Descrição]`: Cadastra uma skill nova.\n"
+                "  • **Nome:** use aspas se tiver espaços.\n"
+                "  • **Fórmula:** expressão de dados — `2d6`, `2d6+3`, `4d6kh3` (mantém os 3 maiores), `2d20kl1`, `3d6!` (explode no 6), `(1d8+2)*2`.\n"
+                "  • **tipo:** `dano` (padrão) ou `cura` (ex.: `!addskill \"Cura Leve\" 2d6 cura Resta`)."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Editar Skill",
+            value=(
+                "• `!editskill NomeDaSkill dano 3d6` — altera fórmula de dano/curar.\n"
+                "• `!editskill NomeDaSkill desc Nova descrição` — altera descrição.\n"
+                "• `!editskill NomeDaSkill tipo cura` — altera tipo (dano/cura)."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Listar e Ver detalhes",
+            value=(
+                "• `!skills [filtro]` — lista todas as skills (ou busca palavras/prefixos no nome e descrição, mais relevantes primeiro).\n"
+                "• `!skillinfo NomeDaSkill` — mostra descrição completa, fórmula e rolagem de exemplo."
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Executar e Remover",
+            value=(
+                "• `!skill \"Nome da Skill\" @Jogador` — executa a skill (cura aplica automaticamente no alvo).\n"
+                "• `!removeskill \"Nome da Skill\"` — remove a skill do personagem ativo."
+            ),
+            inline=False
+        )
+        embed.set_footer(text="Exemplos: `!addskill \"Granada\" 2d6 dano Explode` | `!removeskill \"Granada\"`")
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(Ajuda(bot))
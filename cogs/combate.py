@@ -0,0 +1,188 @@
+import discord
+from discord.ext import commands
+
+import db
+import encontros
+import gateway
+import rng
+from comum import get_ativo, rolar_equipamento
+
+# ----------------------------
+# Combate por turnos (o estado fica em encontros.py)
+# ----------------------------
+SEM_COMBATE = "❌ Nenhum combate neste canal. Use `!combate iniciar @Jogador1 @Jogador2 ...`."
+
+def _pode_conduzir(ctx, atual):
+    """Quem abriu o combate ou um administrador."""
+    if str(ctx.author.id) == atual.criador_id:
+        return True
+    return ctx.guild is not None and ctx.author.guild_permissions.administrator
+
+def _vida(p):
+    return f"{p.vida}/{p.vida_max}" + (" 💀" if p.caido else "")
+
+def _embed_ordem(atual, titulo):
+    linhas = []
+    for i, p in enumerate(atual.ordem):
+        marca = "▶️" if i == atual.vez else "•"
+        desempate = f" (d20 {p.desempate})" if p.desempate is not None else ""
+        linhas.append(f"{marca} **{p.nome}** (<@{p.user_id}>) — ❤️ {_vida(p)} • ⚡ {p.velocidade}{desempate}")
+    emb = discord.Embed(title=titulo, color=0xc0392b, description="\n".join(linhas))
+    pendente = sum(p.dano_pendente for p in atual.ordem)
+    rodape = f"Rodada {atual.rodada} • vez de {atual.atual.nome}"
+    if pendente:
+        rodape += f" • {pendente} de dano vai para as fichas no fim da rodada"
+    emb.set_footer(text=rodape)
+    return emb
+
+class Combate(commands.Cog):
+    """Combate por turnos: iniciativa, ataques resolvidos pelo bot e vida gravada por rodada."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def _proxima_vez(self, ctx, atual):
+        # Quem caiu ou se curou por fora (!ferimento, !curou) conta na hora de passar a vez
+        await encontros.ressincronizar(atual)
+        if encontros.encontro(ctx.channel.id) is not atual:
+            return   # encerrado enquanto o golpe era enviado
+        if len(atual.de_pe()) < 2:
+            return await self._fim(ctx, atual, "🏁 Fim do combate!")
+        if atual.avancar():
+            await encontros.gravar(atual)
+            # A releitura das fichas pode ter derrubado alguém (um !ferimento no meio da rodada)
+            if len(atual.de_pe()) < 2:
+                return await self._fim(ctx, atual, "🏁 Fim do combate!")
+        proximo = atual.atual
+        await ctx.send(f"🎯 Rodada {atual.rodada}: vez de **{proximo.nome}** (<@{proximo.user_id}>) — `!atacar @alvo` ou `!combate passar`.")
+
+    async def _fim(self, ctx, atual, titulo):
+        await encontros.encerrar(ctx.channel.id)
+        de_pe = atual.de_pe()
+        emb = discord.Embed(title=titulo, color=0xf1c40f)
+        if len(de_pe) == 1:
+            emb.description = f"🏆 **{de_pe[0].nome}** venceu em {atual.rodada} rodada(s)."
+        emb.add_field(name="❤️ Vida", value="\n".join(f"**{p.nome}**: {_vida(p)}" for p in atual.ordem), inline=False)
+        emb.set_footer(text="A vida de todos já está gravada nas fichas.")
+        await ctx.send(embed=emb)
+
+    @commands.group(name="combate", invoke_without_command=True)
+    async def combate(self, ctx):
+        """Mostra o combate do canal: ordem de iniciativa, vida e de quem é a vez."""
+        atual = encontros.encontro(ctx.channel.id)
+        if atual is None:
+            return await ctx.send(SEM_COMBATE)
+        await encontros.ressincronizar(atual)
+        await ctx.send(embed=_embed_ordem(atual, "⚔️ Combate"))
+
+    @combate.command(name="iniciar")
+    async def combate_iniciar(self, ctx, *membros: gateway.Membro):
+        """
+        Abre um combate no canal com o personagem ativo de cada jogador mencionado.
+        Uso: !combate iniciar @Jogador1 @Jogador2 ...
+        Quem usa o comando também entra, se tiver personagem ativo (o mestre pode só conduzir).
+        A ordem é por velocidade (com o bônus da armadura); empates rolam d20.
+        """
+        if encontros.encontro(ctx.channel.id):
+            return await ctx.send("❌ Já tem um combate neste canal. Veja com `!combate` ou use `!combate encerrar`.")
+        fichas, vistos = [], set()
+        for membro in (ctx.author, *membros):
+            if membro.id in vistos:
+                continue
+            vistos.add(membro.id)
+            ativo = await get_ativo(membro.id)
+            if not ativo:
+                if membro is ctx.author:
+                    continue
+                return await ctx.send(f"❌ {membro.display_name} não tem um personagem ativo no momento.")
+            ficha_atual = await db.obter_ficha(membro.id, ativo)
+            if not ficha_atual:
+                return await ctx.send(f"❌ Ficha de {membro.display_name} não encontrada.")
+            if ficha_atual["vida"] is not None and ficha_atual["vida"] <= 0:
+                return await ctx.send(f"❌ **{ativo}** está com 0 de vida e não pode lutar.")
+            fichas.append((membro.id, ficha_atual))
+        if len(fichas) < 2:
+            return await ctx.send("❌ Um combate precisa de pelo menos dois personagens. Mencione os jogadores.")
+        fluxo = await rng.fluxo(ctx.channel.id)
+        # As consultas acima esperam: outro !combate iniciar pode ter chegado antes
+        if encontros.encontro(ctx.channel.id):
+            return await ctx.send("❌ Já tem um combate neste canal.")
+        atual = encontros.iniciar(fluxo, ctx.channel.id, ctx.author.id, fichas)
+        await ctx.send(embed=_embed_ordem(atual, "⚔️ Combate iniciado!"))
+
+    @combate.command(name="passar")
+    async def combate_passar(self, ctx):
+        """Encerra a vez atual sem atacar (quem está na vez, quem abriu o combate ou um ADM)."""
+        atual = encontros.encontro(ctx.channel.id)
+        if atual is None:
+            return await ctx.send(SEM_COMBATE)
+        if atual.atual.user_id != str(ctx.author.id) and not _pode_conduzir(ctx, atual):
+            return await ctx.send(f"❌ Agora é a vez de **{atual.atual.nome}**.")
+        await ctx.send(f"⏭️ **{atual.atual.nome}** passou a vez.")
+        await self._proxima_vez(ctx, atual)
+
+    @combate.command(name="encerrar")
+    async def combate_encerrar(self, ctx):
+        """Encerra o combate do canal e grava a vida nas fichas (quem abriu o combate ou um ADM)."""
+        atual = encontros.encontro(ctx.channel.id)
+        if atual is None:
+            return await ctx.send(SEM_COMBATE)
+        if not _pode_conduzir(ctx, atual):
+            return await ctx.send("❌ Só quem abriu o combate ou um administrador pode encerrar.")
+        await self._fim(ctx, atual, "🏳️ Combate encerrado")
+
+    @commands.command()
+    async def atacar(self, ctx, *argumentos: str):
+        """
+        Em combate, ataca um participante na sua vez: !atacar @alvo
+        Sem alvo, rola os d6 da arma equipada com modificador opcional:
+        !atacar | !atacar +2 | !atacar kh1 | !atacar ! + 1d4
+        """
+        membro = await gateway.membro(ctx, argumentos[0]) if argumentos else None
+        if membro is None:
+            return await rolar_equipamento(ctx, "arma", argumentos)
+        fluxo = await rng.fluxo(ctx.channel.id)
+        atual = encontros.encontro(ctx.channel.id)
+        if atual is None:
+            return await ctx.send(SEM_COMBATE)
+        # Vida atualizada com o que mudou nas fichas por fora do combate
+        await encontros.ressincronizar(atual)
+        # Da checagem da vez até o dano em memória não há await: dois !atacar não passam juntos
+        if encontros.encontro(ctx.channel.id) is not atual:
+            return await ctx.send(SEM_COMBATE)
+        atacante, alvo = atual.atual, atual.participante(membro.id)
+        if atacante.user_id != str(ctx.author.id):
+            return await ctx.send(f"❌ Agora é a vez de **{atacante.nome}**.")
+        if atacante.caido:
+            await ctx.send(f"💀 **{atacante.nome}** caiu antes de agir.")
+            return await self._proxima_vez(ctx, atual)
+        if alvo is None:
+            return await ctx.send(f"❌ {membro.display_name} não está neste combate.")
+        if alvo is atacante:
+            return await ctx.send("❌ Escolha outro alvo.")
+        if alvo.caido:
+            return await ctx.send(f"❌ **{alvo.nome}** já caiu.")
+        golpe = encontros.atacar(fluxo, atacante, alvo)
+
+        emb = discord.Embed(title=f"⚔️ {atacante.nome} ataca {alvo.nome}", color=0xe67e22)
+        emb.add_field(name="🎯 Acerto (d20 ≤ força)", value=f"**{golpe.acerto}** / {atacante.forca}", inline=True)
+        if golpe.esquiva is not None:
+            emb.add_field(name="💨 Esquiva (d20 ≤ esquiva)", value=f"**{golpe.esquiva}** / {alvo.esquiva}", inline=True)
+        if golpe.rolagem_arma is None:
+            if golpe.esquiva is not None:
+                emb.description = f"💨 **{alvo.nome}** esquivou!"
+            else:
+                emb.description = "💀 Falha crítica!" if golpe.acerto == 20 else "❌ Errou!"
+        else:
+            emb.description = "🌟 CRÍTICO! Dano em dobro." if golpe.critico else "✅ Acertou!"
+            dano = f"⚔️ `{golpe.rolagem_arma.detalhe}` = {golpe.rolagem_arma.total}" + (" × 2" if golpe.critico else "")
+            if golpe.rolagem_armadura is not None:
+                dano += f"\n🛡️ `{golpe.rolagem_armadura.detalhe}` = −{golpe.rolagem_armadura.total}"
+            emb.add_field(name="💥 Dano", value=f"{dano}\n**{golpe.dano}** de dano", inline=False)
+        emb.add_field(name=f"❤️ {alvo.nome}", value=_vida(alvo), inline=True)
+        emb.set_footer(text=f"Rodada {atual.rodada}")
+        await ctx.send(embed=emb)
+        await self._proxima_vez(ctx, atual)
+
+async def setup(bot):
+    await bot.add_cog(Combate(bot))
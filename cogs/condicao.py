@@ -0,0 +1,87 @@
+import discord
+from discord.ext import commands
+
+import db
+from comum import get_ativo
+
+# ----------------------------
+# Estresse / Sanidade / HP (ferimento / curou)
+# ----------------------------
+SANIDADE_GIF = "https://imgs.search.brave.com/BHFZ571hFMLk0s8FLwiInUFie0DMUh8K6HpiOv_PdKs/rs:fit:860:0:0:0/g:ce/aHR0cHM6Ly9tZWRp/YTEuZ2lwaHkuY29t/L21lZGlhL3hVTmQ5/R1J6cjJvREZ1eXVX/Yy8yMDAuZ2lmP2Np/ZD03OTBiNzYxMWg4/cWR5a2F2Y3R6OTIy/djc5cXg4cmpqa2J1/M3FycG9jNXkwMHlv/NG8mZXA9djFfZ2lm/c19zZWFyY2gmcmlk/PTIwMC5naWYmY3Q9/Zw.gif"
+
+# Vida sempre fica entre 0 e o máximo (Constituição × 5); vida nula conta como cheia no dano
+SQL_FERIMENTO = """UPDATE fichas
+                   SET vida = MAX(MIN(COALESCE(vida, COALESCE(constituicao, 0) * 5) - ?, COALESCE(constituicao, 0) * 5), 0)
+                   WHERE user_id = ? AND nome = ? RETURNING *"""
+SQL_CURA = """UPDATE fichas
+              SET vida = MAX(MIN(COALESCE(vida, 0) + ?, COALESCE(constituicao, 0) * 5), 0)
+              WHERE user_id = ? AND nome = ? RETURNING *"""
+
+class Condicao(commands.Cog):
+    """Estresse, sanidade e HP (ferimento / cura)."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name="estressou")
+    async def estressou(self, ctx, valor: int):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        if valor <= 0:
+            return await ctx.send("❌ Forneça um valor positivo para aumentar o estresse.")
+        ficha_nova = await db.atualizar_ficha(ctx.author.id, ativo,
+            "UPDATE fichas SET estresse = MIN(COALESCE(estresse, 0) + ?, 200) WHERE user_id = ? AND nome = ? RETURNING *",
+            (valor, str(ctx.author.id), ativo))
+        if not ficha_nova:
+            return await ctx.send("❌ Ficha não encontrada.")
+        novo_est = ficha_nova["estresse"]
+        await ctx.send(f"😰 **{ativo}** aumentou **{valor}** de estresse. Estresse atual: **{novo_est}/200**")
+        if novo_est >= 200:
+            texto = f"Essa não... Parece que **{ativo}** alcançou o limite de sua sanidade."
+            emb = discord.Embed(description=texto, color=0x8b0000)
+            emb.set_image(url=SANIDADE_GIF)
+            await ctx.send(embed=emb)
+
+    @commands.command(name="desestressou")
+    async def desestressou(self, ctx, valor: int):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        if valor <= 0:
+            return await ctx.send("❌ Forneça um valor positivo para reduzir o estresse.")
+        ficha_nova = await db.atualizar_ficha(ctx.author.id, ativo,
+            "UPDATE fichas SET estresse = MAX(COALESCE(estresse, 0) - ?, 0) WHERE user_id = ? AND nome = ? RETURNING *",
+            (valor, str(ctx.author.id), ativo))
+        if not ficha_nova:
+            return await ctx.send("❌ Ficha não encontrada.")
+        await ctx.send(f"😌 **{ativo}** reduziu **{valor}** de estresse. Estresse atual: **{ficha_nova['estresse']}/200**")
+
+    @commands.command(name="ferimento")
+    async def ferimento(self, ctx, valor: int):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        if valor <= 0:
+            return await ctx.send("❌ Forneça um valor positivo para causar dano.")
+        ficha_nova = await db.atualizar_ficha(ctx.author.id, ativo, SQL_FERIMENTO, (valor, str(ctx.author.id), ativo))
+        if not ficha_nova:
+            return await ctx.send("❌ Ficha não encontrada.")
+        max_hp = (ficha_nova["constituicao"] or 0) * 5
+        await ctx.send(f"🩸 **{ativo}** sofreu **{valor}** de dano. Vida atual: **{ficha_nova['vida']}/{max_hp}**")
+
+    @commands.command(name="curou")
+    async def curou(self, ctx, valor: int):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        if valor <= 0:
+            return await ctx.send("❌ Forneça um valor positivo para curar.")
+        ficha_nova = await db.atualizar_ficha(ctx.author.id, ativo, SQL_CURA, (valor, str(ctx.author.id), ativo))
+        if not ficha_nova:
+            return await ctx.send("❌ Ficha não encontrada.")
+        max_hp = (ficha_nova["constituicao"] or 0) * 5
+        await ctx.send(f"✨ **{ativo}** recuperou **{valor}** de vida. Vida atual: **{ficha_nova['vida']}/{max_hp}**")
+
+async def setup(bot):
+    await bot.add_cog(Condicao(bot))
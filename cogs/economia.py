@@ -0,0 +1,51 @@
+from discord.ext import commands
+
+import db
+from comum import get_ativo, formatar_saldo, parse_money_tokens
+
+# ----------------------------
+# Economia: receber / gastar
+# ----------------------------
+class Economia(commands.Cog):
+    """Economia: receber / gastar."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command()
+    async def receber(self, ctx, *args):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        total_verdes, err = parse_money_tokens(args)
+        if err:
+            return await ctx.send(err)
+        ficha_nova = await db.atualizar_ficha(ctx.author.id, ativo,
+            "UPDATE fichas SET saldo = COALESCE(saldo, 0) + ? WHERE user_id = ? AND nome = ? RETURNING *",
+            (total_verdes, str(ctx.author.id), ativo))
+        if not ficha_nova:
+            return await ctx.send("❌ Ficha não encontrada.")
+        await ctx.send(f"💰 **{ativo}** recebeu {formatar_saldo(total_verdes)}. Saldo atual: {formatar_saldo(ficha_nova['saldo'])}")
+
+    @commands.command()
+    async def gastar(self, ctx, *args):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        total_verdes, err = parse_money_tokens(args)
+        if err:
+            return await ctx.send(err)
+        # Checagem de saldo no próprio UPDATE: dois gastos simultâneos não passam do saldo
+        ficha_nova = await db.atualizar_ficha(ctx.author.id, ativo,
+            """UPDATE fichas SET saldo = COALESCE(saldo, 0) - ?
+               WHERE user_id = ? AND nome = ? AND COALESCE(saldo, 0) >= ? RETURNING *""",
+            (total_verdes, str(ctx.author.id), ativo, total_verdes))
+        if not ficha_nova:
+            ficha_atual = await db.obter_ficha(ctx.author.id, ativo)
+            if not ficha_atual:
+                return await ctx.send("❌ Ficha não encontrada.")
+            return await ctx.send(f"❌ Saldo insuficiente. Saldo atual: {formatar_saldo(ficha_atual['saldo'] or 0)}")
+        await ctx.send(f"💸 **{ativo}** gastou {formatar_saldo(total_verdes)}. Saldo atual: {formatar_saldo(ficha_nova['saldo'])}")
+
+async def setup(bot):
+    await bot.add_cog(Economia(bot))
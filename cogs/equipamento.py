@@ -0,0 +1,320 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import db
+import indices
+from comum import get_ativo, autocompletar_tipo_equipamento, autocompletar_equipamento, quis_dizer
+
+# ----------------------------
+# Equipamento: upar, adicionar e remover armas e armaduras
+# ----------------------------
+# Transações do !adicionar e do !remover
+def _equipar_arma(cursor, user_id, ativo, nome, nivel, d6):
+    cursor.execute("INSERT OR REPLACE INTO armas (user_id, nome_personagem, item_nome, nivel, d6) VALUES (?, ?, ?, ?, ?)",
+                   (user_id, ativo, nome, nivel, d6))
+    cursor.execute("UPDATE fichas SET arma_equipada = ? WHERE user_id = ? AND nome = ?", (nome, user_id, ativo))
+
+def _equipar_armadura(cursor, user_id, ativo, nome, nivel, d6, bonus_esq, bonus_vel):
+    cursor.execute("SELECT armadura_equipada FROM fichas WHERE user_id = ? AND nome = ?", (user_id, ativo))
+    cur = cursor.fetchone()
+    atual_arm = cur[0] if cur else None
+    if atual_arm:
+        cursor.execute("SELECT bonus_esquiva, bonus_velocidade FROM armaduras WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?", (user_id, ativo, atual_arm))
+        old = cursor.fetchone()
+        if old:
+            old_esq, old_vel = old[0] or 0, old[1] or 0
+            if old_esq or old_vel:
+                cursor.execute("UPDATE fichas SET esquiva = esquiva - ?, velocidade = velocidade - ? WHERE user_id = ? AND nome = ?", (old_esq, old_vel, user_id, ativo))
+    cursor.execute("INSERT OR REPLACE INTO armaduras (user_id, nome_personagem, item_nome, nivel, d6, bonus_esquiva, bonus_velocidade) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                   (user_id, ativo, nome, nivel, d6, bonus_esq, bonus_vel))
+    if bonus_esq or bonus_vel:
+        cursor.execute("UPDATE fichas SET esquiva = esquiva + ?, velocidade = velocidade + ? WHERE user_id = ? AND nome = ?", (bonus_esq, bonus_vel, user_id, ativo))
+    cursor.execute("UPDATE fichas SET armadura_equipada = ? WHERE user_id = ? AND nome = ?", (nome, user_id, ativo))
+
+def _remover_arma(cursor, user_id, ativo, nome):
+    cursor.execute("SELECT arma_equipada FROM fichas WHERE user_id = ? AND nome = ?", (user_id, ativo))
+    cur = cursor.fetchone()
+    arma_eq = cur[0] if cur else None
+    apagadas = cursor.execute("DELETE FROM armas WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?", (user_id, ativo, nome)).rowcount
+    if arma_eq and arma_eq == nome:
+        cursor.execute("UPDATE fichas SET arma_equipada = NULL WHERE user_id = ? AND nome = ?", (user_id, ativo))
+    return apagadas
+
+def _remover_armadura(cursor, user_id, ativo, nome):
+    cursor.execute("SELECT armadura_equipada FROM fichas WHERE user_id = ? AND nome = ?", (user_id, ativo))
+    cur = cursor.fetchone()
+    arm_eq = cur[0] if cur else None
+    cursor.execute("SELECT bonus_esquiva, bonus_velocidade FROM armaduras WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?", (user_id, ativo, nome))
+    old = cursor.fetchone()
+    if old:
+        old_esq, old_vel = old[0] or 0, old[1] or 0
+    else:
+        old_esq, old_vel = 0, 0
+    apagadas = cursor.execute("DELETE FROM armaduras WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?", (user_id, ativo, nome)).rowcount
+    if arm_eq and arm_eq == nome:
+        if old_esq or old_vel:
+            cursor.execute("UPDATE fichas SET esquiva = esquiva - ?, velocidade = velocidade - ? WHERE user_id = ? AND nome = ?", (old_esq, old_vel, user_id, ativo))
+        cursor.execute("UPDATE fichas SET armadura_equipada = NULL WHERE user_id = ? AND nome = ?", (user_id, ativo))
+    return apagadas
+
+class Equipamento(commands.Cog):
+    """Armas e armaduras: cadastrar, upar e remover."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name="upararma")
+    async def upararma(self, ctx, *args):
+        """
+        Atualiza arma existente. Formatos aceitos:
+          !upararma "Nome da Arma" nivel_inc d6_inc
+          !upararma @Jogador "Nome da Arma" nivel_inc d6_inc
+        Aceita nome entre aspas para suportar espaços.
+        """
+        if not args:
+            return await ctx.send("❌ Uso: `!upararma \"Nome\" nivel_inc d6_inc`")
+
+        # Detecta menção no conteúdo da mensagem (prioriza menção explícita)
+        membro = None
+        tokens = list(args)
+        if ctx.message.mentions:
+            membro = ctx.message.mentions[0]
+            # remove a primeira token correspondente à menção dos tokens
+            # (args já separa por espaços, então descartamos o primeiro token)
+            tokens = tokens[1:]
+
+        # Reconstrói nome entre aspas se necessário
+        if not tokens:
+            return await ctx.send("❌ Nome da arma não informado.")
+        if tokens[0].startswith('"') or tokens[0].startswith("'"):
+            quote = tokens[0][0]
+            nome_parts = []
+            consumed = 0
+            for t in tokens:
+                nome_parts.append(t)
+                consumed += 1
+                if t.endswith(quote) and len(t) > 1:
+                    break
+            nome = " ".join(nome_parts).strip(quote).strip()
+            rest = tokens[consumed:]
+        else:
+            nome = tokens[0]
+            rest = tokens[1:]
+
+        # Se não houve menção, alvo é o autor
+        if membro is None:
+            membro = ctx.author
+        else:
+            # se tentou atualizar arma de outro, exige permissão de administrador
+            if membro != ctx.author and not ctx.author.guild_permissions.administrator:
+                return await ctx.send("🔒 Você não tem permissão para atualizar a arma de outro jogador.")
+
+        # Parse dos incrementos (preenche com zeros se faltarem)
+        try:
+            nivel_inc = int(rest[0]) if len(rest) >= 1 else 0
+            d6_inc = int(rest[1]) if len(rest) >= 2 else 0
+        except ValueError:
+            return await ctx.send("❌ Argumento inválido. Use números inteiros para os incrementos. Veja `!helpdados`.")
+
+        ativo = await get_ativo(membro.id)
+        if not ativo:
+            return await ctx.send(f"❌ {membro.display_name} não tem um personagem ativo.")
+
+        row = await db.buscar_um(
+            "SELECT nivel, d6 FROM armas WHERE user_id = ? AND nome_personagem = ? AND LOWER(item_nome) = ?",
+            (str(membro.id), ativo, nome.lower())
+        )
+        if not row:
+            return await ctx.send(f"❌ Arma **{nome}** não encontrada para o personagem **{ativo}** de {membro.display_name}.")
+
+        nivel_atual, d6_atual = row
+        novo_nivel = (nivel_atual or 0) + nivel_inc
+        novo_d6 = (d6_atual or 0) + d6_inc
+
+        if novo_nivel < 0 or novo_d6 < 0:
+            return await ctx.send("❌ Resultado inválido: nível ou d6 não podem ficar negativos.")
+
+        try:
+            await db.executar_ficha(membro.id, ativo, """UPDATE armas
+                           SET nivel = ?, d6 = ?
+                           WHERE user_id = ? AND nome_personagem = ? AND LOWER(item_nome) = ?""",
+                        (novo_nivel, novo_d6, str(membro.id), ativo, nome.lower()))
+        except Exception as e:
+            return await ctx.send(f"❌ Erro ao atualizar arma: {e}")
+
+        emb = discord.Embed(title="⚔️ Arma Atualizada", color=discord.Color.dark_blue())
+        emb.add_field(name="👤 Jogador", value=f"{membro.display_name} ({ativo})", inline=False)
+        emb.add_field(name="🔧 Arma", value=f"**{nome}**", inline=False)
+        emb.add_field(name="📈 Antes", value=f"Nível: **{nivel_atual}** | D6: **{d6_atual}**", inline=False)
+        emb.add_field(name="📈 Agora", value=f"Nível: **{novo_nivel}** | D6: **{novo_d6}**", inline=False)
+        emb.set_footer(text="Use com cuidado — alterações são permanentes no banco de dados.")
+        await ctx.send(embed=emb)
+
+    @commands.command(name="upararmadura")
+    async def upararmadura(self, ctx, *args):
+        """
+        Atualiza armadura existente. Formatos aceitos:
+          !upararmadura "Nome da Armadura" nivel_inc d6_inc bonus_esq_inc bonus_vel_inc
+          !upararmadura @Jogador "Nome da Armadura" nivel_inc d6_inc bonus_esq_inc bonus_vel_inc
+        """
+        # args parsing flexível
+        if not args:
+            return await ctx.send("❌ Uso: `!upararmadura \"Nome\" nivel_inc d6_inc bonus_esq_inc bonus_vel_inc`")
+
+        # tenta detectar se o primeiro arg é uma menção de membro
+        membro = None
+        nome = None
+        rest = []
+
+        # se houver menções explícitas no ctx, prioriza a primeira menção
+        if ctx.message.mentions:
+            membro = ctx.message.mentions[0]
+            # remove a menção do texto bruto para extrair o restante corretamente
+            raw = ctx.message.content
+            # pega tudo após o comando e a menção
+            after = raw.split(maxsplit=2)[-1] if len(raw.split()) >= 2 else ""
+            # tenta extrair nome entre aspas e os números
+            # fallback simples: reconstruir args sem a primeira token de menção
+            tokens = list(args)[1:]
+        else:
+            # sem menção: assume que o primeiro arg é o nome (possivelmente entre aspas)
+            tokens = list(args)
+
+        # Reconstrói nome se estiver entre aspas (suporta nomes com espaços)
+        if tokens:
+            # se o primeiro token começa com aspas, junta até fechar aspas
+            if tokens[0].startswith('"') or tokens[0].startswith("'"):
+                quote = tokens[0][0]
+                nome_parts = []
+                consumed = 0
+                for t in tokens:
+                    nome_parts.append(t)
+                    consumed += 1
+                    if t.endswith(quote) and len(t) > 1:
+                        break
+                nome = " ".join(nome_parts).strip(quote).strip()
+                rest = tokens[consumed:]
+            else:
+                # se não tem aspas, pega o primeiro token como nome simples
+                nome = tokens[0]
+                rest = tokens[1:]
+        else:
+            return await ctx.send("❌ Nome da armadura não informado.")
+
+        # se membro não foi definido via menção, atualiza do autor
+        if membro is None:
+            membro = ctx.author
+        else:
+            # se tentou atualizar armadura de outro, exige permissão de administrador
+            if membro != ctx.author and not ctx.author.guild_permissions.administrator:
+                return await ctx.send("🔒 Você não tem permissão para atualizar a armadura de outro jogador.")
+
+        # parse dos incrementos (preenche com zeros se faltarem)
+        try:
+            nivel_inc = int(rest[0]) if len(rest) >= 1 else 0
+            d6_inc = int(rest[1]) if len(rest) >= 2 else 0
+            bonus_esq_inc = int(rest[2]) if len(rest) >= 3 else 0
+            bonus_vel_inc = int(rest[3]) if len(rest) >= 4 else 0
+        except ValueError:
+            return await ctx.send("❌ Argumento inválido. Use números inteiros para os incrementos. Veja `!helpdados`.")
+
+        ativo = await get_ativo(membro.id)
+        if not ativo:
+            return await ctx.send(f"❌ {membro.display_name} não tem um personagem ativo.")
+
+        row = await db.buscar_um(
+            "SELECT nivel, d6, bonus_esquiva, bonus_velocidade FROM armaduras WHERE user_id = ? AND nome_personagem = ? AND LOWER(item_nome) = ?",
+            (str(membro.id), ativo, nome.lower())
+        )
+        if not row:
+            return await ctx.send(f"❌ Armadura **{nome}** não encontrada para o personagem **{ativo}** de {membro.display_name}.")
+
+        nivel_atual, d6_atual, bonus_esq_atual, bonus_vel_atual = row
+        novo_nivel = (nivel_atual or 0) + nivel_inc
+        novo_d6 = (d6_atual or 0) + d6_inc
+        novo_bonus_esq = (bonus_esq_atual or 0) + bonus_esq_inc
+        novo_bonus_vel = (bonus_vel_atual or 0) + bonus_vel_inc
+
+        if novo_nivel < 0 or novo_d6 < 0:
+            return await ctx.send("❌ Resultado inválido: nível ou d6 não podem ficar negativos.")
+
+        try:
+            await db.executar_ficha(membro.id, ativo, """UPDATE armaduras
+                           SET nivel = ?, d6 = ?, bonus_esquiva = ?, bonus_velocidade = ?
+                           WHERE user_id = ? AND nome_personagem = ? AND LOWER(item_nome) = ?""",
+                        (novo_nivel, novo_d6, novo_bonus_esq, novo_bonus_vel, str(membro.id), ativo, nome.lower()))
+        except Exception as e:
+            return await ctx.send(f"❌ Erro ao atualizar armadura: {e}")
+
+        emb = discord.Embed(title="🛡️ Armadura Atualizada", color=discord.Color.dark_blue())
+        emb.add_field(name="👤 Jogador", value=f"{membro.display_name} ({ativo})", inline=False)
+        emb.add_field(name="🔧 Armadura", value=f"**{nome}**", inline=False)
+        emb.add_field(name="📈 Antes", value=f"Nível: **{nivel_atual}** | D6: **{d6_atual}** | +Esq: **{bonus_esq_atual}** | +Vel: **{bonus_vel_atual}**", inline=False)
+        emb.add_field(name="📈 Agora", value=f"Nível: **{novo_nivel}** | D6: **{novo_d6}** | +Esq: **{novo_bonus_esq}** | +Vel: **{novo_bonus_vel}**", inline=False)
+        emb.set_footer(text="Use com cuidado — alterações são permanentes no banco de dados.")
+        await ctx.send(embed=emb)
+
+    @commands.command(name="adicionar")
+    async def adicionar_item(self, ctx, tipo: str, nome: str, nivel: int, d6: int, bonus_esq: int = 0, bonus_vel: int = 0):
+        """
+        Uso:
+          !adicionar arma "Nome da Arma" Nivel D6
+          !adicionar armadura "Nome da Armadura" Nivel D6 [bonus_esq] [bonus_vel]
+        """
+        tipo = tipo.lower()
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        if nivel < 0 or d6 <= 0:
+            return await ctx.send("❌ Nível deve ser >= 0 e D6 deve ser >= 1.")
+        if tipo == "arma":
+            try:
+                await db.transacao_ficha(ctx.author.id, ativo, _equipar_arma, str(ctx.author.id), ativo, nome.strip(), nivel, d6)
+                db.replicar(indices.armas.adicionar, (str(ctx.author.id), ativo), nome.strip())
+                await ctx.send(f"⚔️ Arma **{nome}** (Nível {nivel} | {d6}d6) cadastrada e equipada em **{ativo}**.")
+            except Exception as e:
+                await ctx.send(f"❌ Erro ao adicionar arma: {e}")
+        elif tipo == "armadura":
+            try:
+                await db.transacao_ficha(ctx.author.id, ativo, _equipar_armadura, str(ctx.author.id), ativo, nome.strip(), nivel, d6, bonus_esq, bonus_vel)
+                db.replicar(indices.armaduras.adicionar, (str(ctx.author.id), ativo), nome.strip())
+                await ctx.send(f"🛡️ Armadura **{nome}** (Nível {nivel} | {d6}d6) cadastrada e equipada em **{ativo}**. Bônus aplicados: Esquiva +{bonus_esq}, Vel +{bonus_vel}.")
+            except Exception as e:
+                await ctx.send(f"❌ Erro ao adicionar armadura: {e}")
+        else:
+            await ctx.send("❌ Tipo inválido. Use `arma` ou `armadura`.")
+
+    @commands.hybrid_command(name="remover")
+    @app_commands.describe(tipo="arma ou armadura", nome="Item a remover")
+    @app_commands.autocomplete(tipo=autocompletar_tipo_equipamento, nome=autocompletar_equipamento)
+    async def remover_item(self, ctx, tipo: str, *, nome: str):
+        """Remove uma arma ou armadura dos registros do personagem ativo."""
+        tipo = tipo.lower()
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        if tipo == "arma":
+            try:
+                if not await db.transacao_ficha(ctx.author.id, ativo, _remover_arma, str(ctx.author.id), ativo, nome.strip()):
+                    # Remoção nunca é aplicada no palpite: só sugere
+                    palpite = indices.armas.corrigir((str(ctx.author.id), ativo), nome)
+                    return await ctx.send(f"❌ Arma **{nome}** não encontrada nos registros de **{ativo}**.{quis_dizer(palpite)}")
+                db.replicar(indices.armas.remover, (str(ctx.author.id), ativo), nome.strip())
+                await ctx.send(f"🗑️ Arma **{nome}** removida dos registros de **{ativo}**.")
+            except Exception as e:
+                await ctx.send(f"❌ Erro ao remover arma: {e}")
+        elif tipo == "armadura":
+            try:
+                if not await db.transacao_ficha(ctx.author.id, ativo, _remover_armadura, str(ctx.author.id), ativo, nome.strip()):
+                    palpite = indices.armaduras.corrigir((str(ctx.author.id), ativo), nome)
+                    return await ctx.send(f"❌ Armadura **{nome}** não encontrada nos registros de **{ativo}**.{quis_dizer(palpite)}")
+                db.replicar(indices.armaduras.remover, (str(ctx.author.id), ativo), nome.strip())
+                await ctx.send(f"🗑️ Armadura **{nome}** removida dos registros de **{ativo}** e bônus (se houver) desfeitos.")
+            except Exception as e:
+                await ctx.send(f"❌ Erro ao remover armadura: {e}")
+        else:
+            await ctx.send("❌ Tipo inválido. Use `arma` ou `armadura`.")
+
+async def setup(bot):
+    await bot.add_cog(Equipamento(bot))
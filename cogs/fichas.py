@@ -0,0 +1,392 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import cache
+import db
+import gateway
+import indices
+import xp
+from comum import get_ativo, autocompletar_personagem, quis_dizer, formatar_saldo
+
+# ----------------------------
+# XP (cálculo e aplicação em lote)
+# ----------------------------
+def _calcular_xp(ficha, quantidade, curva=xp.PADRAO):
+    """Aplica XP numa ficha (dict) e retorna (campos_atualizados, upou); None se já está no nível máximo."""
+    if ficha["nivel"] >= curva.nivel_max:
+        return None
+    novo_nivel, novo_xp, niveis = curva.aplicar(ficha["nivel"], ficha["xp"] or 0, quantidade)
+    campos = {"xp": novo_xp, "nivel": ficha["nivel"] + niveis,
+              "constituicao": ficha["constituicao"] + niveis,
+              "pontos_atrib": ficha["pontos_atrib"] + niveis,
+              "pontos_res": ficha["pontos_res"] + niveis,
+              "vida": (ficha["vida"] or 0) + 5 * niveis if niveis else ficha["vida"]}
+    return campos, niveis > 0
+
+def _aplicar_xp_lote(cursor, alvos, quantidade, curva=xp.PADRAO):
+    """
+    Lê todas as fichas de `alvos` numa consulta, calcula os level-ups e grava tudo
+    com um executemany. Retorna {(user_id, nome): (nivel, upou)}, com upou = "max"
+    para quem já estava no nível máximo; alvos sem ficha ficam de fora.
+    """
+    fichas = db.ler_fichas(cursor, alvos)
+    resultados = {}
+    atualizacoes = []
+    for chave, ficha in fichas.items():
+        calculo = _calcular_xp(ficha, quantidade, curva)
+        if calculo is None:
+            resultados[chave] = (ficha["nivel"], "max")
+            continue
+        campos, upou = calculo
+        atualizacoes.append((campos["xp"], campos["nivel"], campos["constituicao"],
+                             campos["pontos_atrib"], campos["pontos_res"], campos["vida"], *chave))
+        resultados[chave] = (campos["nivel"], upou)
+    cursor.executemany("""UPDATE fichas SET xp = ?, nivel = ?, constituicao = ?,
+                          pontos_atrib = ?, pontos_res = ?, vida = ?
+                          WHERE user_id = ? AND nome = ?""", atualizacoes)
+    return resultados
+
+def curva_xp(ctx):
+    """Curva de XP da campanha (servidor) do comando."""
+    return xp.curva(ctx.guild.id if ctx.guild else None)
+
+async def aplicar_xp_em_lote(alvos, quantidade, curva=xp.PADRAO):
+    """Dá XP a vários personagens [(user_id, nome)] numa única transação (um commit só)."""
+    alvos = list(dict.fromkeys((str(uid), nome) for uid, nome in alvos))
+    return await db.transacao_fichas(alvos, _aplicar_xp_lote, alvos, quantidade, curva)
+
+async def adicionar_xp_logica(user_id, nome_personagem, quantidade, curva=xp.PADRAO):
+    resultados = await aplicar_xp_em_lote([(user_id, nome_personagem)], quantidade, curva)
+    return resultados.get((str(user_id), nome_personagem), (None, False))
+
+def texto_equipamento(ficha):
+    """Linhas de arma e armadura equipadas a partir de uma ficha de db.obter_ficha()."""
+    equip_text = []
+    arma_equipada, armadura_equipada = ficha["arma_equipada"], ficha["armadura_equipada"]
+    if arma_equipada:
+        if ficha["arma_item"] is not None:
+            equip_text.append(f"**Arma:** {arma_equipada} (Nível {ficha['arma_nivel']} | {ficha['arma_d6']}d6 ataque)")
+        else:
+            equip_text.append(f"**Arma:** {arma_equipada} (não encontrada nos registros)")
+    else:
+        equip_text.append("**Arma:** Nenhuma")
+    if armadura_equipada:
+        if ficha["armadura_item"] is not None:
+            btext = []
+            if ficha["armadura_bonus_esquiva"]:
+                btext.append(f"+{ficha['armadura_bonus_esquiva']} Esquiva")
+            if ficha["armadura_bonus_velocidade"]:
+                btext.append(f"+{ficha['armadura_bonus_velocidade']} Vel")
+            bonus_str = " | ".join(btext) if btext else "Sem bônus"
+            equip_text.append(f"**Armadura:** {armadura_equipada} (Nível {ficha['armadura_nivel']} | {ficha['armadura_d6']}d6 defesa; {bonus_str})")
+        else:
+            equip_text.append(f"**Armadura:** {armadura_equipada} (não encontrada nos registros)")
+    else:
+        equip_text.append("**Armadura:** Nenhuma")
+    return "\n".join(equip_text)
+
+# ----------------------------
+# Cadastro e exclusão (transações)
+# ----------------------------
+def _cadastrar(cursor, user_id, nome, foto_url, stats, nivel, vida_inicial):
+    cursor.execute('''INSERT OR REPLACE INTO fichas
+        (user_id, nome, foto_url, forca, velocidade, esquiva, constituicao,
+        atordoamento, peste, doencas, sangramento, debuff, nivel, xp,
+        pontos_atrib, pontos_res, espaco_bolsa, saldo, estresse, vida, arma_equipada, armadura_equipada)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+        (user_id, nome, foto_url, *stats, nivel, 0, 0, 0, 6, 0, 0, vida_inicial, None, None))
+    cursor.execute("INSERT OR REPLACE INTO ativo (user_id, nome_personagem) VALUES (?, ?)", (user_id, nome))
+
+def _excluir(cursor, user_id, nome):
+    cursor.execute("DELETE FROM fichas WHERE user_id = ? AND nome = ?", (user_id, nome))
+    cursor.execute("DELETE FROM skills WHERE user_id = ? AND nome_personagem = ?", (user_id, nome))
+    cursor.execute("DELETE FROM armas WHERE user_id = ? AND nome_personagem = ?", (user_id, nome))
+    cursor.execute("DELETE FROM armaduras WHERE user_id = ? AND nome_personagem = ?", (user_id, nome))
+    cursor.execute("DELETE FROM ativo WHERE user_id = ? AND nome_personagem = ?", (user_id, nome))
+
+class Fichas(commands.Cog):
+    """Fichas, XP e atributos: cadastro, edição, personagem ativo."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    # ----------------------------
+    # Fichas, XP e Atributos
+    # ----------------------------
+    @commands.command()
+    async def upar(self, ctx, tipo: str, *, atributo: str):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use !set primeiro.")
+        mapa_atrib = {"forca": "forca", "vel": "velocidade", "esq": "esquiva", "const": "constituicao"}
+        mapa_res = {"atord": "atordoamento", "peste": "peste", "doenca": "doencas", "sangra": "sangramento", "debuff": "debuff"}
+        ficha_atual = await db.obter_ficha(ctx.author.id, ativo)
+        pontos = (ficha_atual["pontos_atrib"], ficha_atual["pontos_res"])
+        atr = atributo.lower().strip()
+        msg = ""
+        if tipo.lower() == "atributo":
+            if atr not in mapa_atrib:
+                return await ctx.send(f"❌ Escolha entre: {', '.join(mapa_atrib.keys())}")
+            if pontos[0] <= 0:
+                return await ctx.send("❌ Você não tem pontos de atributo para gastar.")
+            if atr == "const":
+                await db.executar_ficha(ctx.author.id, ativo, f"UPDATE fichas SET {mapa_atrib[atr]} = {mapa_atrib[atr]} + 1, pontos_atrib = pontos_atrib - 1, vida = vida + 5 WHERE user_id = ? AND nome = ?", (str(ctx.author.id), ativo))
+            else:
+                await db.executar_ficha(ctx.author.id, ativo, f"UPDATE fichas SET {mapa_atrib[atr]} = {mapa_atrib[atr]} + 1, pontos_atrib = pontos_atrib - 1 WHERE user_id = ? AND nome = ?", (str(ctx.author.id), ativo))
+            msg = f"✅ +1 em **{atr.capitalize()}**! (Pontos restantes: {pontos[0]-1})"
+        elif tipo.lower() in ["res", "resistencia"]:
+            if atr not in mapa_res:
+                return await ctx.send(f"❌ Escolha entre: {', '.join(mapa_res.keys())}")
+            if pontos[1] <= 0:
+                return await ctx.send("❌ Você não tem pontos de resistência para gastar.")
+            await db.executar_ficha(ctx.author.id, ativo, f"UPDATE fichas SET {mapa_res[atr]} = {mapa_res[atr]} + 1, pontos_res = pontos_res - 1 WHERE user_id = ? AND nome = ?", (str(ctx.author.id), ativo))
+            msg = f"✅ +1 em **Resistência a {atr.capitalize()}**! (Pontos restantes: {pontos[1]-1})"
+        else:
+            return await ctx.send("❌ Use `!upar atributo [nome]` ou `!upar res [nome]`.")
+        await ctx.send(f"✨ **{ativo}** evoluiu! {msg}")
+
+    @commands.command()
+    async def cadastrar(self, ctx, nome: str, foto_url: str, nivel: int = 1, *status: int):
+        stats = list(status)
+        while len(stats) < 9:
+            stats.append(0)
+        stats = stats[:9]
+        constituicao = stats[3]
+        vida_inicial = constituicao * 5
+        try:
+            await db.transacao_ficha(ctx.author.id, nome.strip(), _cadastrar, str(ctx.author.id), nome.strip(), foto_url.strip(),
+                                     stats, nivel, vida_inicial)
+            db.replicar(cache.definir_ativo, ctx.author.id, nome.strip())
+            db.replicar(indices.personagens.adicionar, str(ctx.author.id), nome.strip())
+            await ctx.send(f"✅ Ficha de **{nome}** salva no nível **{nivel}** e pronta pra aventura! (Vida: {vida_inicial})")
+        except Exception as e:
+            await ctx.send(f"❌ Erro ao cadastrar: {e}")
+
+    @commands.command()
+    async def ficha(self, ctx):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Você não tem um personagem ativo. Use `!set [nome]` ou `!cadastrar`.")
+        ficha_atual = await db.obter_ficha(ctx.author.id, ativo)
+        if not ficha_atual:
+            return await ctx.send(f"❌ Erro: Não encontrei os dados da ficha de **{ativo}**.")
+        (nome, foto_url, forca, velocidade, esquiva, constituicao,
+         atordoamento, peste, doencas, sangramento, debuff,
+         nivel, xp, pontos_atrib, pontos_res, espaco_bolsa, saldo, estresse, vida_atual) = (
+            ficha_atual[col] for col in ("nome", "foto_url", "forca", "velocidade", "esquiva", "constituicao",
+                                         "atordoamento", "peste", "doencas", "sangramento", "debuff",
+                                         "nivel", "xp", "pontos_atrib", "pontos_res", "espaco_bolsa", "saldo", "estresse", "vida"))
+        max_hp = (constituicao or 0) * 5
+        vida_atual = min(vida_atual or max_hp, max_hp)
+        prox_xp = curva_xp(ctx).xp_para_proximo(nivel)
+
+        emb = discord.Embed(title=f"📜 {nome} | Nível {nivel}", color=0x7289da)
+        emb.add_field(name="❤️ Vida", value=f"**{vida_atual}/{max_hp}**", inline=True)
+        emb.add_field(name="😰 Estresse", value=f"**{estresse}/200**", inline=True)
+        emb.add_field(name="📊 Experiência", value=f"`{xp:02d}/{prox_xp:02d}`", inline=False)
+
+        if pontos_atrib > 0 or pontos_res > 0:
+            emb.add_field(name="✨ Pontos Disponíveis", value=f"Atributos: **{pontos_atrib}** | Resistências: **{pontos_res}**\nUse `!upar` para gastar!", inline=False)
+
+        # Atributos principais (organizados)
+        emb.add_field(name="⚔️ Força", value=f"**{forca}**", inline=True)
+        emb.add_field(name="⚡ Vel", value=f"**{velocidade}**", inline=True)
+        emb.add_field(name="🛡️ Esq", value=f"**{esquiva}**", inline=True)
+        emb.add_field(name="❤️ Const", value=f"**{constituicao}**", inline=True)
+
+        # Resistências e condições
+        emb.add_field(name="🌀 Atordoamento", value=f"**{atordoamento}**", inline=True)
+        emb.add_field(name="🤢 Peste", value=f"**{peste}**", inline=True)
+        emb.add_field(name="🤒 Doença", value=f"**{doencas}**", inline=True)
+        emb.add_field(name="🩸 Sangramento", value=f"**{sangramento}**", inline=True)
+        emb.add_field(name="📉 Debuff", value=f"**{debuff}**", inline=True)
+
+        # Equipamento (já vem junto da ficha, pela visão fichas_equipadas)
+        emb.add_field(name="🧰 Equipamento", value=texto_equipamento(ficha_atual), inline=False)
+        emb.add_field(name="💰 Carteira", value=f"{formatar_saldo(saldo or 0)}", inline=False)
+        if str(foto_url).startswith("http"):
+            emb.set_image(url=foto_url)
+        emb.set_footer(text=f"Espaço na bolsa: {espaco_bolsa}")
+        await ctx.send(embed=emb)
+
+    # ----------------------------
+    # XP / Mestre
+    # ----------------------------
+    @commands.command()
+    async def ganharxp(self, ctx, quantidade: int):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        if quantidade <= 0:
+            return await ctx.send("❌ Forneça um valor de XP positivo.")
+        nv, res = await adicionar_xp_logica(ctx.author.id, ativo, quantidade, curva_xp(ctx))
+        if res == "max":
+            await ctx.send(f"🏆 {ativo} já está no nível máximo!")
+        elif res:
+            await ctx.send(f"🎊 **LEVEL UP!** {ativo} subiu para o nível **{nv}**! (Constituição aumentada e vida ajustada)")
+        else:
+            await ctx.send(f"✨ {ativo} ganhou {quantidade} de XP.")
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def darxp(self, ctx, membro: gateway.Membro, quantidade: int):
+        ativo = await get_ativo(membro.id)
+        if not ativo:
+            return await ctx.send(f"❌ {membro.display_name} não tem personagem ativo.")
+        if quantidade <= 0:
+            return await ctx.send("❌ Forneça um valor de XP positivo.")
+        nv, res = await adicionar_xp_logica(membro.id, ativo, quantidade, curva_xp(ctx))
+        if res == "max":
+            await ctx.send(f"🏆 {ativo} está no máximo.")
+        elif res:
+            await ctx.send(f"🎊 **LEVEL UP!** {membro.mention}, **{ativo}** subiu para o nível **{nv}**! (Constituição aumentada e vida ajustada)")
+        else:
+            await ctx.send(f"✨ **{membro.display_name}** recebeu {quantidade} de XP em **{ativo}**.")
+
+    @commands.command(name="darxpmulti")
+    async def darxp_multi(self, ctx, quantidade: int, *membros: gateway.Membro):
+        """
+        Dá XP para múltiplos jogadores mencionados.
+        Uso: !darxpmulti 50 @Jogador1 @Jogador2 ...
+        Requer permissão de Administrador (verificada manualmente para mensagem personalizada).
+        """
+        # Verificação manual de permissão para permitir mensagem personalizada
+        if not ctx.author.guild_permissions.administrator:
+            return await ctx.send("Opa opa espertinho, você não tem poderes o suficiente para distribuir XP, vai chorar no pv do mestre!")
+
+        if quantidade <= 0:
+            return await ctx.send("❌ Forneça um valor de XP positivo.")
+        if not membros:
+            return await ctx.send("❌ Mencione ao menos um jogador para receber XP. Ex: `!darxpmulti 50 @Jogador1 @Jogador2`")
+
+        resultados = []
+        upados = []
+        ja_max = []
+        sem_ficha = []
+
+        # Resolve os ativos (cache em memória) e aplica o XP do grupo todo num commit só
+        grupo = []
+        for membro in dict.fromkeys(membros):
+            ativo_membro = await get_ativo(membro.id)
+            if not ativo_membro:
+                sem_ficha.append(membro.display_name)
+                continue
+            grupo.append((membro, ativo_membro))
+        try:
+            aplicados = await aplicar_xp_em_lote([(m.id, nome) for m, nome in grupo], quantidade, curva_xp(ctx)) if grupo else {}
+        except Exception as e:
+            print(f"[ERROR] darxpmulti: {e}")
+            return await ctx.send("❌ Erro ao aplicar XP ao grupo. Nenhuma ficha foi alterada.")
+        for membro, ativo_membro in grupo:
+            nv, res = aplicados.get((str(membro.id), ativo_membro), (None, False))
+            if nv is None:
+                sem_ficha.append(membro.display_name)
+            elif res == "max":
+                ja_max.append(f"{membro.display_name} ({ativo_membro})")
+            elif res:
+                upados.append(f"{membro.display_name} ({ativo_membro}) → Nível {nv}")
+            else:
+                resultados.append(f"{membro.display_name} ({ativo_membro}) recebeu {quantidade} XP")
+
+        emb = discord.Embed(title="🎖️ Distribuição de XP em Grupo", color=discord.Color.gold())
+        if resultados:
+            emb.add_field(name="✨ XP aplicado", value="\n".join(resultados), inline=False)
+        if upados:
+            emb.add_field(name="🎉 Subiram de nível", value="\n".join(upados), inline=False)
+        if ja_max:
+            emb.add_field(name="🏆 Já no nível máximo", value="\n".join(ja_max), inline=False)
+        if sem_ficha:
+            emb.add_field(name="❌ Sem ficha ativa", value="\n".join(sem_ficha), inline=False)
+
+        if not (resultados or upados or ja_max):
+            await ctx.send("❌ Nenhum XP foi aplicado. Verifique se os jogadores mencionados têm fichas ativas.")
+            return
+
+        await ctx.send(embed=emb)
+
+
+    # ----------------------------
+    # Editar ficha
+    # ----------------------------
+    @commands.command()
+    async def editar(self, ctx, atributo: str, *, novo_valor: str):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use !set primeiro.")
+        mapa = {"nome": "nome", "foto": "foto_url", "forca": "forca", "vel": "velocidade", "esq": "esquiva", "const": "constituicao", "atord": "atordoamento", "peste": "peste", "doenca": "doencas", "sangra": "sangramento", "debuff": "debuff", "nivel": "nivel"}
+        atr = atributo.lower()
+        if atr not in mapa:
+            return await ctx.send("❌ Atributo inválido.")
+        try:
+            if atr == "nivel":
+                # "!editar nivel 7" zera a barra de XP; "!editar nivel 450xp" calcula nível e barra pelo XP total
+                curva = curva_xp(ctx)
+                valor = novo_valor.strip().lower()
+                if valor.endswith("xp"):
+                    novo_nivel, novo_xp = curva.nivel_por_total(int(valor[:-2]))
+                else:
+                    novo_nivel, novo_xp = int(valor), 0
+                if not 1 <= novo_nivel <= curva.nivel_max:
+                    return await ctx.send(f"❌ O nível deve estar entre 1 e {curva.nivel_max}.")
+                await db.executar_ficha(ctx.author.id, ativo, "UPDATE fichas SET nivel = ?, xp = ? WHERE user_id = ? AND nome = ?", (novo_nivel, novo_xp, str(ctx.author.id), ativo))
+            elif atr == "const":
+                ficha_atual = await db.obter_ficha(ctx.author.id, ativo)
+                if not ficha_atual:
+                    return await ctx.send("❌ Ficha não encontrada.")
+                const_atual, vida_atual = ficha_atual["constituicao"], ficha_atual["vida"]
+                novo_const = int(novo_valor)
+                delta = novo_const - (const_atual or 0)
+                nova_vida = (vida_atual or 0) + (delta * 5)
+                if nova_vida < 0:
+                    nova_vida = 0
+                await db.executar_ficha(ctx.author.id, ativo, "UPDATE fichas SET constituicao = ?, vida = ? WHERE user_id = ? AND nome = ?", (novo_const, nova_vida, str(ctx.author.id), ativo))
+            else:
+                await db.executar_ficha(ctx.author.id, ativo, f"UPDATE fichas SET {mapa[atr]} = ? WHERE user_id = ? AND nome = ?", (novo_valor.strip(), str(ctx.author.id), ativo))
+                if atr == "nome":
+                    db.replicar(indices.personagens.remover, str(ctx.author.id), ativo)
+                    db.replicar(indices.personagens.adicionar, str(ctx.author.id), novo_valor.strip())
+            await ctx.send(f"✨ **{atr.capitalize()}** de {ativo} atualizado!")
+        except Exception as e:
+            await ctx.send(f"❌ Erro ao editar: {e}")
+
+    # ----------------------------
+    # Comandos auxiliares: set, minhasfichas, excluirficha
+    # ----------------------------
+    @commands.hybrid_command()
+    @app_commands.describe(nome="Personagem que fica ativo")
+    @app_commands.autocomplete(nome=autocompletar_personagem)
+    async def set(self, ctx, *, nome: str):
+        """Escolhe o personagem ativo."""
+        nome = nome.strip()
+        if not await db.obter_ficha(ctx.author.id, nome):
+            palpite = indices.personagens.corrigir(str(ctx.author.id), nome)
+            if not (palpite and palpite[1] and await db.obter_ficha(ctx.author.id, palpite[0])):
+                return await ctx.send(f"❌ Ficha não encontrada.{quis_dizer(palpite)}")
+            nome = palpite[0]
+        await db.executar("INSERT OR REPLACE INTO ativo (user_id, nome_personagem) VALUES (?, ?)", (str(ctx.author.id), nome))
+        db.replicar(cache.definir_ativo, ctx.author.id, nome)
+        await ctx.send(f"✅ Ativo: **{nome}**")
+
+    @commands.command()
+    async def minhasfichas(self, ctx):
+        fichas = await db.buscar_todos("SELECT nome FROM fichas WHERE user_id = ?", (str(ctx.author.id),))
+        ativo = await get_ativo(ctx.author.id)
+        if fichas:
+            lista = "\n".join([f"• **{f[0]}** {'🌟 (ATIVO)' if f[0] == ativo else ''}" for f in fichas])
+            await ctx.send(f"📚 **Seus Personagens:**\n{lista}")
+        else:
+            await ctx.send("❓ Nenhuma ficha encontrada.")
+
+    @commands.hybrid_command()
+    @app_commands.describe(nome="Personagem a excluir")
+    @app_commands.autocomplete(nome=autocompletar_personagem)
+    async def excluirficha(self, ctx, *, nome: str):
+        """Exclui um personagem seu (ficha, skills e equipamento)."""
+        await db.transacao_ficha(ctx.author.id, nome.strip(), _excluir, str(ctx.author.id), nome.strip())
+        db.replicar(cache.remover_ativo, ctx.author.id, nome.strip())
+        db.replicar(indices.esquecer_personagem, ctx.author.id, nome.strip())
+        await ctx.send(f"🗑️ **{nome}** excluído.")
+
+async def setup(bot):
+    await bot.add_cog(Fichas(bot))
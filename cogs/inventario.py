@@ -0,0 +1,117 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import db
+import gateway
+import indices
+import paginacao
+from comum import get_ativo, autocompletar_item, quis_dizer
+
+# ----------------------------
+# Inventário (inv, inv adicionar, inv expandir, usar)
+# ----------------------------
+ITENS_POR_PAGINA = 20
+
+# Transações no módulo, não dentro dos comandos: vão por pickle até o processo escritor (db.usar_escritor)
+def _expandir(cursor, user_id, ativo, quantidade):
+    cursor.execute("UPDATE fichas SET espaco_bolsa = espaco_bolsa + ? WHERE user_id = ? AND nome = ?", (quantidade, user_id, ativo))
+    cursor.execute("SELECT espaco_bolsa FROM fichas WHERE user_id = ? AND nome = ?", (user_id, ativo))
+    return cursor.fetchone()[0]
+
+def _usar(cursor, user_id, ativo, nome_item, quantidade):
+    # None = não tinha o bastante; senão quantas linhas saíram da bolsa (0 ou 1)
+    chave = (user_id, ativo, nome_item)
+    cursor.execute("UPDATE inventario SET quantidade = quantidade - ? WHERE user_id = ? AND nome_personagem = ? AND item_nome = ? AND quantidade >= ?",
+                   (quantidade, *chave, quantidade))
+    if cursor.rowcount == 0:
+        return None
+    return cursor.execute("DELETE FROM inventario WHERE user_id = ? AND nome_personagem = ? AND item_nome = ? AND quantidade <= 0", chave).rowcount
+
+class Inventario(commands.Cog):
+    """Inventário: listar, adicionar, expandir e usar itens."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.group(name="inventario", invoke_without_command=True, aliases=["inv", "Inventário"])
+    async def inventario(self, ctx):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use !set primeiro.")
+        ficha_atual = await db.obter_ficha(ctx.author.id, ativo)
+        if not ficha_atual:
+            return await ctx.send("❌ Ficha não encontrada.")
+        ocupados, espaco = ficha_atual["slots_ocupados"], ficha_atual["espaco_bolsa"]
+
+        def montar(itens, pagina, paginas):
+            embed = discord.Embed(title=f"🎒 Inventário de {ativo}", color=discord.Color.dark_green())
+            if not itens:
+                embed.description = "Sua bolsa está vazia."
+            else:
+                embed.description = "\n".join([f"• **{item[0]}** x{item[1]}" for item in itens])
+            rodape = f"Espaço: {ocupados}/{espaco}"
+            if paginas > 1:
+                rodape += f" • Página {pagina}/{paginas}"
+            embed.set_footer(text=rodape)
+            return embed
+
+        # slots_ocupados é o número de linhas do inventário: dá o total sem COUNT
+        await paginacao.Paginador(ctx.author.id,
+            "SELECT item_nome, quantidade FROM inventario WHERE user_id = ? AND nome_personagem = ?",
+            (str(ctx.author.id), ativo), "item_nome", montar, ocupados, por_pagina=ITENS_POR_PAGINA).enviar(ctx)
+
+    @inventario.command(name="adicionar")
+    async def inv_add(self, ctx, item: str, quantidade: int = 1):
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use !set primeiro.")
+        # Checagem de espaço + upsert numa instrução: item que já está na bolsa só soma
+        # a quantidade; item novo só entra se slots_ocupados < espaco_bolsa.
+        uid, chave_item = str(ctx.author.id), item.lower()
+        gravou = await db.executar_ficha(ctx.author.id, ativo, '''INSERT INTO inventario (user_id, nome_personagem, item_nome, quantidade)
+                      SELECT ?, ?, ?, ?
+                      WHERE EXISTS (SELECT 1 FROM inventario WHERE user_id = ? AND nome_personagem = ? AND item_nome = ?)
+                         OR EXISTS (SELECT 1 FROM fichas WHERE user_id = ? AND nome = ? AND slots_ocupados < espaco_bolsa)
+                      ON CONFLICT(user_id, nome_personagem, item_nome)
+                      DO UPDATE SET quantidade = quantidade + excluded.quantidade''',
+                   (uid, ativo, chave_item, quantidade, uid, ativo, chave_item, uid, ativo))
+        if not gravou:
+            return await ctx.send("Oh-oh... Não tem espaço na bolsa para isso.")
+        db.replicar(indices.itens.adicionar, (uid, ativo), chave_item)
+        await ctx.send(f"📦 **{quantidade}x {item}** adicionado ao inventário de **{ativo}**!")
+
+    @inventario.command(name="expandir")
+    @commands.has_permissions(administrator=True)
+    async def inv_expandir(self, ctx, membro: gateway.Membro, quantidade: int = 1):
+        ativo = await get_ativo(membro.id)
+        if not ativo:
+            return await ctx.send(f"❌ {membro.display_name} não tem um personagem ativo no momento.")
+        novo_limite = await db.transacao_ficha(membro.id, ativo, _expandir, str(membro.id), ativo, quantidade)
+        await ctx.send(f"🎒 A bolsa de **{ativo}** (Personagem de {membro.mention}) foi expandida em +{quantidade}!\nTotal atual: **{novo_limite}** slots.")
+
+    @commands.hybrid_command(name="usar")
+    @app_commands.describe(item="Item do inventário", quantidade="Quantos usar")
+    @app_commands.autocomplete(item=autocompletar_item)
+    async def usar_item(self, ctx, item: str, quantidade: int = 1):
+        """Usa (consome) itens do inventário do personagem ativo."""
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use !set primeiro.")
+        grupo = (str(ctx.author.id), ativo)
+        acabou = await db.transacao_ficha(ctx.author.id, ativo, _usar, *grupo, item.lower(), quantidade)
+        if acabou is None and not indices.itens.contem(grupo, item.lower()):
+            # Nome errado (não falta de quantidade): tenta o item mais parecido da bolsa
+            palpite = indices.itens.corrigir(grupo, item)
+            if not (palpite and palpite[1]):
+                return await ctx.send(f"❌ Item **{item}** não está na bolsa de **{ativo}**.{quis_dizer(palpite)}")
+            item = palpite[0]
+            acabou = await db.transacao_ficha(ctx.author.id, ativo, _usar, *grupo, item, quantidade)
+        if acabou is None:
+            return await ctx.send(f"❌ Você não tem {quantidade}x {item} para usar.")
+        if acabou:
+            db.replicar(indices.itens.remover, grupo, item.lower())
+        await ctx.send(f"✨ **{ativo}** usou {quantidade}x **{item}**!")
+
+async def setup(bot):
+    await bot.add_cog(Inventario(bot))
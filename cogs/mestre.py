@@ -0,0 +1,102 @@
+import asyncio
+
+import discord
+from discord.ext import commands
+
+import db
+import envio
+import gateway
+import simulador
+from comum import get_ativo
+
+# ----------------------------
+# Simulador de combate (Mestre)
+# ----------------------------
+LIMITE_SIMULACAO = 500000
+
+async def _combatente(ctx, referencia):
+    """Combatente do simulador a partir de uma menção (personagem ativo) ou do nome do personagem."""
+    membro = await gateway.membro(ctx, referencia)
+    if membro:
+        nome = await get_ativo(membro.id)
+        if not nome:
+            return None
+        ficha_alvo = await db.obter_ficha(membro.id, nome)
+    else:
+        ficha_alvo = await db.buscar_um("SELECT user_id, nome FROM fichas WHERE lower(nome) = ?", (referencia.lower(),))
+        if ficha_alvo:
+            ficha_alvo = await db.obter_ficha(ficha_alvo[0], ficha_alvo[1])
+    if not ficha_alvo:
+        return None
+    skills = await db.buscar_todos("SELECT nome_skill, dano_formula, tipo FROM skills WHERE user_id = ? AND nome_personagem = ?",
+                                   (ficha_alvo["user_id"], ficha_alvo["nome"]))
+    # combatente() calcula a distribuição das skills grandes para ver se entram: numa thread, fora do loop
+    return await asyncio.to_thread(simulador.combatente, ficha_alvo, skills)
+
+class Mestre(commands.Cog):
+    """Ferramentas do mestre: simulador, fila de envio e recarga de extensões."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name="simular")
+    @commands.has_permissions(administrator=True)
+    async def simular(self, ctx, a: str, b: str, lutas: int = 100000):
+        """
+        Simula lutas entre dois personagens (menção ou nome) num pool de processos.
+        Uso: !simular @Jogador1 "Lyra" 200000
+        """
+        if not 1 <= lutas <= LIMITE_SIMULACAO:
+            return await ctx.send(f"❌ Escolha entre 1 e {LIMITE_SIMULACAO} lutas.")
+        ca, cb = await _combatente(ctx, a), await _combatente(ctx, b)
+        if not ca or not cb:
+            return await ctx.send("❌ Não encontrei a ficha de um dos lados. Mencione o jogador ou use o nome exato do personagem.")
+        aviso = await ctx.send(f"⏳ Simulando {lutas} lutas entre **{ca['nome']}** e **{cb['nome']}**...", esperar=True)
+        try:
+            res = simulador.resumo(await simulador.simular(ca, cb, lutas), ca, cb)
+        except Exception as e:
+            return await aviso.edit(content=f"❌ Erro na simulação: {e}")
+        emb = discord.Embed(title=f"🧪 {ca['nome']} x {cb['nome']}", color=0x8e44ad,
+                            description=f"{res['lutas']} lutas simuladas")
+        for c, taxa, dano in zip((ca, cb), res["vitorias"], res["dano_por_acerto"]):
+            emb.add_field(name=f"🏆 {c['nome']}", value=(
+                f"Vitórias: **{taxa:.1%}**\n"
+                f"Dano por acerto: média **{dano['media']:.1f}** "
+                f"(p10 {dano.get('p10', 0)} | p50 {dano.get('p50', 0)} | p90 {dano.get('p90', 0)})"
+            ), inline=False)
+        emb.add_field(name="🤝 Empates", value=f"{res['empates']:.1%}", inline=True)
+        rodadas = res["rodadas"]
+        emb.add_field(name="⏱️ Rodadas por luta", value=f"p10 {rodadas['p10']} | p50 {rodadas['p50']} | p90 {rodadas['p90']}", inline=True)
+        ignoradas = [f"{c['nome']}: {', '.join(c['ignoradas'])}" for c in (ca, cb) if c["ignoradas"]]
+        if ignoradas:
+            emb.add_field(name="⚠️ Skills fora da simulação (dados demais)", value="\n".join(ignoradas), inline=False)
+        emb.set_footer(text="Modelo simplificado: força para acertar, esquiva para evitar, arma/skills menos armadura.")
+        await aviso.edit(content=None, embed=emb)
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def fila(self, ctx):
+        """Métricas da fila de envio (envio.py): profundidade, mensagens juntadas e espera."""
+        est = envio.estatisticas()
+        emb = discord.Embed(title="📮 Fila de envio", color=0x34495e)
+        emb.add_field(name="📥 Na fila", value=f"**{est['na_fila']}** (maior: {est['maior_fila']}) em {est['canais']} canais", inline=True)
+        emb.add_field(name="📨 Respostas", value=f"**{est['pedidos']}** em {est['mensagens']} mensagens ({est['juntadas']} juntadas)", inline=True)
+        emb.add_field(name="⏱️ Espera", value=f"média {est['espera_media_ms']:.0f} ms | máx. {est['espera_max_ms']:.0f} ms", inline=True)
+        await ctx.send(embed=emb)
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def recarregar(self, ctx, extensao: str = None):
+        """
+        Recarrega as extensões de comandos sem reiniciar o bot.
+        Uso: !recarregar         -> todas
+             !recarregar skills  -> só cogs.skills
+        """
+        try:
+            tempos = await self.bot.recarregar(extensao)
+        except commands.ExtensionError as e:
+            return await ctx.send(f"❌ Falha ao recarregar: {e}")
+        await ctx.send("🔄 Recarregadas: " + ", ".join(f"`{nome}` ({ms:.0f} ms)" for nome, ms in tempos))
+
+async def setup(bot):
+    await bot.add_cog(Mestre(bot))
@@ -0,0 +1,212 @@
+import asyncio
+
+import discord
+from discord.ext import commands
+
+import dados
+import db
+import probabilidade
+import rng
+from comum import get_ativo, rolar_dado, rolar_equipamento
+
+# ----------------------------
+# Rolagens e utilitários de teste
+# ----------------------------
+# Atributos testáveis no d20 (nome no comando -> coluna em fichas)
+ATRIBUTOS_TESTE = {
+    "forca": "forca", "velocidade": "velocidade", "esquiva": "esquiva",
+    "constituicao": "constituicao", "atordoamento": "atordoamento",
+    "peste": "peste", "doenca": "doencas", "sangramento": "sangramento", "debuff": "debuff"
+}
+
+def _porcento(p):
+    return f"{p * 100:.1f}%"
+
+class Rolagens(commands.Cog):
+    """Rolagens de teste, chance, defesa e sessões de rolagem."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command()
+    async def rolar(self, ctx, atributo: str, bonus: int = 0):
+        """
+        Rola um d20 contra um atributo com bônus temporário opcional.
+        Uso:
+          !rolar esquiva
+          !rolar esquiva 2   -> aplica +2 ao limite apenas nesta rolagem
+          !rolar forca -1    -> aplica -1 ao limite (penalidade temporária)
+        """
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use !set primeiro.")
+        atr = atributo.lower()
+        if atr not in ATRIBUTOS_TESTE:
+            return await ctx.send("❌ Atributo inválido. Use: forca, velocidade, esquiva, constituicao, atordoamento, peste, doenca, sangramento, debuff.")
+        ficha_atual = await db.obter_ficha(ctx.author.id, ativo)
+        val = (ficha_atual[ATRIBUTOS_TESTE[atr]] or 0) if ficha_atual else 0
+
+        # rola d20
+        dado = await rolar_dado(ctx, 20)
+        limite_original = val
+        limite_efetivo = val + (bonus or 0)
+
+        # lógica de resultado (1 = crítico de sucesso, 20 = falha crítica)
+        if dado == 1:
+            titulo, cor = f"🌟 SUCESSO CRÍTICO em {atr.capitalize()}!", 0xffd700
+            # Mensagens especiais para críticos positivos por atributo
+            if atr == "esquiva":
+                frase = "Uma dádiva dos ninjas, você esquiva facilmente!"
+            elif atr == "forca":
+                frase = "Birrrll aqui é bodybuilder, porra!"
+            elif atr == "velocidade":
+                frase = "Zuuuummmm!"
+            else:
+                frase = "🥷 **Sucesso absoluto!**"
+        elif dado == 20:
+            titulo, cor, frase = "💀 FALHA CRÍTICA!", 0x000000, "Xih... Você tirou 20. Se fodeu."
+        elif dado <= limite_efetivo:
+            titulo, cor, frase = "✅ SUCESSO!", 0x2ecc71, "Mandou bem!"
+        else:
+            titulo, cor, frase = "❌ FALHA!", 0xe74c3c, "Não foi dessa vez..."
+
+        emb = discord.Embed(title=titulo, color=cor, description=frase)
+        emb.add_field(name="🎲 Dado (d20)", value=f"**{dado}**", inline=True)
+        emb.add_field(name="📏 Limite", value=f"**{limite_original}**", inline=True)
+        emb.add_field(name="➕ Bônus temporário", value=f"**{bonus}**", inline=True)
+        emb.add_field(name="📈 Limite efetivo", value=f"**{limite_efetivo}**", inline=False)
+        emb.set_footer(text=f"Personagem: {ativo}")
+        await ctx.send(embed=emb)
+
+    @commands.command()
+    async def precisão(self, ctx):
+        await ctx.send(embed=discord.Embed(title="🎯 Precisão", description=f"Resultado: **{await rolar_dado(ctx, 20)}**", color=0x3498db))
+
+    @commands.command()
+    async def intuição(self, ctx):
+        await ctx.send(embed=discord.Embed(title="🧠 Intuição", description=f"Resultado: **{await rolar_dado(ctx, 20)}**", color=0x9b59b6))
+
+    @commands.command()
+    async def percepção(self, ctx):
+        d = await rolar_dado(ctx, 6)
+        msg, cor = ("🌟 **CRÍTICO! Tá afiando, em?!**", 0xf1c40f) if d == 6 else (f"Resultado: **{d}**", 0x2ecc71)
+        await ctx.send(embed=discord.Embed(title="👀 Percepção", description=msg, color=cor))
+
+    @commands.command()
+    async def chance(self, ctx, *, consulta: str):
+        """
+        Chances calculadas (exatas) antes de rolar.
+        Uso:
+          !chance esquiva 2     -> chance de passar no !rolar esquiva 2 (com os críticos no 1 e no 20)
+          !chance 3d6+2         -> distribuição de uma fórmula
+          !chance Bola de Fogo  -> distribuição do dano/cura de uma skill sua
+        """
+        partes = consulta.split()
+        atr = partes[0].lower()
+        if atr in ATRIBUTOS_TESTE and len(partes) <= 2:
+            ativo = await get_ativo(ctx.author.id)
+            if not ativo:
+                return await ctx.send("❌ Use !set primeiro.")
+            try:
+                bonus = int(partes[1]) if len(partes) == 2 else 0
+            except ValueError:
+                return await ctx.send("❌ O bônus deve ser um número inteiro.")
+            ficha_atual = await db.obter_ficha(ctx.author.id, ativo)
+            limite = ((ficha_atual[ATRIBUTOS_TESTE[atr]] or 0) if ficha_atual else 0) + bonus
+            chances = probabilidade.chance_d20(limite)
+            emb = discord.Embed(title=f"📊 Chance em {atr.capitalize()}", color=0x3498db,
+                                description=f"d20 contra limite efetivo **{limite}**")
+            emb.add_field(name="✅ Sucesso", value=f"**{_porcento(chances['sucesso'])}**", inline=True)
+            emb.add_field(name="🌟 Crítico (1)", value=_porcento(chances["critico"]), inline=True)
+            emb.add_field(name="💀 Falha crítica (20)", value=_porcento(chances["falha_critica"]), inline=True)
+            emb.set_footer(text=f"Personagem: {ativo}")
+            return await ctx.send(embed=emb)
+
+        titulo, formula = consulta.strip(), consulta.strip()
+        if not dados.valida(formula):
+            ativo = await get_ativo(ctx.author.id)
+            if not ativo:
+                return await ctx.send("❌ Use !set primeiro.")
+            row = await db.buscar_um("SELECT nome_skill, dano_formula FROM skills WHERE user_id = ? AND nome_personagem = ? AND nome_skill = ?",
+                                     (str(ctx.author.id), ativo, consulta.lower().strip()))
+            if not row:
+                return await ctx.send("❌ Não é atributo, fórmula de dados nem skill sua.")
+            titulo, formula = row[0].capitalize(), row[1]
+            if not dados.valida(formula):
+                return await ctx.send(f"❌ A skill **{titulo}** não tem uma fórmula de dados válida.")
+        try:
+            # A convolução é CPU pura: numa thread, para não segurar os outros comandos
+            dist = await asyncio.to_thread(dados.compilar(formula).distribuicao)
+        except probabilidade.DistribuicaoGrande as e:
+            return await ctx.send(f"❌ Não dá para calcular exato: {e}.")
+        emb = discord.Embed(title=f"📊 Distribuição — {titulo}", color=0x3498db, description=f"Fórmula: `{formula}`")
+        emb.add_field(name="📉 Mín / 📈 Máx", value=f"**{min(dist)}** / **{max(dist)}**", inline=True)
+        emb.add_field(name="➗ Média", value=f"**{probabilidade.media(dist):.2f}**", inline=True)
+        emb.add_field(name="🎯 Percentis",
+                      value=" | ".join(f"p{int(p * 100)}: **{probabilidade.percentil(dist, p)}**" for p in (0.1, 0.25, 0.5, 0.75, 0.9)),
+                      inline=False)
+        await ctx.send(embed=emb)
+
+    @commands.command()
+    async def defender(self, ctx, *modificador: str):
+        """Rola os d6 da armadura equipada, com modificador opcional (mesmo formato do !atacar)."""
+        await rolar_equipamento(ctx, "armadura", modificador)
+
+    # ----------------------------
+    # Sessões de rolagem (semente por canal e auditoria)
+    # ----------------------------
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def semente(self, ctx, *, valor: str = None):
+        """
+        Abre uma sessão de rolagens nova neste canal.
+        Uso: !semente            -> semente aleatória (só o hash é mostrado até a auditoria)
+             !semente mesa-sexta -> semente escolhida (rolagens reproduzíveis)
+        """
+        fluxo = await rng.iniciar_sessao(ctx.channel.id, valor.strip() if valor else None)
+        emb = discord.Embed(title="🎲 Nova sessão de rolagens", color=0x16a085,
+                            description=f"Sessão **#{fluxo.sessao_id}** neste canal.")
+        emb.add_field(name="🔒 Compromisso", value=f"`{fluxo.compromisso}`", inline=True)
+        emb.set_footer(text="Use !auditar para refazer as rolagens da sessão e revelar a semente.")
+        await ctx.send(embed=emb)
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def auditar(self, ctx, sessao_id: int = None):
+        """
+        Refaz todas as rolagens de uma sessão a partir da semente e confere com o registro.
+        Uso: !auditar [sessão]  (sem número: a sessão atual deste canal)
+        A sessão atual do canal é encerrada antes (abre outra): a semente revelada
+        não serve para prever as próximas rolagens.
+        """
+        atual = await rng.fluxo(ctx.channel.id)
+        nova = None
+        if sessao_id is None or sessao_id == atual.sessao_id:
+            sessao_id = atual.sessao_id
+            nova = await rng.iniciar_sessao(ctx.channel.id)
+        try:
+            auditoria = await rng.auditar(sessao_id)
+        except rng.SessaoAberta as e:
+            return await ctx.send(f"❌ A sessão #{sessao_id} ainda está em uso em <#{e}>. "
+                                  "Audite por lá (`!auditar` encerra a sessão antes) ou abra outra com `!semente`.")
+        if auditoria is None:
+            return await ctx.send("❌ Sessão não encontrada.")
+        (_, canal_id, semente_sessao, inicio), registros, (conferidas, divergencias, faltando) = auditoria
+        ok = not divergencias and faltando is None
+        emb = discord.Embed(title=f"🔍 Auditoria da sessão #{sessao_id}", color=0x2ecc71 if ok else 0xe74c3c,
+                            description=f"Canal <#{canal_id}> — início {inicio}")
+        emb.add_field(name="🎲 Rolagens", value=f"**{registros}** registradas, **{conferidas}** conferidas", inline=True)
+        emb.add_field(name="🔑 Semente", value=f"`{semente_sessao}`", inline=True)
+        if divergencias:
+            emb.add_field(name="⚠️ Divergências", value="\n".join(
+                f"#{seq}: registrado {registrado}, refeito {refeito}" for seq, registrado, refeito in divergencias[:10]), inline=False)
+        if faltando is not None:
+            emb.add_field(name="⚠️ Registro incompleto", value=f"Falta a rolagem #{faltando}; as seguintes não foram conferidas.", inline=False)
+        if nova is not None:
+            emb.add_field(name="🎲 Nova sessão", value=f"**#{nova.sessao_id}** neste canal (`{nova.compromisso}`)", inline=False)
+        if ok:
+            emb.set_footer(text="Todas as rolagens batem com a semente.")
+        await ctx.send(embed=emb)
+
+async def setup(bot):
+    await bot.add_cog(Rolagens(bot))
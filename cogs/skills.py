@@ -0,0 +1,263 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import busca
+import db
+import gateway
+import indices
+import paginacao
+from comum import get_ativo, autocompletar_skill, quis_dizer, erro_limite_formula, rolar_dados
+
+# ----------------------------
+# Skills: adicionar, editar, listar, info, executar, remover
+# ----------------------------
+class Skills(commands.Cog):
+    """Skills: adicionar, editar, listar, info, executar, remover."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command()
+    async def addskill(self, ctx, nome: str, dano: str, tipo: str = "dano", *, desc: str = ""):
+        """
+        Cadastra uma skill.
+        Uso:
+          !addskill "Granada de Praga" 2d6 dano Causa peste
+          !addskill "Cura Leve" 2d6 cura Restaura vida ao alvo
+        - tipo: 'dano' (padrão) ou 'cura'
+        - nome: use aspas se tiver espaços
+        """
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        tipo_clean = tipo.lower().strip()
+        if tipo_clean not in ("dano", "cura", "heal", "curar"):
+            return await ctx.send("❌ Tipo inválido. Use `dano` ou `cura`.")
+        if tipo_clean in ("heal", "curar"):
+            tipo_clean = "cura"
+        erro = erro_limite_formula(dano)
+        if erro:
+            return await ctx.send(erro)
+        try:
+            await db.executar('''INSERT OR REPLACE INTO skills (user_id, nome_personagem, nome_skill, dano_formula, descricao, tipo)
+                          VALUES (?, ?, ?, ?, ?, ?)''',
+                       (str(ctx.author.id), ativo, nome.lower().strip(), dano.strip(), desc.strip(), tipo_clean))
+            db.replicar(indices.skills.adicionar, (str(ctx.author.id), ativo), nome.lower().strip())
+            await ctx.send(f"💥 Skill **{nome}** ({tipo_clean}) adicionada para **{ativo}**!")
+        except Exception as e:
+            await ctx.send(f"❌ Erro ao adicionar skill: {e}")
+
+    @commands.command()
+    async def editskill(self, ctx, nome: str, campo: str, *, valor: str):
+        """
+        Edita campo de skill. Campos válidos: dano, desc, tipo
+        Ex: !editskill cura dano 3d6
+        """
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        mapa = {"dano": "dano_formula", "desc": "descricao", "tipo": "tipo"}
+        campo_low = campo.lower().strip()
+        if campo_low not in mapa:
+            return await ctx.send("❌ Escolha `dano`, `desc` ou `tipo`.")
+        if campo_low == "dano":
+            erro = erro_limite_formula(valor)
+            if erro:
+                return await ctx.send(erro)
+        try:
+            sucesso = await db.executar(f"UPDATE skills SET {mapa[campo_low]} = ? WHERE user_id = ? AND nome_personagem = ? AND nome_skill = ?",
+                                  (valor.strip(), str(ctx.author.id), ativo, nome.lower().strip())) > 0
+            await ctx.send(f"🆙 Skill **{nome}** de {ativo} atualizada!" if sucesso else "❌ Skill não encontrada.")
+        except Exception as e:
+            await ctx.send(f"❌ Erro ao editar skill: {e}")
+
+    @commands.hybrid_command(name="removeskill", aliases=["excluirskill", "deleteskill"])
+    @app_commands.describe(nome="Skill a remover")
+    @app_commands.autocomplete(nome=autocompletar_skill)
+    async def remove_skill(self, ctx, *, nome: str):
+        """
+        Remove uma skill do personagem ativo.
+        Uso: !removeskill "Nome da Skill"
+        """
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        nome_clean = nome.lower().strip()
+        if await db.executar("DELETE FROM skills WHERE user_id = ? AND nome_personagem = ? AND nome_skill = ?", (str(ctx.author.id), ativo, nome_clean)) > 0:
+            db.replicar(indices.skills.remover, (str(ctx.author.id), ativo), nome_clean)
+            await ctx.send(f"🗑️ Skill **{nome}** removida de **{ativo}**.")
+        else:
+            await ctx.send("❌ Skill não encontrada. Verifique o nome e tente novamente.")
+
+    @commands.command(name="skills")
+    async def listar_skills(self, ctx, *, filtro: str = None):
+        """
+        Lista todas as skills do personagem ativo.
+        Uso:
+          !skills
+          !skills fogo   -> busca 'fogo' (e prefixos: 'fo' acha 'Fogo') no nome ou descrição,
+                            mais relevantes primeiro
+        Exibe cada skill como um campo do embed com nome, dano, tipo e descrição completa,
+        12 por página numa mensagem só (botões ◀ ▶).
+        """
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        params = (str(ctx.author.id), ativo)
+        if filtro:
+            consulta = busca.consulta_prefixo(filtro)
+            if not consulta:
+                return await ctx.send(f"❌ Nenhuma skill encontrada com '{filtro}'.")
+            # Busca no índice FTS5; a página anda por (relevância, id)
+            params = (consulta, *params)
+            sql = f"""SELECT {busca.RELEVANCIA}, s.id, s.nome_skill, s.dano_formula, s.descricao, s.tipo
+                      FROM skills_busca JOIN skills s ON s.id = skills_busca.rowid
+                      WHERE skills_busca MATCH ? AND s.user_id = ? AND s.nome_personagem = ?"""
+            chave = (busca.RELEVANCIA, "s.id")
+            total = (await db.buscar_um("""SELECT COUNT(*) FROM skills_busca JOIN skills s ON s.id = skills_busca.rowid
+                                           WHERE skills_busca MATCH ? AND s.user_id = ? AND s.nome_personagem = ?""", params))[0]
+        else:
+            # nome_skill pode repetir (skills não tem UNIQUE): o id desempata a chave da página
+            sql = """SELECT nome_skill, id, nome_skill, dano_formula, descricao, tipo FROM skills
+                     WHERE user_id = ? AND nome_personagem = ?"""
+            chave = ("nome_skill", "id")
+            total = (await db.buscar_um("SELECT COUNT(*) FROM skills WHERE user_id = ? AND nome_personagem = ?", params))[0]
+        if not total:
+            if filtro:
+                return await ctx.send(f"❌ Nenhuma skill encontrada com '{filtro}'.")
+            return await ctx.send("❌ Nenhuma skill cadastrada para este personagem.")
+
+        def montar(rows, pagina, paginas):
+            emb = discord.Embed(title=f"🧾 Skills de {ativo}", color=0x1abc9c)
+            for *_, nome, dano, desc, tipo in rows:
+                nome_display = nome.capitalize()
+                dano_display = dano or "—"
+                desc_display = desc or "Sem descrição."
+                tipo_display = "CURA" if (tipo or "dano").lower() == "cura" else "DANO"
+                emb.add_field(name=f"{nome_display} — [{tipo_display}] {dano_display}", value=desc_display, inline=False)
+            emb.set_footer(text=f"Página {pagina}/{paginas} • {total} skills — `!skillinfo NomeDaSkill` para detalhes, `!skill NomeDaSkill @alvo` para executar.")
+            return emb
+
+        # Só a página visível vem do banco; os botões buscam as outras sob demanda
+        await paginacao.Paginador(ctx.author.id, sql, params, chave, montar, total).enviar(ctx)
+
+    @commands.hybrid_command(name="skillinfo")
+    @app_commands.describe(nome="Skill do personagem ativo")
+    @app_commands.autocomplete(nome=autocompletar_skill)
+    async def skill_info(self, ctx, *, nome: str):
+        """Mostra uma skill do personagem ativo com uma rolagem de exemplo."""
+        ativo = await get_ativo(ctx.author.id)
+        if not ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        nome_clean = nome.lower().strip()
+        row = await db.buscar_um("""SELECT nome_skill, dano_formula, descricao, tipo
+                              FROM skills
+                              WHERE user_id = ? AND nome_personagem = ? AND nome_skill = ?""",
+                           (str(ctx.author.id), ativo, nome_clean))
+        if not row:
+            return await ctx.send("❌ Skill não encontrada. Verifique o nome e tente novamente.")
+        nome_skill, dano_formula, descricao, tipo = row
+        tipo_display = "CURA" if (tipo or "dano").lower() == "cura" else "DANO"
+        emb = discord.Embed(title=f"🔥 Skill: {nome_skill.capitalize()} [{tipo_display}]", color=0xff4500)
+        emb.add_field(name="📝 Descrição", value=(descricao or "Sem descrição."), inline=False)
+        emb.add_field(name="🎯 Fórmula", value=(dano_formula or "—"), inline=True)
+        rolagem = await rolar_dados(dano_formula)
+        if rolagem:
+            emb.add_field(name="🎲 Rolagem de Exemplo", value=f"`{rolagem.detalhe}` = **{rolagem.total}**", inline=True)
+        else:
+            emb.add_field(name="🎲 Rolagem de Exemplo", value="Não aplicável / fórmula inválida", inline=True)
+        emb.set_footer(text=f"Personagem: {ativo}")
+        await ctx.send(embed=emb)
+
+    @commands.hybrid_command(name="skill")
+    @app_commands.describe(nome="Skill do personagem ativo", alvo="Personagem alvo (padrão: o seu)")
+    @app_commands.autocomplete(nome=autocompletar_skill)
+    async def executar_skill(self, ctx, nome: str, alvo: str = None):
+        """
+        Executa uma skill. Para cura:
+          !skill "Cura Leve" @Jogador
+        Se alvo omitido, aplica no personagem ativo do autor.
+        """
+        autor_ativo = await get_ativo(ctx.author.id)
+        if not autor_ativo:
+            return await ctx.send("❌ Use `!set` primeiro.")
+        skill_name = nome.lower().strip()
+        sql_skill = """SELECT nome_skill, dano_formula, descricao, tipo FROM skills
+                       WHERE user_id = ? AND nome_personagem = ? AND nome_skill = ?"""
+        srow = await db.buscar_um(sql_skill, (str(ctx.author.id), autor_ativo, skill_name))
+        if not srow:
+            palpite = indices.skills.corrigir((str(ctx.author.id), autor_ativo), skill_name)
+            if palpite and palpite[1]:
+                srow = await db.buscar_um(sql_skill, (str(ctx.author.id), autor_ativo, palpite[0]))
+            if not srow:
+                if palpite:
+                    return await ctx.send(f"❌ Skill não encontrada na sua ficha.{quis_dizer(palpite)}")
+                return await ctx.send("❌ Skill não encontrada na sua ficha. Verifique o nome e tente novamente.")
+        nome_skill, formula, descricao, tipo = srow
+        tipo = (tipo or "dano").lower()
+
+        # Resolve alvo
+        target_user_id = None
+        target_personagem = None
+        # Pelo comando de barra a menção chega como texto em `alvo`
+        membro = ctx.message.mentions[0] if ctx.message.mentions else (await gateway.membro(ctx, alvo) if alvo else None)
+        if membro:
+            target_user_id = membro.id
+            target_personagem = await get_ativo(membro.id)
+            if not target_personagem:
+                return await ctx.send(f"❌ {membro.display_name} não tem personagem ativo.")
+        elif alvo:
+            nome_alvo = alvo.strip()
+            found = await db.buscar_um("SELECT user_id, nome FROM fichas WHERE lower(nome) = ?", (nome_alvo.lower(),))
+            if found:
+                target_user_id, target_personagem = found[0], found[1]
+            else:
+                if nome_alvo.lower() == autor_ativo.lower():
+                    target_user_id = ctx.author.id
+                    target_personagem = autor_ativo
+                else:
+                    return await ctx.send("❌ Alvo não encontrado. Mencione o jogador ou use o nome exato do personagem.")
+        else:
+            target_user_id = ctx.author.id
+            target_personagem = autor_ativo
+
+        # Cura
+        if tipo == "cura":
+            rolagem = await rolar_dados(formula, ctx)
+            if rolagem is None:
+                return await ctx.send("❌ Fórmula de cura inválida. Use uma expressão de dados (ex.: 2d6, 2d6+3).")
+            total = rolagem.total
+            ficha_alvo = await db.obter_ficha(target_user_id, target_personagem)
+            if not ficha_alvo:
+                return await ctx.send("❌ Não encontrei a ficha do alvo.")
+            max_hp = (ficha_alvo["constituicao"] or 0) * 5
+            vida_atual = ficha_alvo["vida"] if ficha_alvo["vida"] is not None else max_hp
+            ficha_nova = await db.atualizar_ficha(target_user_id, target_personagem,
+                """UPDATE fichas
+                   SET vida = MAX(MIN(COALESCE(vida, COALESCE(constituicao, 0) * 5) + ?, COALESCE(constituicao, 0) * 5), 0)
+                   WHERE user_id = ? AND nome = ? RETURNING *""",
+                (total, str(target_user_id), target_personagem))
+            if not ficha_nova:
+                return await ctx.send("❌ Não encontrei a ficha do alvo.")
+            nova_vida = ficha_nova["vida"]
+            emb = discord.Embed(title=f"✨ {nome_skill.capitalize()} — Cura", color=0x2ecc71)
+            emb.add_field(name="🧑‍⚕️ Caster", value=f"{autor_ativo}", inline=True)
+            emb.add_field(name="🎯 Alvo", value=f"{target_personagem}", inline=True)
+            emb.add_field(name="🎲 Rolagem", value=f"`{rolagem.detalhe}` = **{total}**", inline=False)
+            emb.add_field(name="❤️ Vida", value=f"**{vida_atual} → {nova_vida}/{max_hp}**", inline=False)
+            emb.set_footer(text=(descricao or ""))
+            await ctx.send(embed=emb)
+            return
+
+        # Dano (apenas mostra rolagem e descrição; aplicação de dano é manual)
+        rolagem = await rolar_dados(formula, ctx)
+        emb = discord.Embed(title=f"🔥 {nome_skill.capitalize()}", color=0xff4500, description=(descricao or ""))
+        if rolagem:
+            emb.add_field(name="🎲 Dados", value=f"`{rolagem.detalhe}`", inline=True)
+            emb.add_field(name="💥 Total", value=f"**{rolagem.total}**", inline=True)
+        emb.set_footer(text="Use esta saída para aplicar dano manualmente no combate.")
+        await ctx.send(embed=emb)
+
+async def setup(bot):
+    await bot.add_cog(Skills(bot))
@@ -0,0 +1,219 @@
+import asyncio
+import random
+import re
+
+import discord
+from discord import app_commands
+
+import cache
+import dados
+import db
+import indices
+import rng
+
+# ----------------------------
+# Utilitárias
+# ----------------------------
+async def carregar_ativos():
+    cache.carregar_ativos(await db.buscar_todos("SELECT user_id, nome_personagem FROM ativo"))
+
+async def get_ativo(user_id):
+    # Servido do cache em memória; só vai ao banco se o cache ainda não foi aquecido
+    if not cache.ativos_carregados():
+        await carregar_ativos()
+    return cache.ativo(user_id)
+
+async def carregar_indices():
+    """Carrega os índices de autocomplete (indices.py) com uma leitura por tabela."""
+    indices.personagens.carregar(await db.buscar_todos("SELECT user_id, nome FROM fichas"))
+    for indice, sql in ((indices.skills, "SELECT user_id, nome_personagem, nome_skill FROM skills"),
+                        (indices.itens, "SELECT user_id, nome_personagem, item_nome FROM inventario"),
+                        (indices.armas, "SELECT user_id, nome_personagem, item_nome FROM armas"),
+                        (indices.armaduras, "SELECT user_id, nome_personagem, item_nome FROM armaduras")):
+        indice.carregar(((uid, nome_personagem), nome) for uid, nome_personagem, nome in await db.buscar_todos(sql))
+
+# ----------------------------
+# Autocomplete dos comandos de barra (só memória: cache de ativos + indices.py)
+# ----------------------------
+def _escolhas(nomes):
+    # O Discord limita nome e valor de cada opção a 100 caracteres
+    return [app_commands.Choice(name=nome[:100], value=nome[:100]) for nome in nomes]
+
+def _do_ativo(indice, interaction, atual):
+    ativo = cache.ativo(interaction.user.id)
+    if not ativo:
+        return []
+    return _escolhas(indice.sugerir((str(interaction.user.id), ativo), atual))
+
+async def autocompletar_personagem(interaction, atual: str):
+    return _escolhas(indices.personagens.sugerir(str(interaction.user.id), atual))
+
+async def autocompletar_skill(interaction, atual: str):
+    return _do_ativo(indices.skills, interaction, atual)
+
+async def autocompletar_item(interaction, atual: str):
+    return _do_ativo(indices.itens, interaction, atual)
+
+async def autocompletar_tipo_equipamento(interaction, atual: str):
+    return _escolhas([t for t in ("arma", "armadura") if t.startswith(atual.lower().strip())])
+
+async def autocompletar_equipamento(interaction, atual: str):
+    tipo = (getattr(interaction.namespace, "tipo", None) or "").lower()
+    indice = indices.armaduras if tipo == "armadura" else indices.armas
+    return _do_ativo(indice, interaction, atual)
+
+def quis_dizer(palpite):
+    """Complemento da mensagem de "não encontrado" com o palpite de indices.corrigir()."""
+    return f" Você quis dizer **{palpite[0]}**?" if palpite else ""
+
+# Rolagens com mais dados que isso saem do event loop (vão para uma thread)
+LIMIAR_ROLAGEM_THREAD = 20000
+
+async def rolar_formula(formula, ctx=None):
+    """
+    Compila e rola uma expressão de dados. Levanta dados.FormulaInvalida se não for válida.
+    Com ctx a rolagem sai do fluxo do canal (rng.py) e fica registrada para replay.
+    """
+    compilada = dados.compilar(formula)
+    if ctx is None:
+        gerador = random
+    else:
+        fluxo = await rng.fluxo(ctx.channel.id)
+        seq, gerador = fluxo.gerador()
+    rolagem = None
+    try:
+        if compilada.total_dados > LIMIAR_ROLAGEM_THREAD:
+            rolagem = await asyncio.to_thread(compilada.rolar, gerador)
+        else:
+            rolagem = compilada.rolar(gerador)
+        return rolagem
+    finally:
+        if ctx is not None:
+            fluxo.registrar(seq, ctx.author.id, formula, rolagem.total if rolagem else None)
+
+async def rolar_dado(ctx, faces):
+    """Um dado simples (d20 do !rolar, d6 da !percepção...) do fluxo do canal."""
+    return (await rng.fluxo(ctx.channel.id)).dado(faces, ctx.author.id)
+
+async def rolar_equipamento(ctx, tipo, modificador):
+    """Rola os d6 da arma ou armadura (`tipo`) equipada no personagem ativo, com modificador (!atacar / !defender)."""
+    ativo = await get_ativo(ctx.author.id)
+    if not ativo:
+        return await ctx.send("❌ Use !set primeiro.")
+    ficha_atual = await db.obter_ficha(ctx.author.id, ativo)
+    if not ficha_atual:
+        return await ctx.send("❌ Ficha não encontrada.")
+    item, qtd_d6 = ficha_atual[f"{tipo}_item"], ficha_atual[f"{tipo}_d6"]
+    if item is None or not qtd_d6:
+        return await ctx.send(f"❌ **{ativo}** não tem {tipo} equipada com dados.")
+    # O modificador é o resto de uma expressão: "+2", "-1", "kh1", "! + 1d4"...
+    modificador = "".join(modificador).strip()
+    if modificador and modificador[0].isdigit():
+        modificador = "+" + modificador
+    formula = f"{qtd_d6}d6{modificador}"
+    try:
+        rolagem = await rolar_formula(formula, ctx)
+    except dados.FormulaInvalida as e:
+        return await ctx.send(f"❌ Modificador inválido ({e}).")
+    titulo = f"⚔️ Ataque — {item}" if tipo == "arma" else f"🛡️ Defesa — {item}"
+    emb = discord.Embed(title=titulo, color=0xe67e22 if tipo == "arma" else 0x3498db)
+    emb.add_field(name="🎯 Fórmula", value=f"`{formula}`", inline=True)
+    emb.add_field(name="💥 Total", value=f"**{rolagem.total}**", inline=True)
+    emb.add_field(name="🎲 Dados", value=f"`{rolagem.detalhe}`", inline=False)
+    emb.set_footer(text=f"Personagem: {ativo}")
+    await ctx.send(embed=emb)
+
+def erro_limite_formula(formula):
+    """Mensagem de erro se a fórmula passa dos limites de rolagem; None se está dentro (ou não é fórmula)."""
+    try:
+        dados.compilar(formula)
+    except dados.LimiteExcedido as e:
+        return f"❌ Fórmula grande demais: {e}."
+    except dados.FormulaInvalida:
+        pass
+    return None
+
+async def rolar_dados(formula, ctx=None):
+    """Rola uma expressão de dados (2d6+3, 4d6kh3, 3d6!...) e retorna a dados.Rolagem, ou None se inválida."""
+    if not formula:
+        return None
+    try:
+        return await rolar_formula(formula, ctx)
+    except dados.FormulaInvalida:
+        return None
+
+# ----------------------------
+# Economia (conversões e parser)
+# ----------------------------
+def to_verde(quantidade: int, moeda: str) -> int:
+    m = moeda.lower()
+    if m in ("v", "verde", "verdes", "rúpia_verde", "rupia_verde", "rupia"):
+        return quantidade
+    if m in ("a", "azul", "azuis", "rúpia_azul", "rúpiaazul"):
+        return quantidade * 1000
+    if m in ("r", "vermelha", "vermelhas", "vermelho", "rúpia_vermelha", "rupia_vermelha"):
+        return quantidade * 100000
+    return None
+
+def formatar_saldo(saldo_verde: int) -> str:
+    vermelhas = saldo_verde // 100000
+    resto = saldo_verde % 100000
+    azuis = resto // 1000
+    verdes = resto % 1000
+    parts = []
+    if vermelhas:
+        parts.append(f"**{vermelhas}** 🟥")
+    if azuis:
+        parts.append(f"**{azuis}** 🟦")
+    if verdes or not parts:
+        parts.append(f"**{verdes}** 🟩")
+    return " | ".join(parts)
+
+CURRENCY_WORDS = {
+    'r': ('r', 'vermelha', 'vermelhas', 'vermelho', 'rv', 'red'),
+    'a': ('a', 'azul', 'azuis', 'av', 'blue'),
+    'v': ('v', 'verde', 'verdes', 'gv', 'green')
+}
+
+def identify_short_currency(word: str):
+    w = word.lower()
+    for short, variants in CURRENCY_WORDS.items():
+        if w in variants:
+            return short
+    return None
+
+def parse_money_tokens(args):
+    """
+    Recebe tokens como: 1r 5a 200v ou ['500', 'verde'] e retorna total em verdes (int) ou (None, erro_str).
+    """
+    if not args:
+        return None, "❌ Forneça valores. Ex: `!receber 1r 5a 200v` ou `!receber 500 verde`."
+    tokens = list(args)
+    # Caso formato: !receber 500 verde
+    if len(tokens) == 2 and tokens[0].isdigit():
+        short = identify_short_currency(tokens[1])
+        if short:
+            tokens = [tokens[0] + short]
+        else:
+            return None, "❌ Moeda inválida. Use `verde`, `azul` ou `vermelha`."
+    total_verdes = 0
+    for t in tokens:
+        t = t.lower().strip()
+        m = re.match(r'^(\d+)([a-z]+)?$', t)
+        if not m:
+            return None, f"❌ Token inválido: `{t}`. Use `1r`, `2a`, `500v` ou `500 verde`."
+        qty = int(m.group(1))
+        cur_part = m.group(2)
+        if cur_part is None:
+            return None, f"❌ Especifique a moeda para `{t}` (ex.: `500v` ou `500 verde`)."
+        if len(cur_part) == 1 and cur_part in ('r','a','v'):
+            short = cur_part
+        else:
+            short = identify_short_currency(cur_part)
+            if not short:
+                return None, f"❌ Moeda inválida em `{t}`. Use `verde`, `azul` ou `vermelha`."
+        converted = to_verde(qty, {'r':'vermelha','a':'azul','v':'verde'}[short])
+        if converted is None:
+            return None, f"❌ Erro ao converter `{t}`."
+        total_verdes += converted
+    return total_verdes, None
@@ -0,0 +1,94 @@
+import os
+from collections import namedtuple
+
+import gateway
+import xp
+
+# ----------------------------
+# Configuração do bot (variáveis de ambiente)
+# ----------------------------
+#   RPG_TOKEN                 token do bot (DISCORD_TOKEN também vale)
+#   RPG_DB                    caminho do banco SQLite
+#   RPG_PREFIXO               prefixo dos comandos de texto
+#   RPG_GATEWAY               perfil de intents/caches (gateway.py)
+#   RPG_EXTENSOES             extensões de comandos, separadas por vírgula
+#   RPG_SINCRONIZAR_COMANDOS  0 para não registrar os comandos de barra na subida
+#   RPG_SHARDS                total de shards (AutoShardedBot); "auto" usa o número que o
+#                             Discord recomenda. Sem a variável, uma conexão só (commands.Bot)
+#   RPG_PROCESSOS             processos entre os quais os shards são divididos, com um
+#                             processo escritor para o banco (shards.py)
+#   RPG_SHARD_IDS             shards que este processo roda, separados por vírgula
+#   RPG_CURVAS_XP             curvas de XP por servidor (xp.py)
+#   RPG_CACHE_FICHAS          fichas guardadas no LRU do cache.py
+#   RPG_LIMITE_DADOS          dados por fórmula (dados.py)
+#   RPG_LIMITE_FACES          faces por dado (dados.py)
+# Ler a configuração não abre o banco nem conecta em nada.
+EXTENSOES = (
+    "cogs.ajuda",
+    "cogs.fichas",
+    "cogs.inventario",
+    "cogs.rolagens",
+    "cogs.skills",
+    "cogs.equipamento",
+    "cogs.condicao",
+    "cogs.combate",
+    "cogs.economia",
+    "cogs.mestre",
+)
+
+Config = namedtuple("Config", "token banco prefixo gateway extensoes sincronizar shards processos shard_ids curvas_xp "
+                               "cache_fichas limite_dados limite_faces")
+
+def _shards(valor):
+    # None: sem sharding; 0: AutoShardedBot com o total recomendado pelo Discord
+    if valor is None:
+        return None
+    if valor.strip().lower() == "auto":
+        return 0
+    total = int(valor)
+    if total < 1:
+        raise ValueError(f"RPG_SHARDS deve ser 'auto' ou um número >= 1 (veio {valor!r})")
+    return total
+
+def _inteiro(ambiente, nome, padrao):
+    # Inteiro positivo, com a variável no erro (int() sozinho não diz qual estava errada)
+    valor = ambiente.get(nome)
+    if valor is None:
+        return padrao
+    try:
+        numero = int(valor)
+        if numero < 1:
+            raise ValueError
+    except ValueError:
+        raise ValueError(f"{nome} deve ser um número inteiro >= 1 (veio {valor!r})") from None
+    return numero
+
+def carregar(ambiente=None):
+    """Config a partir das variáveis de ambiente (ou de um dict com as mesmas chaves)."""
+    ambiente = os.environ if ambiente is None else ambiente
+    extensoes = ambiente.get("RPG_EXTENSOES")
+    shard_ids = ambiente.get("RPG_SHARD_IDS")
+    cfg = Config(
+        token=ambiente.get("RPG_TOKEN") or ambiente.get("DISCORD_TOKEN"),
+        banco=ambiente.get("RPG_DB", "rpg_fichas.db"),
+        prefixo=ambiente.get("RPG_PREFIXO", "!"),
+        gateway=ambiente.get("RPG_GATEWAY", "enxuto"),
+        extensoes=tuple(e.strip() for e in extensoes.split(",") if e.strip()) if extensoes else EXTENSOES,
+        sincronizar=ambiente.get("RPG_SINCRONIZAR_COMANDOS", "1") != "0",
+        shards=_shards(ambiente.get("RPG_SHARDS")),
+        processos=int(ambiente.get("RPG_PROCESSOS", "1")),
+        shard_ids=tuple(int(i) for i in shard_ids.split(",") if i.strip()) if shard_ids else None,
+        curvas_xp=xp.ler_curvas(ambiente.get("RPG_CURVAS_XP", "")),
+        cache_fichas=_inteiro(ambiente, "RPG_CACHE_FICHAS", 256),
+        limite_dados=_inteiro(ambiente, "RPG_LIMITE_DADOS", 1000000),
+        limite_faces=_inteiro(ambiente, "RPG_LIMITE_FACES", 10000),
+    )
+    if cfg.gateway not in gateway.PERFIS:
+        raise ValueError(f"RPG_GATEWAY deve ser {' ou '.join(gateway.PERFIS)} (veio {cfg.gateway!r})")
+    if cfg.processos > 1 and not cfg.shards:
+        raise ValueError("RPG_PROCESSOS > 1 precisa de RPG_SHARDS com o total de shards (não 'auto')")
+    if cfg.processos > (cfg.shards or 1):
+        raise ValueError(f"RPG_PROCESSOS ({cfg.processos}) maior que o total de shards ({cfg.shards})")
+    if cfg.shard_ids is not None and not (cfg.shards and all(0 <= i < cfg.shards for i in cfg.shard_ids)):
+        raise ValueError(f"RPG_SHARD_IDS {cfg.shard_ids} fora de RPG_SHARDS ({cfg.shards})")
+    return cfg
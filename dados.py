@@ -0,0 +1,413 @@
+import heapq
+import random
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import probabilidade
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: sem ele os lotes grandes usam random.choices (ver _sortear)
+    np = None
+
+# ----------------------------
+# Expressões de dados
+# ----------------------------
+# Gramática aceita (sem diferenciar maiúsculas, espaços ignorados):
+#   expr   := ["+"|"-"] termo (("+"|"-") termo)*
+#   termo  := fator ("*" fator)*
+#   fator  := NUM | [NUM] "d" (NUM | "%") mod* | "(" expr ")"
+#   mod    := ("kh"|"k"|"kl"|"dh"|"dl") [NUM]   mantém/descarta os maiores/menores
+#           | "!"                               explode no valor máximo
+# Exemplos: 2d6, 2d6+3, 4d6kh3, 2d20kl1, 3d6!, (1d8+2)*2, d%
+# Uma fórmula é compilada uma vez numa árvore de nós e guardada num cache
+# limitado; rolar de novo a mesma fórmula só percorre a árvore.
+#
+# Paradas grandes (milhares de dados) são sorteadas em lote e somadas sem montar
+# o detalhe dado a dado: acima de LIMIAR_DETALHE dados a rolagem sai resumida
+# ("[1000d6: 3512]"). O lote usa numpy, se estiver instalado, só no gerador
+# global (rolagens sem semente); com um random.Random semeado (fluxo do canal,
+# simulador) é sempre random.choices, para a mesma semente dar os mesmos dados
+# com ou sem numpy e o !auditar refazer a sessão em qualquer máquina.
+#
+# Os limites de dados e faces vêm de RPG_LIMITE_DADOS/RPG_LIMITE_FACES, lidos
+# em config.carregar() e aplicados com configurar() em criar_bot().
+LIMITE_DADOS = 1000000   # dados por fórmula
+LIMITE_FACES = 10000
+LIMITE_EXPLOSOES = 100   # dados extras por termo explosivo, ou a qtd do termo se for maior (_Dados.limite_explosoes)
+LIMITE_TEXTO = 200       # caracteres por fórmula (também limita o aninhamento)
+LIMITE_CACHE = 512       # fórmulas compiladas guardadas
+LIMIAR_DETALHE = 50      # acima disso (dados na fórmula) o detalhe sai resumido
+LIMIAR_LOTE = 64         # a partir daqui o termo é sorteado em lote
+
+class FormulaInvalida(ValueError):
+    pass
+
+class LimiteExcedido(FormulaInvalida):
+    """A fórmula é válida, mas passa dos limites de dados/faces configurados."""
+
+Rolagem = namedtuple("Rolagem", "total detalhe dados")
+Rolagem.__doc__ = (
+    "Resultado de uma rolagem: total, texto com cada dado e a lista dos dados mantidos "
+    "(vazia quando a rolagem sai resumida)."
+)
+
+def _sortear(rng, faces, n):
+    """n dados de `faces` lados: lista para poucos dados, lote (array/lista) para muitos."""
+    if n < LIMIAR_LOTE:
+        return [rng.randint(1, faces) for _ in range(n)]
+    if np is not None and rng is random:
+        return np.random.default_rng(rng.getrandbits(64)).integers(1, faces + 1, size=n)
+    return rng.choices(range(1, faces + 1), k=n)
+
+def _contar(valores, alvo):
+    if np is not None and isinstance(valores, np.ndarray):
+        return int(np.count_nonzero(valores == alvo))
+    return valores.count(alvo)
+
+def _somar(valores):
+    if np is not None and isinstance(valores, np.ndarray):
+        return int(valores.sum())
+    return sum(valores)
+
+def _somar_mantidos(valores, quantos, maiores):
+    """Soma dos `quantos` maiores (ou menores) sem ordenar a parada inteira."""
+    descartados = len(valores) - quantos
+    if quantos <= 0:
+        return 0
+    if descartados <= 0:
+        return _somar(valores)
+    if np is not None and isinstance(valores, np.ndarray):
+        if maiores:
+            return int(np.partition(valores, descartados)[descartados:].sum())
+        return int(np.partition(valores, quantos - 1)[:quantos].sum())
+    # Escolhe o lado menor para o heap: manter 3 de 10⁶ ou descartar 1 de 10⁶
+    if quantos <= descartados:
+        escolhidos = heapq.nlargest(quantos, valores) if maiores else heapq.nsmallest(quantos, valores)
+        return sum(escolhidos)
+    tirados = heapq.nsmallest(descartados, valores) if maiores else heapq.nlargest(descartados, valores)
+    return sum(valores) - sum(tirados)
+
+class _Numero:
+    __slots__ = ("valor",)
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def rolar(self, rng, dados):
+        return self.valor, str(self.valor)
+
+    def distribuicao(self):
+        return probabilidade.constante(self.valor)
+
+class _Dados:
+    __slots__ = ("qtd", "faces", "manter", "explode", "rotulo")
+
+    def __init__(self, qtd, faces, manter=None, explode=False, rotulo=""):
+        self.qtd = qtd
+        self.faces = faces
+        self.manter = manter     # (quantos, maiores: bool) ou None
+        self.explode = explode
+        self.rotulo = rotulo or f"{qtd}d{faces}"
+
+    def __str__(self):
+        return self.rotulo
+
+    @property
+    def limite_explosoes(self):
+        # O mesmo nas duas rolagens (com detalhe e resumida): a fórmula não muda de distribuição conforme o tamanho
+        return max(LIMITE_EXPLOSOES, self.qtd)
+
+    def distribuicao(self):
+        if self.explode:
+            if self.manter is not None:
+                raise probabilidade.DistribuicaoGrande("explosão junto com manter/descartar não tem cálculo exato")
+            return probabilidade.repetir(probabilidade.dado_explosivo(self.faces), self.qtd)
+        if self.manter is not None:
+            quantos, maiores = self.manter
+            return probabilidade.manter(self.qtd, self.faces, quantos, maiores)
+        return probabilidade.repetir(probabilidade.dado(self.faces), self.qtd)
+
+    def rolar(self, rng, dados):
+        if dados is None:
+            return self._rolar_resumido(rng)
+        rolagens = [rng.randint(1, self.faces) for _ in range(self.qtd)]
+        explodidos = 0
+        if self.explode:
+            i = 0
+            limite = self.limite_explosoes
+            while i < len(rolagens) and explodidos < limite:
+                if rolagens[i] == self.faces:
+                    rolagens.append(rng.randint(1, self.faces))
+                    explodidos += 1
+                i += 1
+        mantidos = set(range(len(rolagens)))
+        if self.manter is not None:
+            quantos, maiores = self.manter
+            ordem = sorted(range(len(rolagens)), key=rolagens.__getitem__, reverse=maiores)
+            mantidos = set(ordem[:quantos])
+        partes = []
+        total = 0
+        for i, valor in enumerate(rolagens):
+            if i in mantidos:
+                total += valor
+                dados.append(valor)
+                partes.append(str(valor))
+            else:
+                partes.append(f"({valor})")
+        return total, "[" + ", ".join(partes) + "]"
+
+    def _rolar_resumido(self, rng):
+        valores = _sortear(rng, self.faces, self.qtd)
+        if self.explode:
+            # Cada máximo rende um dado extra; sorteia as ondas de extras em lote
+            limite = self.limite_explosoes
+            extras, pendentes = 0, _contar(valores, self.faces)
+            lotes = [valores]
+            while pendentes and extras < limite:
+                onda = _sortear(rng, self.faces, min(pendentes, limite - extras))
+                extras += len(onda)
+                lotes.append(onda)
+                pendentes = _contar(onda, self.faces)
+            if len(lotes) > 1:
+                if np is not None and isinstance(valores, np.ndarray):
+                    valores = np.concatenate([np.asarray(lote) for lote in lotes])
+                else:
+                    valores = [v for lote in lotes for v in lote]
+        if self.manter is None:
+            total = _somar(valores)
+        else:
+            total = _somar_mantidos(valores, *self.manter)
+        return total, f"[{self}: {total}]"
+
+class _Operacao:
+    __slots__ = ("op", "esquerda", "direita")
+
+    def __init__(self, op, esquerda, direita):
+        self.op = op
+        self.esquerda = esquerda
+        self.direita = direita
+
+    def rolar(self, rng, dados):
+        a, texto_a = self.esquerda.rolar(rng, dados)
+        b, texto_b = self.direita.rolar(rng, dados)
+        if self.op == "+":
+            return a + b, f"{texto_a} + {texto_b}"
+        if self.op == "-":
+            return a - b, f"{texto_a} - {texto_b}"
+        return a * b, f"{texto_a} × {texto_b}"
+
+    def distribuicao(self):
+        a, b = self.esquerda.distribuicao(), self.direita.distribuicao()
+        if self.op == "+":
+            return probabilidade.somar(a, b)
+        if self.op == "-":
+            return probabilidade.somar(a, probabilidade.negar(b))
+        return probabilidade.multiplicar(a, b)
+
+class _Negativo:
+    __slots__ = ("no",)
+
+    def __init__(self, no):
+        self.no = no
+
+    def rolar(self, rng, dados):
+        valor, texto = self.no.rolar(rng, dados)
+        return -valor, f"-{texto}"
+
+    def distribuicao(self):
+        return probabilidade.negar(self.no.distribuicao())
+
+class _Grupo:
+    __slots__ = ("no",)
+
+    def __init__(self, no):
+        self.no = no
+
+    def rolar(self, rng, dados):
+        valor, texto = self.no.rolar(rng, dados)
+        return valor, f"({texto})"
+
+    def distribuicao(self):
+        return self.no.distribuicao()
+
+class Formula:
+    """Fórmula já compilada. Use compilar() em vez de instanciar direto."""
+    __slots__ = ("texto", "raiz", "total_dados", "_distribuicao")
+
+    def __init__(self, texto, raiz, total_dados):
+        self.texto = texto
+        self.raiz = raiz
+        self.total_dados = total_dados   # dados sorteados por rolagem (sem contar explosões)
+        self._distribuicao = None
+
+    @property
+    def resumida(self):
+        return self.total_dados > LIMIAR_DETALHE
+
+    def rolar(self, rng=random):
+        # dados=None pede aos nós o caminho em lote, sem detalhe dado a dado
+        dados = None if self.resumida else []
+        total, detalhe = self.raiz.rolar(rng, dados)
+        return Rolagem(total, detalhe, dados or [])
+
+    def distribuicao(self):
+        """
+        Distribuição exata {total: probabilidade}, calculada na primeira chamada e
+        guardada junto da fórmula compilada (que já vive no cache de compiladas).
+        Levanta probabilidade.DistribuicaoGrande se a conta for grande demais.
+        """
+        if self._distribuicao is None:
+            self._distribuicao = self.raiz.distribuicao()
+        return self._distribuicao
+
+    def __repr__(self):
+        return f"Formula({self.texto!r})"
+
+# ----------------------------
+# Parser
+# ----------------------------
+_TOKEN = re.compile(r"\s*(?:(\d+)|(kh|kl|dh|dl|k|d%|d|!|[+\-*()]))")
+
+def _tokens(texto):
+    pos = 0
+    tokens = []
+    texto = texto.rstrip()
+    while pos < len(texto):
+        m = _TOKEN.match(texto, pos)
+        if not m:
+            raise FormulaInvalida(f"caractere inesperado em '{texto[pos:].strip()}'")
+        tokens.append(int(m.group(1)) if m.group(1) is not None else m.group(2))
+        pos = m.end()
+    return tokens
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.total_dados = 0
+
+    def _olhar(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _pegar(self):
+        token = self._olhar()
+        self.pos += 1
+        return token
+
+    def _numero_opcional(self):
+        if isinstance(self._olhar(), int):
+            return self._pegar()
+        return None
+
+    def expr(self):
+        sinal = None
+        if self._olhar() in ("+", "-"):
+            sinal = self._pegar()
+        no = self.termo()
+        if sinal == "-":
+            no = _Negativo(no)
+        while self._olhar() in ("+", "-"):
+            op = self._pegar()
+            no = _Operacao(op, no, self.termo())
+        return no
+
+    def termo(self):
+        no = self.fator()
+        while self._olhar() == "*":
+            self._pegar()
+            no = _Operacao("*", no, self.fator())
+        return no
+
+    def fator(self):
+        token = self._olhar()
+        if token == "(":
+            self._pegar()
+            no = self.expr()
+            if self._pegar() != ")":
+                raise FormulaInvalida("parêntese sem fechar")
+            return _Grupo(no)
+        qtd = self._numero_opcional()
+        if self._olhar() not in ("d", "d%"):
+            if qtd is None:
+                raise FormulaInvalida("esperava um número ou um dado")
+            return _Numero(qtd)
+        return self.dados(1 if qtd is None else qtd)
+
+    def dados(self, qtd):
+        if self._pegar() == "d%":
+            faces = 100
+        else:
+            faces = self._numero_opcional()
+            if faces is None:
+                raise FormulaInvalida("faltou o número de faces depois do 'd'")
+        if qtd < 1 or faces < 1:
+            raise FormulaInvalida("quantidade de dados e faces precisam ser pelo menos 1")
+        self.total_dados += qtd
+        if self.total_dados > LIMITE_DADOS:
+            raise LimiteExcedido(f"no máximo {LIMITE_DADOS} dados por rolagem")
+        if faces > LIMITE_FACES:
+            raise LimiteExcedido(f"no máximo {LIMITE_FACES} faces por dado")
+        manter, explode = None, False
+        rotulo = f"{qtd}d{faces}"
+        while self._olhar() in ("kh", "k", "kl", "dh", "dl", "!"):
+            mod = self._pegar()
+            rotulo += mod
+            if mod == "!":
+                if faces == 1:
+                    raise FormulaInvalida("d1 não pode explodir")
+                explode = True
+                continue
+            if manter is not None:
+                raise FormulaInvalida("use só um modificador de manter/descartar por dado")
+            n = self._numero_opcional()
+            n = 1 if n is None else n
+            rotulo += str(n)
+            if n > qtd:
+                raise FormulaInvalida(f"não dá para manter/descartar {n} de {qtd} dados")
+            if mod in ("kh", "k"):
+                manter = (n, True)
+            elif mod == "kl":
+                manter = (n, False)
+            elif mod == "dh":
+                manter = (qtd - n, False)
+            else:
+                manter = (qtd - n, True)
+        return _Dados(qtd, faces, manter, explode, rotulo)
+
+def _normalizar(texto):
+    return " ".join(str(texto).lower().split())
+
+@lru_cache(maxsize=LIMITE_CACHE)
+def _compilar(texto):
+    if len(texto) > LIMITE_TEXTO:
+        raise FormulaInvalida(f"fórmula longa demais (máx. {LIMITE_TEXTO} caracteres)")
+    tokens = _tokens(texto)
+    if not tokens:
+        raise FormulaInvalida("fórmula vazia")
+    parser = _Parser(tokens)
+    raiz = parser.expr()
+    if parser.pos != len(tokens):
+        raise FormulaInvalida(f"sobrou '{parser._olhar()}' no fim da fórmula")
+    return Formula(texto, raiz, parser.total_dados)
+
+def configurar(limite_dados, limite_faces):
+    """Troca os limites de dados/faces; as fórmulas já compiladas com os antigos saem do cache."""
+    global LIMITE_DADOS, LIMITE_FACES
+    LIMITE_DADOS, LIMITE_FACES = limite_dados, limite_faces
+    _compilar.cache_clear()
+
+def compilar(texto):
+    """Compila (ou pega do cache) a fórmula. Levanta FormulaInvalida se não for válida."""
+    return _compilar(_normalizar(texto))
+
+def rolar(texto, rng=random):
+    return compilar(texto).rolar(rng)
+
+def valida(texto):
+    try:
+        compilar(texto)
+        return True
+    except FormulaInvalida:
+        return False
@@ -0,0 +1,557 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cache
+
+# ----------------------------
+# Conexões com o banco
+# ----------------------------
+DB_FILE = 'rpg_fichas.db'
+LEITORES = 4
+LOTE_FICHAS = 200  # fichas por SELECT em ler_fichas()
+
+# WAL deixa leituras e escritas andarem juntas; synchronous=NORMAL em WAL
+# só faz fsync no checkpoint, o que tira o custo fixo de cada commit.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA mmap_size = 67108864",
+)
+
+# Todo acesso ao SQLite roda fora do event loop: as escritas numa thread
+# dedicada (uma conexão só, commits em série) e as leituras num pool pequeno,
+# cada thread com a sua conexão. Em WAL os leitores nunca esperam o escritor.
+# Nada abre na importação: a primeira conexão de uma thread do banco aplica as
+# migrações pendentes (uma vez por arquivo) antes de seguir.
+_escritor = None
+_leitores = None
+_conn_escrita = None
+_local = threading.local()
+_abertas = []
+_lock = threading.Lock()
+_lock_esquema = threading.Lock()
+_esquema_pronto = None   # arquivo cujo esquema já foi conferido nesta execução
+# Com shards em vários processos (shards.py) as escritas não abrem conexão
+# aqui: a thread de escrita repassa cada transação ao processo escritor, o
+# único que grava no arquivo. As leituras continuam locais, direto do WAL.
+_remoto = None
+_em_lote = False   # dentro de executar_lote(): cada transação vira um SAVEPOINT
+
+def abrir_conexao(caminho=None, somente_leitura=False):
+    """Abre uma conexão nova já com os pragmas aplicados."""
+    conn = sqlite3.connect(caminho or DB_FILE, check_same_thread=False)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    if somente_leitura:
+        conn.execute("PRAGMA query_only = ON")
+    return conn
+
+def _registrar(conn):
+    with _lock:
+        _abertas.append(conn)
+    return conn
+
+def _executores():
+    global _escritor, _leitores
+    with _lock:
+        if _escritor is None:
+            _escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-escrita")
+            _leitores = ThreadPoolExecutor(max_workers=LEITORES, thread_name_prefix="db-leitura")
+        return _escritor, _leitores
+
+def _preparar_esquema():
+    with _lock_esquema:
+        if _esquema_pronto != DB_FILE:
+            iniciar_db()
+
+def _conexao_escrita():
+    # Só é chamada de dentro da thread de escrita
+    global _conn_escrita
+    if _conn_escrita is None:
+        _preparar_esquema()
+        _conn_escrita = _registrar(abrir_conexao())
+    return _conn_escrita
+
+def _conexao_leitura():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        _preparar_esquema()
+        conn = _local.conn = _registrar(abrir_conexao(somente_leitura=True))
+    return conn
+
+def usar_escritor(remoto):
+    """
+    Manda as escritas deste processo para outro (shards.Cliente): o que rodaria
+    na thread de escrita vira remoto.escrever(fn, args), com fn e args indo por
+    pickle. Por isso os callbacks de transacao*() são funções de módulo, nunca
+    lambdas ou funções aninhadas.
+    """
+    global _remoto
+    _remoto = remoto
+
+def fechar():
+    """Espera o que estiver na fila, fecha as conexões e derruba as threads."""
+    global _escritor, _leitores, _conn_escrita, _local, _remoto
+    with _lock:
+        executores = (_escritor, _leitores)
+        _escritor = _leitores = None
+    for ex in executores:
+        if ex is not None:
+            ex.shutdown(wait=True)
+    if _remoto is not None:
+        _remoto.fechar()
+        _remoto = None
+    with _lock:
+        for conn in _abertas:
+            conn.close()
+        _abertas.clear()
+        _conn_escrita = None
+        _local = threading.local()
+
+def _ler_um(sql, params):
+    return _conexao_leitura().execute(sql, params).fetchone()
+
+def _ler_todos(sql, params):
+    return _conexao_leitura().execute(sql, params).fetchall()
+
+def _transacao(fn, args):
+    conn = _conexao_escrita()
+    if _em_lote:
+        return _savepoint(conn, fn, args)
+    cursor = conn.cursor()
+    try:
+        resultado = fn(cursor, *args)
+        conn.commit()
+        return resultado
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def _savepoint(conn, fn, args):
+    cursor = conn.cursor()
+    cursor.execute("SAVEPOINT transacao")
+    try:
+        resultado = fn(cursor, *args)
+        cursor.execute("RELEASE transacao")
+        return resultado
+    except Exception:
+        cursor.execute("ROLLBACK TO transacao")
+        cursor.execute("RELEASE transacao")
+        raise
+    finally:
+        cursor.close()
+
+def executar_lote(pedidos):
+    """
+    Roda várias escritas [(fn, args)], cada uma como faria a thread de escrita
+    (fn é _transacao, _transacao_ficha...), com um commit só no fim. Cada uma
+    fica num SAVEPOINT: a que levantar exceção desfaz só o que ela fez.
+    Retorna [("ok", resultado) ou ("erro", exceção)] na mesma ordem.
+    Só na thread de escrita (é o que o processo escritor de shards.py usa).
+    """
+    global _em_lote
+    conn = _conexao_escrita()
+    resultados = []
+    conn.execute("BEGIN")
+    _em_lote = True
+    try:
+        for fn, args in pedidos:
+            try:
+                resultados.append(("ok", fn(*args)))
+            except Exception as e:
+                resultados.append(("erro", e))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        _em_lote = False
+    return resultados
+
+async def _na_leitura(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executores()[1], fn, *args)
+
+async def _na_escrita(fn, *args):
+    if _remoto is not None:
+        return await asyncio.get_running_loop().run_in_executor(_executores()[0], _remoto.escrever, fn, args)
+    return await asyncio.get_running_loop().run_in_executor(_executores()[0], fn, *args)
+
+def replicar(fn, *args):
+    """
+    Aplica fn(*args) no estado em memória deste processo (cache de ativos,
+    índices...) e, com shards em vários processos, nos outros também. Sai pela
+    thread de escrita, então chega aos outros shards depois das escritas que
+    este processo já pediu. fn precisa ir por pickle (função de módulo ou
+    método de um cache/índice do módulo).
+    """
+    fn(*args)
+    _avisar(fn, args)
+
+def _avisar(fn, args):
+    if _remoto is not None:
+        _executores()[0].submit(_remoto.avisar, fn, args)
+
+async def buscar_um(sql, params=()):
+    return await _na_leitura(_ler_um, sql, params)
+
+async def buscar_todos(sql, params=()):
+    return await _na_leitura(_ler_todos, sql, params)
+
+def _executar_sql(cursor, sql, params):
+    return cursor.execute(sql, params).rowcount
+
+async def executar(sql, params=()):
+    """Executa uma escrita isolada e faz commit. Retorna o número de linhas afetadas."""
+    return await transacao(_executar_sql, sql, params)
+
+async def transacao(fn, *args):
+    """
+    Roda fn(cursor, *args) na thread de escrita, dentro de uma única transação.
+    Commit se tudo der certo, rollback se fn levantar exceção. Retorna o resultado de fn.
+    fn roda fora do event loop: não deve tocar em nada do discord. fn deve ser
+    uma função de módulo e args, valores simples: com shards em vários
+    processos os dois vão por pickle até o processo escritor (ver usar_escritor()).
+    """
+    return await _na_escrita(_transacao, fn, args)
+
+# ----------------------------
+# Fichas (com o LRU do cache.py na frente)
+# ----------------------------
+def _ler_ficha(conn, user_id, nome):
+    cursor = conn.execute("SELECT * FROM fichas_equipadas WHERE user_id = ? AND nome = ?", (str(user_id), nome))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip((col[0] for col in cursor.description), row))
+
+def ler_fichas(conn, chaves):
+    """Lê várias fichas [(user_id, nome)] numa consulta só. Retorna {(user_id, nome): dict}."""
+    chaves = [(str(uid), nome) for uid, nome in chaves]
+    fichas = {}
+    # OR de pares (em vez de `(user_id, nome) IN (VALUES ...)`) para o SQLite usar
+    # o índice UNIQUE(user_id, nome) em cada termo; em lotes para não estourar o
+    # limite de profundidade de expressão.
+    for i in range(0, len(chaves), LOTE_FICHAS):
+        lote = chaves[i:i + LOTE_FICHAS]
+        condicoes = " OR ".join(["(user_id = ? AND nome = ?)"] * len(lote))
+        cursor = conn.execute("SELECT * FROM fichas_equipadas WHERE " + condicoes,
+                              [valor for chave in lote for valor in chave])
+        colunas = [col[0] for col in cursor.description]
+        for row in cursor.fetchall():
+            ficha = dict(zip(colunas, row))
+            fichas[(ficha["user_id"], ficha["nome"])] = ficha
+    return fichas
+
+def _ler_ficha_leitura(user_id, nome):
+    return _ler_ficha(_conexao_leitura(), user_id, nome)
+
+def _transacao_ficha(fn, args, user_id, nome):
+    # Relê a ficha na mesma transação, sem outra ida à thread
+    def _com_releitura(cursor):
+        return fn(cursor, *args), _ler_ficha(cursor, user_id, nome)
+    return _transacao(_com_releitura, ())
+
+async def obter_ficha(user_id, nome):
+    """
+    Ficha completa como dict, ou None: colunas de fichas mais as do equipamento
+    (arma_*/armadura_*, da visão fichas_equipadas). O dict é o mesmo guardado no
+    cache: não altere.
+    """
+    ficha = cache.fichas.obter(user_id, nome)
+    if ficha is None:
+        versao = cache.fichas.versao(user_id, nome)
+        ficha = await _na_leitura(_ler_ficha_leitura, user_id, nome)
+        if ficha is not None:
+            cache.fichas.guardar(user_id, nome, ficha, versao)
+    return ficha
+
+async def transacao_ficha(user_id, nome, fn, *args):
+    """Como transacao(), para escritas que mexem na ficha (user_id, nome): atualiza o cache com a linha gravada."""
+    resultado, ficha = await _na_escrita(_transacao_ficha, fn, args, user_id, nome)
+    cache.fichas.atualizar(user_id, nome, ficha)
+    _avisar(cache.fichas.atualizar, (user_id, nome, None))
+    return resultado
+
+def _transacao_fichas(fn, args, chaves):
+    def _com_releitura(cursor):
+        return fn(cursor, *args), ler_fichas(cursor, chaves)
+    return _transacao(_com_releitura, ())
+
+async def transacao_fichas(chaves, fn, *args):
+    """transacao_ficha() para várias fichas [(user_id, nome)]: relê todas numa consulta só e atualiza o cache."""
+    resultado, fichas = await _na_escrita(_transacao_fichas, fn, args, chaves)
+    for user_id, nome in chaves:
+        cache.fichas.atualizar(user_id, nome, fichas.get((str(user_id), nome)))
+    _avisar(_invalidar_fichas, (chaves,))
+    return resultado
+
+def _invalidar_fichas(chaves):
+    for user_id, nome in chaves:
+        cache.fichas.atualizar(user_id, nome, None)
+
+async def executar_ficha(user_id, nome, sql, params=()):
+    return await transacao_ficha(user_id, nome, _executar_sql, sql, params)
+
+def _atualizar_ficha(cursor, sql, params, user_id, nome):
+    # fetchall: o UPDATE ... RETURNING só termina quando todas as linhas foram lidas
+    if not cursor.execute(sql, params).fetchall():
+        return None
+    # O RETURNING só traz as colunas de fichas; o cache guarda a linha com o equipamento
+    return _ler_ficha(cursor.connection, user_id, nome)
+
+async def atualizar_ficha(user_id, nome, sql, params=()):
+    """
+    Roda um `UPDATE fichas ... RETURNING *` de uma instrução só (cálculo, limites e
+    checagens ficam no próprio SQL) e devolve a ficha gravada, ou None se nenhuma
+    linha casou com o WHERE. A linha devolvida já vai direto para o cache.
+    """
+    ficha = await transacao(_atualizar_ficha, sql, params, user_id, nome)
+    if ficha is not None:
+        cache.fichas.atualizar(user_id, nome, ficha)
+        _avisar(cache.fichas.atualizar, (user_id, nome, None))
+    return ficha
+
+# ----------------------------
+# Esquema e migrações
+# ----------------------------
+# Cada passo leva o banco da versão anterior para a sua; a versão aplicada fica
+# em PRAGMA user_version. Para mudar o esquema, acrescente um passo no fim da
+# lista (nunca edite um passo que já foi publicado).
+def _m1_tabelas(cursor):
+    # Tabela fichas (com colunas novas já previstas)
+    cursor.execute('''CREATE TABLE IF NOT EXISTS fichas (
+        user_id TEXT, nome TEXT, foto_url TEXT,
+        forca INTEGER, velocidade INTEGER, esquiva INTEGER, constituicao INTEGER,
+        atordoamento INTEGER, peste INTEGER, doencas INTEGER, sangramento INTEGER, debuff INTEGER,
+        nivel INTEGER DEFAULT 1, xp INTEGER DEFAULT 0,
+        pontos_atrib INTEGER DEFAULT 0, pontos_res INTEGER DEFAULT 0,
+        espaco_bolsa INTEGER DEFAULT 6,
+        saldo INTEGER DEFAULT 0,
+        estresse INTEGER DEFAULT 0,
+        vida INTEGER DEFAULT 0,
+        arma_equipada TEXT DEFAULT NULL,
+        armadura_equipada TEXT DEFAULT NULL,
+        UNIQUE(user_id, nome))''')
+
+    # Inventário
+    cursor.execute('''CREATE TABLE IF NOT EXISTS inventario (
+        user_id TEXT, nome_personagem TEXT,
+        item_nome TEXT, quantidade INTEGER,
+        PRIMARY KEY (user_id, nome_personagem, item_nome))''')
+
+    # Skills (inclui coluna tipo para distinguir dano/curas)
+    cursor.execute('''CREATE TABLE IF NOT EXISTS skills (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT, nome_personagem TEXT, nome_skill TEXT, dano_formula TEXT, descricao TEXT,
+        tipo TEXT DEFAULT 'dano')''')
+
+    # Ativo
+    cursor.execute('''CREATE TABLE IF NOT EXISTS ativo (
+        user_id TEXT PRIMARY KEY, nome_personagem TEXT)''')
+
+    # Armas
+    cursor.execute('''CREATE TABLE IF NOT EXISTS armas (
+        user_id TEXT, nome_personagem TEXT,
+        item_nome TEXT, nivel INTEGER, d6 INTEGER,
+        PRIMARY KEY (user_id, nome_personagem, item_nome))''')
+
+    # Armaduras
+    cursor.execute('''CREATE TABLE IF NOT EXISTS armaduras (
+        user_id TEXT, nome_personagem TEXT,
+        item_nome TEXT, nivel INTEGER, d6 INTEGER,
+        bonus_esquiva INTEGER DEFAULT 0, bonus_velocidade INTEGER DEFAULT 0,
+        PRIMARY KEY (user_id, nome_personagem, item_nome))''')
+
+def _m2_colunas_opcionais(cursor):
+    # Bancos criados antes dessas colunas existirem
+    optional_alter = [
+        ("fichas", "saldo", "INTEGER DEFAULT 0"),
+        ("fichas", "estresse", "INTEGER DEFAULT 0"),
+        ("fichas", "vida", "INTEGER DEFAULT 0"),
+        ("fichas", "arma_equipada", "TEXT DEFAULT NULL"),
+        ("fichas", "armadura_equipada", "TEXT DEFAULT NULL"),
+        ("skills", "tipo", "TEXT DEFAULT 'dano'")
+    ]
+    for table, coluna, clause in optional_alter:
+        existentes = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        if coluna not in existentes:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {coluna} {clause}")
+
+def _m3_indices(cursor):
+    # Índices das buscas quentes: skills por nome dentro do personagem (também
+    # serve a listagem ordenada), alvo por nome sem diferenciar maiúsculas e
+    # equipamento por nome em minúsculas (upararma / upararmadura).
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_skills_personagem ON skills (user_id, nome_personagem, nome_skill)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fichas_nome_lower ON fichas (lower(nome))")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_armas_nome_lower ON armas (user_id, nome_personagem, lower(item_nome))")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_armaduras_nome_lower ON armaduras (user_id, nome_personagem, lower(item_nome))")
+
+def _m4_visao_fichas_equipadas(cursor):
+    # Ficha + estatísticas da arma e armadura equipadas numa linha só. É o que o
+    # cache de fichas guarda, então !ficha e quem mais precisa do equipamento
+    # resolvem tudo numa ida ao banco. arma_item/armadura_item ficam NULL quando
+    # o item equipado não existe mais nas tabelas de equipamento.
+    cursor.execute("""
+    CREATE VIEW IF NOT EXISTS fichas_equipadas AS
+    SELECT f.*,
+           a.item_nome AS arma_item, a.nivel AS arma_nivel, a.d6 AS arma_d6,
+           r.item_nome AS armadura_item, r.nivel AS armadura_nivel, r.d6 AS armadura_d6,
+           r.bonus_esquiva AS armadura_bonus_esquiva, r.bonus_velocidade AS armadura_bonus_velocidade
+    FROM fichas f
+    LEFT JOIN armas a
+           ON a.user_id = f.user_id AND a.nome_personagem = f.nome AND a.item_nome = f.arma_equipada
+    LEFT JOIN armaduras r
+           ON r.user_id = f.user_id AND r.nome_personagem = f.nome AND r.item_nome = f.armadura_equipada
+    """)
+
+def _m5_contador_slots(cursor):
+    # fichas.slots_ocupados = quantas linhas de inventario o personagem tem. Os
+    # triggers mantêm a conta a cada item que entra ou sai, e recontam quando uma
+    # ficha é criada (ou recriada por cima de itens antigos) ou renomeada. Assim
+    # checar espaço na bolsa é uma leitura da ficha, sem listar os itens.
+    # Obs.: INSERT OR REPLACE em inventario não dispara o trigger de DELETE
+    # (recursive_triggers fica desligado); use upsert (ON CONFLICT DO UPDATE).
+    colunas = {row[1] for row in cursor.execute("PRAGMA table_info(fichas)").fetchall()}
+    if "slots_ocupados" not in colunas:
+        cursor.execute("ALTER TABLE fichas ADD COLUMN slots_ocupados INTEGER DEFAULT 0")
+    cursor.execute("""UPDATE fichas SET slots_ocupados = (
+                          SELECT COUNT(*) FROM inventario i
+                          WHERE i.user_id = fichas.user_id AND i.nome_personagem = fichas.nome)""")
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS inventario_slot_entra AFTER INSERT ON inventario
+    BEGIN
+        UPDATE fichas SET slots_ocupados = slots_ocupados + 1
+        WHERE user_id = NEW.user_id AND nome = NEW.nome_personagem;
+    END""")
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS inventario_slot_sai AFTER DELETE ON inventario
+    BEGIN
+        UPDATE fichas SET slots_ocupados = slots_ocupados - 1
+        WHERE user_id = OLD.user_id AND nome = OLD.nome_personagem;
+    END""")
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS inventario_slot_muda AFTER UPDATE OF user_id, nome_personagem ON inventario
+    BEGIN
+        UPDATE fichas SET slots_ocupados = slots_ocupados - 1
+        WHERE user_id = OLD.user_id AND nome = OLD.nome_personagem;
+        UPDATE fichas SET slots_ocupados = slots_ocupados + 1
+        WHERE user_id = NEW.user_id AND nome = NEW.nome_personagem;
+    END""")
+    for evento, nome in (("INSERT", "fichas_slots_criada"), ("UPDATE OF user_id, nome", "fichas_slots_renomeada")):
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {nome} AFTER {evento} ON fichas
+        BEGIN
+            UPDATE fichas SET slots_ocupados = (
+                SELECT COUNT(*) FROM inventario i
+                WHERE i.user_id = NEW.user_id AND i.nome_personagem = NEW.nome)
+            WHERE rowid = NEW.rowid;
+        END""")
+
+def _m6_registro_rolagens(cursor):
+    # Sessões de rolagem por canal (rng.py) e o registro de cada rolagem:
+    # `dado` = faces quando veio de um lote de d20/d6, senão `formula`. Com a
+    # semente da sessão e as linhas em ordem de seq a sessão pode ser refeita.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sessoes_rng (
+        id INTEGER PRIMARY KEY,
+        canal_id TEXT NOT NULL,
+        semente TEXT NOT NULL,
+        inicio TEXT DEFAULT CURRENT_TIMESTAMP
+    )""")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessoes_rng_canal ON sessoes_rng (canal_id, id)")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS rolagens (
+        sessao_id INTEGER NOT NULL,
+        seq INTEGER NOT NULL,
+        user_id TEXT,
+        dado INTEGER,
+        formula TEXT,
+        total INTEGER,
+        PRIMARY KEY (sessao_id, seq)
+    ) WITHOUT ROWID""")
+
+def _m7_busca_skills(cursor):
+    # Índice de texto (FTS5) sobre nome e descrição das skills, com o conteúdo
+    # lido da própria tabela skills (content=), então só o índice ocupa espaço.
+    # remove_diacritics deixa "pocao" achar "poção"; prefix='2 3' acelera as
+    # buscas por prefixo curto ("fo*"). Os triggers mantêm o índice em dia.
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS skills_busca USING fts5(
+        nome_skill, descricao,
+        content='skills', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""")
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS skills_busca_entra AFTER INSERT ON skills
+    BEGIN
+        INSERT INTO skills_busca (rowid, nome_skill, descricao) VALUES (NEW.id, NEW.nome_skill, NEW.descricao);
+    END""")
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS skills_busca_sai AFTER DELETE ON skills
+    BEGIN
+        INSERT INTO skills_busca (skills_busca, rowid, nome_skill, descricao) VALUES ('delete', OLD.id, OLD.nome_skill, OLD.descricao);
+    END""")
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS skills_busca_muda AFTER UPDATE OF nome_skill, descricao ON skills
+    BEGIN
+        INSERT INTO skills_busca (skills_busca, rowid, nome_skill, descricao) VALUES ('delete', OLD.id, OLD.nome_skill, OLD.descricao);
+        INSERT INTO skills_busca (rowid, nome_skill, descricao) VALUES (NEW.id, NEW.nome_skill, NEW.descricao);
+    END""")
+    cursor.execute("INSERT INTO skills_busca (skills_busca) VALUES ('rebuild')")
+
+MIGRACOES = [
+    _m1_tabelas,
+    _m2_colunas_opcionais,
+    _m3_indices,
+    _m4_visao_fichas_equipadas,
+    _m5_contador_slots,
+    _m6_registro_rolagens,
+    _m7_busca_skills,
+]
+VERSAO_ESQUEMA = len(MIGRACOES)
+
+def migrar(conn):
+    """
+    Aplica as migrações pendentes numa única transação e grava a nova versão.
+    Retorna (versao_antes, versao_depois). Num banco em dia não escreve nada.
+    """
+    versao = conn.execute("PRAGMA user_version").fetchone()[0]
+    if versao >= VERSAO_ESQUEMA:
+        return versao, versao
+    modo_anterior = conn.isolation_level
+    conn.isolation_level = None
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        # Relê dentro do lock de escrita: outro processo pode ter migrado antes
+        versao = cursor.execute("PRAGMA user_version").fetchone()[0]
+        for passo in MIGRACOES[versao:]:
+            passo(cursor)
+        cursor.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        cursor.close()
+        conn.isolation_level = modo_anterior
+    return versao, VERSAO_ESQUEMA
+
+def iniciar_db():
+    """Cria/migra o esquema de DB_FILE. Os helpers assíncronos chamam sozinhos na primeira conexão."""
+    global _esquema_pronto
+    conn = abrir_conexao()
+    try:
+        antes, depois = migrar(conn)
+    finally:
+        conn.close()
+    _esquema_pronto = DB_FILE
+    if antes != depois:
+        print(f"[DB] Esquema migrado da versão {antes} para a {depois}.")
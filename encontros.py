@@ -0,0 +1,209 @@
+import asyncio
+from collections import namedtuple
+
+import cache
+import dados
+import db
+import simulador
+
+# ----------------------------
+# Encontros (combate por turnos)
+# ----------------------------
+# Um encontro por canal, inteiro em memória: participantes (personagem ativo
+# de cada jogador), ordem de iniciativa, de quem é a vez e a vida de cada um
+# durante a luta. As regras do golpe são as do simulador.py (d20 contra a
+# força, 1 = crítico com dano em dobro, 20 = erro; golpe normal pode ser
+# esquivado com d20 contra a esquiva; dano = d6 da arma menos d6 da armadura,
+# mín. 0), com os dados tirados do fluxo do canal (rng.py), então o combate
+# entra na auditoria da sessão.
+#
+# O dano não vai para o banco a cada golpe: fica acumulado por participante e
+# é gravado numa transação só quando a rodada fecha (todos agiram) ou o
+# encontro acaba. O estado fica neste módulo, fora de cogs/, para sobreviver
+# a um !recarregar. Com shards em vários processos cada canal é de um shard
+# só, então o encontro também fica num processo só.
+#
+# A ficha pode mudar no meio da luta por fora do combate (!curou, !ferimento,
+# !upar, uma cura de skill, inclusive vinda de outro shard). Cada participante
+# guarda a versão do cache.py da ficha que leu por último; ressincronizar(),
+# chamado pelos comandos de combate antes de olhar a vida, relê quem mudou.
+# A releitura e a gravação da rodada passam pela mesma trava do encontro, então
+# uma nunca lê a ficha no meio da outra.
+
+# Mesma conta do !ferimento (limites 0 e Constituição × 5), sem RETURNING para ir no executemany
+SQL_DANO = """UPDATE fichas
+              SET vida = MAX(MIN(COALESCE(vida, COALESCE(constituicao, 0) * 5) - ?, COALESCE(constituicao, 0) * 5), 0)
+              WHERE user_id = ? AND nome = ?"""
+
+Ataque = namedtuple("Ataque", "acerto critico esquiva rolagem_arma rolagem_armadura dano")
+
+def _passou(d, limite):
+    # 1 sempre passa, 20 sempre falha (como no !rolar e no simulador)
+    return d == 1 or (d != 20 and d <= limite)
+
+def _vida(ficha, maximo):
+    # Vida nula conta como cheia, como no !ferimento
+    return maximo if ficha["vida"] is None else max(0, min(ficha["vida"], maximo))
+
+class Participante:
+    def __init__(self, user_id, ficha):
+        c = simulador.combatente(ficha)
+        self.user_id = str(user_id)
+        self.nome = ficha["nome"]
+        self.vida_max = c["vida"]
+        self.vida = _vida(ficha, self.vida_max)
+        self.forca = c["forca"]
+        self.esquiva = c["esquiva"]
+        self.velocidade = c["velocidade"]
+        self.arma = c["acoes"][0]   # d6 da arma equipada, ou o ataque desarmado
+        self.armadura = c["armadura"]
+        self.desempate = None       # d20 de iniciativa, só quando a velocidade empata
+        self.dano_pendente = 0      # dano ainda não gravado na ficha
+        self.versao = None          # versão da ficha (cache.py) na última leitura; None relê na primeira vez
+
+    @property
+    def chave(self):
+        return self.user_id, self.nome
+
+    @property
+    def caido(self):
+        return self.vida <= 0
+
+class Encontro:
+    def __init__(self, canal_id, criador_id, participantes):
+        self.canal_id = str(canal_id)
+        self.criador_id = str(criador_id)
+        self.ordem = participantes
+        self.vez = 0
+        self.rodada = 1
+        self.trava = asyncio.Lock()   # gravar() e ressincronizar() não se cruzam
+
+    @property
+    def atual(self):
+        return self.ordem[self.vez]
+
+    def participante(self, user_id):
+        return next((p for p in self.ordem if p.user_id == str(user_id)), None)
+
+    def de_pe(self):
+        return [p for p in self.ordem if not p.caido]
+
+    def avancar(self):
+        """Passa a vez ao próximo de pé. Retorna True se a rodada fechou."""
+        fechou = False
+        for _ in range(len(self.ordem)):
+            self.vez += 1
+            if self.vez == len(self.ordem):
+                self.vez = 0
+                self.rodada += 1
+                fechou = True
+            if not self.atual.caido:
+                break
+        return fechou
+
+# ----------------------------
+# Estado por canal
+# ----------------------------
+_encontros = {}
+
+def encontro(canal_id):
+    return _encontros.get(str(canal_id))
+
+def iniciar(fluxo, canal_id, criador_id, fichas):
+    """
+    Abre o encontro do canal com as fichas [(user_id, ficha)]. Ordem por
+    velocidade (com o bônus da armadura); quem empata rola um d20 do fluxo
+    do canal e o maior age primeiro.
+    """
+    participantes = [Participante(user_id, ficha) for user_id, ficha in fichas]
+    velocidades = [p.velocidade for p in participantes]
+    for p in participantes:
+        if velocidades.count(p.velocidade) > 1:
+            p.desempate = fluxo.dado(20, p.user_id)
+    participantes.sort(key=lambda p: (p.velocidade, p.desempate or 0), reverse=True)
+    novo = _encontros[str(canal_id)] = Encontro(canal_id, criador_id, participantes)
+    return novo
+
+def _rolar(fluxo, formula, user_id):
+    seq, gerador = fluxo.gerador()
+    rolagem = dados.compilar(formula).rolar(gerador)
+    fluxo.registrar(seq, user_id, formula, rolagem.total)
+    return rolagem
+
+def atacar(fluxo, atacante, alvo):
+    """
+    Resolve um golpe de `atacante` em `alvo` e aplica o dano na vida em
+    memória (a ficha só é gravada em gravar()). Não espera nada: a checagem
+    de vez no comando e o golpe acontecem sem outro comando no meio.
+    """
+    acerto = fluxo.dado(20, atacante.user_id)
+    if not _passou(acerto, atacante.forca):
+        return Ataque(acerto, False, None, None, None, 0)
+    critico = acerto == 1
+    esquiva = None
+    if not critico:
+        esquiva = fluxo.dado(20, alvo.user_id)
+        if _passou(esquiva, alvo.esquiva):
+            return Ataque(acerto, False, esquiva, None, None, 0)
+    rolagem_arma = _rolar(fluxo, atacante.arma, atacante.user_id)
+    rolagem_armadura = _rolar(fluxo, alvo.armadura, alvo.user_id) if alvo.armadura else None
+    dano = rolagem_arma.total * (2 if critico else 1) - (rolagem_armadura.total if rolagem_armadura else 0)
+    dano = min(max(0, dano), alvo.vida)
+    alvo.vida -= dano
+    alvo.dano_pendente += dano
+    return Ataque(acerto, critico, esquiva, rolagem_arma, rolagem_armadura, dano)
+
+# ----------------------------
+# Gravação em lote
+# ----------------------------
+def _gravar_danos(cursor, linhas):
+    cursor.executemany(SQL_DANO, linhas)
+
+async def _reler(atual):
+    # Só com a trava: vida em memória = vida da ficha menos o dano que ainda não foi gravado
+    for p in atual.ordem:
+        versao = cache.fichas.versao(p.user_id, p.nome)
+        if versao == p.versao:
+            continue
+        ficha = await db.obter_ficha(p.user_id, p.nome)
+        p.versao = versao   # a de antes da leitura: uma escrita no meio faz reler na próxima
+        if ficha is not None:
+            p.vida_max = simulador.combatente(ficha)["vida"]
+            p.vida = max(0, _vida(ficha, p.vida_max) - p.dano_pendente)
+
+async def ressincronizar(atual):
+    """Relê as fichas dos participantes que mudaram desde a última leitura (!curou, !ferimento...)."""
+    async with atual.trava:
+        await _reler(atual)
+
+async def gravar(atual):
+    """
+    Grava numa transação o dano acumulado do encontro e ressincroniza a vida
+    em memória com as fichas (pega !curou/!ferimento feitos durante a luta).
+    """
+    async with atual.trava:
+        pendentes = [(p, p.dano_pendente) for p in atual.ordem if p.dano_pendente]
+        if pendentes:
+            # Zera antes de esperar: golpes durante a gravação acumulam para a próxima
+            for p, dano in pendentes:
+                p.dano_pendente -= dano
+            try:
+                await db.transacao_fichas([p.chave for p in atual.ordem], _gravar_danos,
+                                          [(dano, p.user_id, p.nome) for p, dano in pendentes])
+            except Exception:
+                for p, dano in pendentes:
+                    p.dano_pendente += dano
+                raise
+        await _reler(atual)
+
+async def encerrar(canal_id):
+    """Tira o encontro do canal e grava o que faltava. Retorna o encontro, ou None."""
+    atual = _encontros.pop(str(canal_id), None)
+    if atual is not None:
+        await gravar(atual)
+    return atual
+
+async def descarregar():
+    """Grava o dano pendente de todos os encontros abertos (na saída do bot)."""
+    for atual in list(_encontros.values()):
+        await gravar(atual)
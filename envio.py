@@ -0,0 +1,207 @@
+import asyncio
+import time
+from collections import deque
+
+from discord.ext import commands
+
+# ----------------------------
+# Fila de envio por canal
+# ----------------------------
+# As respostas dos comandos de texto não vão direto para a API: entram na
+# fila do canal. Cada canal tem um balde com o limite de mensagens do Discord
+# (5 a cada 5 s); com o balde cheio as respostas esperam na fila em vez de
+# tomar 429 (que atrasa o bot inteiro). Na hora de enviar, respostas seguidas
+# só com texto/embeds viram uma mensagem (textos um por linha, até 10
+# embeds): o texto + GIF do !estressou, ou respostas de vários comandos no
+# mesmo canal durante uma luta, gastam uma vaga só. Respostas com view,
+# arquivo, referência etc. saem sozinhas, sem sair da ordem. Um 429 que
+# chegue mesmo assim fica com o discord.py, que espera e repete sozinho; se
+# ele desistir, a resposta falha como qualquer outro erro de envio.
+#
+# A fila de um canal sai de _filas quando esvazia e o balde dela não tem mais
+# envios dentro da janela: o dicionário fica do tamanho dos canais ativos, e
+# uma fila nova não começa com vagas que a antiga ainda estava gastando.
+LIMITE_CANAL = 5
+JANELA_CANAL = 5.0
+JANELA_JUNTAR = 0.05   # segundos que a fila espera outras respostas antes do primeiro envio
+MAX_TEXTO = 2000
+MAX_EMBEDS = 10
+
+class Balde:
+    """Janela deslizante: no máximo `limite` envios a cada `janela` segundos."""
+
+    def __init__(self, limite=LIMITE_CANAL, janela=JANELA_CANAL):
+        self.limite = limite
+        self.janela = janela
+        self._envios = deque()
+
+    def espera(self):
+        """Segundos até poder enviar de novo (0 se já pode)."""
+        agora = time.monotonic()
+        while self._envios and agora - self._envios[0] >= self.janela:
+            self._envios.popleft()
+        if len(self._envios) >= self.limite:
+            return max(self._envios[0] + self.janela - agora, 0.0)
+        return 0.0
+
+    def usar(self):
+        self._envios.append(time.monotonic())
+
+    def livre(self):
+        """Nenhum envio dentro da janela: esquecer o balde não muda nada."""
+        self.espera()
+        return not self._envios
+
+class _Resposta:
+    __slots__ = ("texto", "embeds", "acao", "futuro", "entrada")
+
+    def __init__(self, texto=None, embeds=(), acao=None, futuro=None):
+        self.texto = texto
+        self.embeds = list(embeds)
+        self.acao = acao        # envio que não se junta: corrotina sem argumentos
+        self.futuro = futuro    # recebe a Message quando alguém espera pelo envio
+        self.entrada = time.monotonic()
+
+# ----------------------------
+# Métricas
+# ----------------------------
+_metricas = {"pedidos": 0, "mensagens": 0, "espera_total": 0.0, "espera_max": 0.0}
+
+def estatisticas():
+    """Profundidade das filas e tempo de espera das respostas (desde a subida do bot)."""
+    na_fila = [len(fila.respostas) for fila in _filas.values()]
+    enviados = _metricas["pedidos"] - sum(na_fila)
+    return {
+        "canais": len(_filas),
+        "na_fila": sum(na_fila),
+        "maior_fila": max(na_fila, default=0),
+        "pedidos": _metricas["pedidos"],
+        "mensagens": _metricas["mensagens"],
+        "juntadas": max(enviados - _metricas["mensagens"], 0),
+        "espera_media_ms": (_metricas["espera_total"] * 1000 / enviados) if enviados > 0 else 0.0,
+        "espera_max_ms": _metricas["espera_max"] * 1000,
+    }
+
+# ----------------------------
+# Filas
+# ----------------------------
+class FilaCanal:
+    def __init__(self, canal):
+        self.canal = canal
+        self.respostas = deque()
+        self.balde = Balde()
+        self.tarefa = None
+
+    def colocar(self, resposta):
+        _metricas["pedidos"] += 1
+        self.respostas.append(resposta)
+        if self.tarefa is None or self.tarefa.done():
+            self.tarefa = asyncio.get_running_loop().create_task(self._rodar())
+
+    def _juntar(self):
+        """Tira da fila a próxima mensagem: uma resposta sozinha ou várias juntadas."""
+        primeira = self.respostas.popleft()
+        lote = [primeira]
+        if primeira.acao is not None:
+            return lote
+        tamanho, embeds = len(primeira.texto or ""), len(primeira.embeds)
+        while self.respostas and self.respostas[0].acao is None:
+            proxima = self.respostas[0]
+            texto = len(proxima.texto or "")
+            # Texto depois de embed apareceria acima dele no Discord: não junta
+            if texto and embeds:
+                break
+            if tamanho + texto + (1 if tamanho and texto else 0) > MAX_TEXTO or embeds + len(proxima.embeds) > MAX_EMBEDS:
+                break
+            tamanho += texto + (1 if tamanho and texto else 0)
+            embeds += len(proxima.embeds)
+            lote.append(self.respostas.popleft())
+        return lote
+
+    async def _rodar(self):
+        await asyncio.sleep(JANELA_JUNTAR)
+        while self.respostas:
+            espera = self.balde.espera()
+            if espera:
+                await asyncio.sleep(espera)
+                continue
+            await self._enviar(self._juntar())
+        asyncio.get_running_loop().call_later(self.balde.janela, self._soltar)
+
+    def _soltar(self):
+        # Chamado uma janela depois de a fila esvaziar; se voltou a ter envio, o próximo _rodar agenda de novo
+        if self.respostas or not self.tarefa.done():
+            return
+        if not self.balde.livre():
+            asyncio.get_running_loop().call_later(self.balde.janela, self._soltar)
+            return
+        if _filas.get(self.canal.id) is self:
+            del _filas[self.canal.id]
+
+    async def _enviar(self, lote):
+        self.balde.usar()
+        try:
+            if lote[0].acao is not None:
+                mensagem = await lote[0].acao()
+            else:
+                texto = "\n".join(r.texto for r in lote if r.texto)
+                embeds = [e for r in lote for e in r.embeds]
+                mensagem = await self.canal.send(texto or None, embeds=embeds or None)
+        except Exception as e:
+            return self._falhou(lote, e)
+        agora = time.monotonic()
+        _metricas["mensagens"] += 1
+        for resposta in lote:
+            espera = agora - resposta.entrada
+            _metricas["espera_total"] += espera
+            _metricas["espera_max"] = max(_metricas["espera_max"], espera)
+            if resposta.futuro is not None and not resposta.futuro.done():
+                resposta.futuro.set_result(mensagem)
+
+    def _falhou(self, lote, erro):
+        _metricas["pedidos"] -= len(lote)
+        for resposta in lote:
+            if resposta.futuro is not None and not resposta.futuro.done():
+                resposta.futuro.set_exception(erro)
+            else:
+                print(f"[ENVIO] Falha ao enviar no canal {self.canal.id}: {erro}")
+
+_filas = {}
+
+def _fila(canal):
+    fila = _filas.get(canal.id)
+    if fila is None:
+        fila = _filas[canal.id] = FilaCanal(canal)
+    return fila
+
+async def enviar(canal, conteudo=None, *, embed=None, embeds=None, esperar=False):
+    """
+    Põe uma resposta de texto/embeds na fila do canal. Sem `esperar` volta na
+    hora (a resposta pode ainda se juntar às próximas); com `esperar`
+    devolve a Message depois do envio.
+    """
+    futuro = asyncio.get_running_loop().create_future() if esperar else None
+    _fila(canal).colocar(_Resposta(None if conteudo is None else str(conteudo),
+                                   [embed] if embed is not None else (embeds or ()), futuro=futuro))
+    if futuro is not None:
+        return await futuro
+
+async def enviar_sozinha(canal, acao):
+    """Envia pela fila do canal uma resposta que não se junta (acao() faz o envio) e devolve a Message."""
+    futuro = asyncio.get_running_loop().create_future()
+    _fila(canal).colocar(_Resposta(acao=acao, futuro=futuro))
+    return await futuro
+
+class Contexto(commands.Context):
+    """
+    Context cujo send() dos comandos de texto passa pela fila do canal.
+    Texto/embeds voltam sem esperar o envio (passe esperar=True para receber
+    a Message); o resto espera. Comandos de barra respondem direto à interação.
+    """
+
+    async def send(self, content=None, *, esperar=False, **kwargs):
+        if self.interaction is not None:
+            return await super().send(content, **kwargs)
+        if set(kwargs) <= {"embed", "embeds"}:
+            return await enviar(self.channel, content, esperar=esperar, **kwargs)
+        return await enviar_sozinha(self.channel, lambda: super(Contexto, self).send(content, **kwargs))
@@ -0,0 +1,82 @@
+import re
+
+import discord
+from discord.ext import commands
+
+# ----------------------------
+# Perfil do gateway (intents e caches do discord.py)
+# ----------------------------
+# O bot só precisa de servidores, mensagens (com conteúdo) e menções.
+# Intents.all() assina presenças e membros: o discord.py guarda cada membro
+# de cada servidor (baixando a lista inteira na subida) e a presença de
+# cada um, que é a maior parte da memória em servidores grandes. O perfil
+# "enxuto" (padrão) liga só o necessário e não guarda membros; quem um
+# comando precisa resolver vem da menção na própria mensagem ou de uma busca
+# pontual na API (membro()). RPG_GATEWAY=completo volta ao Intents.all(); o
+# perfil vem da Config (config.py valida o nome) e chega aqui pelo BotRPG.
+PERFIS = ("enxuto", "completo")
+MENSAGENS_EM_CACHE = 100  # o padrão do discord.py é 1000; o bot não relê mensagens antigas
+
+def intents(perfil):
+    if perfil == "completo":
+        return discord.Intents.all()
+    escolhidas = discord.Intents.none()
+    escolhidas.guilds = True            # canais, cargos e permissões (guild_permissions do autor)
+    escolhidas.guild_messages = True
+    escolhidas.dm_messages = True
+    escolhidas.message_content = True   # comandos com prefixo
+    return escolhidas
+
+def opcoes(perfil):
+    """Argumentos de gateway para commands.Bot no perfil dado."""
+    if perfil not in PERFIS:
+        raise ValueError(f"Perfil de gateway desconhecido: {perfil!r} (use {' ou '.join(PERFIS)})")
+    if perfil == "completo":
+        return {"intents": intents(perfil)}
+    return {
+        "intents": intents(perfil),
+        "member_cache_flags": discord.MemberCacheFlags.none(),
+        "chunk_guilds_at_startup": False,
+        "max_messages": MENSAGENS_EM_CACHE,
+    }
+
+# ----------------------------
+# Menções sem cache de membros
+# ----------------------------
+_MENCAO = re.compile(r"<@!?([0-9]{15,20})>$|([0-9]{15,20})$")
+
+async def membro(ctx, referencia):
+    """
+    Membro de uma menção (<@id>) ou ID sem depender do cache de membros: a
+    menção que veio na mensagem, o cache (perfil completo) ou uma busca na API.
+    None se `referencia` não for menção/ID ou o membro não estiver no servidor.
+    """
+    achado = _MENCAO.match(referencia.strip())
+    if not achado:
+        return None
+    user_id = int(achado.group(1) or achado.group(2))
+    encontrado = next((m for m in ctx.message.mentions if m.id == user_id), None)
+    if encontrado is None and ctx.guild is not None:
+        encontrado = ctx.guild.get_member(user_id)
+        if encontrado is None:
+            try:
+                encontrado = await ctx.guild.fetch_member(user_id)
+            except discord.HTTPException:
+                return None
+    return encontrado
+
+class Membro(commands.MemberConverter):
+    """
+    discord.Member para argumentos de comando. Menções e IDs saem de
+    membro(); nomes só resolvem com o cache de membros (perfil completo).
+    """
+
+    async def convert(self, ctx, argumento):
+        encontrado = await membro(ctx, argumento)
+        if encontrado is not None:
+            return encontrado
+        try:
+            return await super().convert(ctx, argumento)
+        except discord.ClientException:
+            # Sem o intent de membros o discord.py não busca por nome
+            raise commands.MemberNotFound(argumento)
@@ -0,0 +1,194 @@
+import unicodedata
+from bisect import bisect_left, insort
+
+# ----------------------------
+# Índices de prefixo em memória (autocomplete dos comandos de barra)
+# ----------------------------
+# Cada índice guarda, por grupo (o usuário, ou o par usuário + personagem),
+# uma lista ordenada de (chave, nome). Cada nome entra uma vez por palavra,
+# com a chave começando naquela palavra, então "fo" sugere "Bola de Fogo";
+# chaves em minúsculas e sem acento ("gel" sugere "Raio Gélido").
+# Sugerir é um bisect e uma varredura curta; ninguém vai ao SQLite. Os
+# índices são carregados inteiros na subida do bot e atualizados pelos
+# comandos que escrevem nas tabelas, depois do commit.
+#
+# O mesmo índice resolve nomes digitados errado ("Você quis dizer...?"): cada
+# grupo tem também um índice invertido de trigramas (trigrama -> nomes). Os
+# candidatos são os nomes que dividem trigramas com o texto, ordenados pela
+# semelhança (Jaccard dos trigramas); só os melhores passam pela distância de
+# edição, que decide o palpite.
+LIMITE_SUGESTOES = 25  # máximo de opções que o Discord aceita num autocomplete
+LIMIAR_SEMELHANCA = 0.3  # Jaccard mínimo para um nome valer como palpite
+CANDIDATOS_EDICAO = 5    # candidatos por trigrama que passam pela distância de edição
+
+def _normalizar(texto):
+    decomposto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+def _chaves(nome):
+    texto = _normalizar(nome)
+    yield texto
+    for i, letra in enumerate(texto[:-1]):
+        if letra == " " and texto[i + 1] != " ":
+            yield texto[i + 1:]
+
+def _trigramas(texto):
+    texto = f"  {' '.join(_normalizar(texto).split())} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+def distancia(a, b, teto=None):
+    """Distância de edição (Levenshtein) entre a e b; para cedo devolvendo teto + 1 se passar de `teto`."""
+    if len(a) < len(b):
+        a, b = b, a
+    if teto is not None and len(a) - len(b) > teto:
+        return teto + 1
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        atual = [i]
+        for j, cb in enumerate(b, 1):
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        if teto is not None and min(atual) > teto:
+            return teto + 1
+        anterior = atual
+    return anterior[-1]
+
+class IndicePrefixo:
+    def __init__(self, nome=None):
+        self.nome = nome       # nome do índice neste módulo (ver __reduce__)
+        self._grupos = {}
+        self._trigramas = {}   # grupo -> {trigrama: {nomes}}
+        self.carregado = False
+
+    def carregar(self, linhas):
+        """Substitui o conteúdo pelas linhas (grupo, nome)."""
+        self._grupos = {}
+        self._trigramas = {}
+        for grupo, nome in linhas:
+            self._grupos.setdefault(grupo, []).extend((chave, nome) for chave in _chaves(nome))
+            invertido = self._trigramas.setdefault(grupo, {})
+            for trigrama in _trigramas(nome):
+                invertido.setdefault(trigrama, set()).add(nome)
+        for entradas in self._grupos.values():
+            entradas.sort()
+        self.carregado = True
+
+    def __reduce__(self):
+        # db.replicar() manda indices.itens.adicionar etc. para os outros shards:
+        # lá o método tem de cair no índice do próprio processo, não numa cópia
+        if self.nome is None:
+            raise TypeError("Só os índices deste módulo podem ir para outro processo")
+        return self.nome
+
+    def adicionar(self, grupo, nome):
+        entradas = self._grupos.setdefault(grupo, [])
+        for chave in _chaves(nome):
+            i = bisect_left(entradas, (chave, nome))
+            if i == len(entradas) or entradas[i] != (chave, nome):
+                insort(entradas, (chave, nome))
+        invertido = self._trigramas.setdefault(grupo, {})
+        for trigrama in _trigramas(nome):
+            invertido.setdefault(trigrama, set()).add(nome)
+
+    def remover(self, grupo, nome):
+        entradas = self._grupos.get(grupo)
+        if not entradas:
+            return
+        for chave in _chaves(nome):
+            i = bisect_left(entradas, (chave, nome))
+            if i < len(entradas) and entradas[i] == (chave, nome):
+                del entradas[i]
+        invertido = self._trigramas.get(grupo, {})
+        for trigrama in _trigramas(nome):
+            nomes = invertido.get(trigrama)
+            if nomes is not None:
+                nomes.discard(nome)
+                if not nomes:
+                    del invertido[trigrama]
+        if not entradas:
+            del self._grupos[grupo]
+            self._trigramas.pop(grupo, None)
+
+    def remover_grupo(self, grupo):
+        self._grupos.pop(grupo, None)
+        self._trigramas.pop(grupo, None)
+
+    def contem(self, grupo, nome):
+        entradas = self._grupos.get(grupo, ())
+        chave = _normalizar(nome)
+        i = bisect_left(entradas, (chave, nome))
+        return i < len(entradas) and entradas[i] == (chave, nome)
+
+    def nomes(self, grupo):
+        """Todos os nomes do grupo, sem repetição, em ordem alfabética."""
+        return sorted({nome for _, nome in self._grupos.get(grupo, ())}, key=str.lower)
+
+    def sugerir(self, grupo, prefixo, limite=LIMITE_SUGESTOES):
+        """Nomes do grupo com alguma palavra começando em `prefixo` (todos, se vazio)."""
+        entradas = self._grupos.get(grupo, ())
+        prefixo = _normalizar(prefixo).strip()
+        if not prefixo:
+            return self.nomes(grupo)[:limite]
+        vistos = []
+        i = bisect_left(entradas, (prefixo,))
+        while i < len(entradas) and len(vistos) < limite:
+            chave, nome = entradas[i]
+            if not chave.startswith(prefixo):
+                break
+            if nome not in vistos:
+                vistos.append(nome)
+            i += 1
+        return vistos
+
+    def parecidos(self, grupo, texto, limite=3):
+        """
+        Nomes do grupo parecidos com `texto`, do mais para o menos provável:
+        lista de (nome, distância de edição, semelhança de trigramas).
+        """
+        invertido = self._trigramas.get(grupo)
+        alvo = " ".join(_normalizar(texto).split())
+        if not invertido or not alvo:
+            return []
+        trigramas = _trigramas(texto)
+        comuns = {}
+        for trigrama in trigramas:
+            for nome in invertido.get(trigrama, ()):
+                comuns[nome] = comuns.get(nome, 0) + 1
+        semelhanca = {nome: n / (len(trigramas) + len(_trigramas(nome)) - n) for nome, n in comuns.items()}
+        candidatos = sorted(semelhanca, key=lambda nome: (-semelhanca[nome], nome))[:CANDIDATOS_EDICAO]
+        teto = max(1, len(alvo) // 3)
+        achados = []
+        for nome in candidatos:
+            d = distancia(alvo, " ".join(_normalizar(nome).split()), teto)
+            if d <= teto or semelhanca[nome] >= LIMIAR_SEMELHANCA:
+                achados.append((nome, d, semelhanca[nome]))
+        achados.sort(key=lambda a: (a[1], -a[2], a[0]))
+        return achados[:limite]
+
+    def corrigir(self, grupo, texto):
+        """
+        Melhor palpite para um nome digitado errado: (nome, seguro) ou None.
+        `seguro` quando dá para usar o nome direto sem perguntar: só mudam
+        maiúsculas/acentos/espaços, ou é o único nome a uma letra de distância
+        (em textos de pelo menos 4 letras).
+        """
+        achados = self.parecidos(grupo, texto)
+        if not achados:
+            return None
+        nome, d, _ = achados[0]
+        empate = len(achados) > 1 and achados[1][1] <= d
+        curto = len(texto.strip()) < 4
+        return nome, not empate and (d == 0 or (d == 1 and not curto))
+
+# Personagens por user_id; o resto por (user_id, nome_personagem)
+personagens = IndicePrefixo("personagens")
+skills = IndicePrefixo("skills")
+itens = IndicePrefixo("itens")
+armas = IndicePrefixo("armas")
+armaduras = IndicePrefixo("armaduras")
+
+def esquecer_personagem(user_id, nome):
+    """Tira dos índices um personagem excluído e o que o !excluirficha apaga junto (o inventário fica no banco)."""
+    user_id = str(user_id)
+    personagens.remover(user_id, nome)
+    for indice in (skills, armas, armaduras):
+        indice.remover_grupo((user_id, nome))
@@ -0,0 +1,119 @@
+import discord
+
+import db
+
+# ----------------------------
+# Listas paginadas (uma mensagem, botões ◀ ▶)
+# ----------------------------
+# A mensagem mostra uma página por vez e é editada no lugar a cada clique. Cada
+# página é buscada sozinha por keyset: a próxima continua depois da última
+# chave mostrada (`coluna > ?`), a anterior volta antes da primeira
+# (`coluna < ? ORDER BY coluna DESC`). A chave pode ter várias colunas (por
+# exemplo relevância + id numa busca), comparadas como row value. Pede-se uma
+# linha a mais que a página para saber se existe outra depois, sem COUNT a
+# cada clique.
+POR_PAGINA = 12
+TEMPO_LIMITE = 180  # segundos até os botões saírem da mensagem
+
+def _colunas(coluna):
+    return (coluna,) if isinstance(coluna, str) else tuple(coluna)
+
+def chave(linha, coluna):
+    """Chave de keyset de uma linha: as primeiras colunas do SELECT."""
+    n = len(_colunas(coluna))
+    return tuple(linha[:n]) if n > 1 else linha[0]
+
+def _valores(chave_pagina):
+    return chave_pagina if isinstance(chave_pagina, tuple) else (chave_pagina,)
+
+async def buscar_pagina(sql, params, coluna, limite, apos=None, antes=None):
+    """
+    Uma página de `sql` (SELECT ... WHERE ..., sem ORDER BY/LIMIT) em ordem de
+    `coluna` (nome ou tupla de colunas/expressões). Retorna (linhas, tem_mais):
+    tem_mais diz se há página depois (indo para frente) ou antes (indo para
+    trás, com `antes`).
+    """
+    colunas = _colunas(coluna)
+    tupla = f"({', '.join(colunas)})"
+    marcadores = f"({', '.join('?' * len(colunas))})"
+    if antes is not None:
+        desc = ", ".join(f"{c} DESC" for c in colunas)
+        linhas = await db.buscar_todos(f"{sql} AND {tupla} < {marcadores} ORDER BY {desc} LIMIT ?",
+                                       (*params, *_valores(antes), limite + 1))
+        return linhas[:limite][::-1], len(linhas) > limite
+    if apos is not None:
+        sql, params = f"{sql} AND {tupla} > {marcadores}", (*params, *_valores(apos))
+    linhas = await db.buscar_todos(f"{sql} ORDER BY {', '.join(colunas)} LIMIT ?", (*params, limite + 1))
+    return linhas[:limite], len(linhas) > limite
+
+class Paginador(discord.ui.View):
+    """
+    Lista paginada de `sql` ordenada por `coluna` (a chave da página são as
+    primeiras colunas do SELECT, uma por coluna da chave). `montar(linhas, pagina, paginas)` devolve o
+    Embed da página. Só quem pediu a lista mexe nos botões.
+    """
+
+    def __init__(self, autor_id, sql, params, coluna, montar, total, por_pagina=POR_PAGINA):
+        super().__init__(timeout=TEMPO_LIMITE)
+        self.autor_id = autor_id
+        self.sql = sql
+        self.params = tuple(params)
+        self.coluna = coluna
+        self.montar = montar
+        self.por_pagina = por_pagina
+        self.paginas = max(1, -(-total // por_pagina))
+        self.pagina = 1
+        self.primeira = self.ultima = None
+        self.mensagem = None
+
+    async def _carregar(self, apos=None, antes=None):
+        linhas, tem_mais = await buscar_pagina(self.sql, self.params, self.coluna, self.por_pagina, apos, antes)
+        if not linhas and (apos is not None or antes is not None):
+            # A lista mudou por baixo (itens apagados): recomeça do início
+            self.pagina = 1
+            return await self._carregar()
+        if antes is not None:
+            self.pagina = max(1, self.pagina - 1)
+            tem_anterior, tem_proxima = tem_mais, True
+        else:
+            if apos is not None:
+                self.pagina += 1
+            tem_anterior, tem_proxima = apos is not None, tem_mais
+        if linhas:
+            self.primeira, self.ultima = chave(linhas[0], self.coluna), chave(linhas[-1], self.coluna)
+        # O total é de quando a lista abriu; se mudou no meio, a página manda
+        self.paginas = max(self.paginas, self.pagina + (1 if tem_proxima else 0))
+        self.anterior.disabled = not tem_anterior
+        self.proxima.disabled = not tem_proxima
+        return self.montar(linhas, self.pagina, self.paginas)
+
+    async def enviar(self, ctx):
+        embed = await self._carregar()
+        if self.anterior.disabled and self.proxima.disabled:
+            self.stop()
+            return await ctx.send(embed=embed)
+        self.mensagem = await ctx.send(embed=embed, view=self)
+        return self.mensagem
+
+    async def interaction_check(self, interaction):
+        if interaction.user.id == self.autor_id:
+            return True
+        await interaction.response.send_message("❌ Só quem abriu a lista pode trocar de página.", ephemeral=True)
+        return False
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def anterior(self, interaction, button):
+        embed = await self._carregar(antes=self.primeira)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def proxima(self, interaction, button):
+        embed = await self._carregar(apos=self.ultima)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    async def on_timeout(self):
+        if self.mensagem is not None:
+            try:
+                await self.mensagem.edit(view=None)
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,156 @@
+from math import comb
+
+# ----------------------------
+# Distribuições exatas de resultados
+# ----------------------------
+# Uma distribuição é um dict {valor: probabilidade}. Somas de dados saem por
+# convolução (com exponenciação por quadrados para NdF), "manter os k maiores"
+# por programação dinâmica sobre as faces e dados explosivos pela série
+# geométrica truncada quando a massa restante fica abaixo de EPSILON_EXPLOSAO.
+# O custo de NdF e da DP de manter é estimado antes de calcular: o que passa
+# dos limites é recusado na hora, sem gastar a conta (ver repetir() e manter()).
+LIMITE_SUPORTE = 20000        # valores distintos numa distribuição
+LIMITE_CUSTO_SOMA = 2000000    # pares somados nas convoluções de NdF (~0,3 s)
+LIMITE_CUSTO_MANTER = 2000000  # passos da DP de manter/descartar
+EPSILON_EXPLOSAO = 1e-12
+
+class DistribuicaoGrande(ValueError):
+    pass
+
+def _checar(dist):
+    if len(dist) > LIMITE_SUPORTE:
+        raise DistribuicaoGrande(f"mais de {LIMITE_SUPORTE} resultados possíveis")
+    return dist
+
+def constante(valor):
+    return {valor: 1.0}
+
+def dado(faces):
+    p = 1.0 / faces
+    return {valor: p for valor in range(1, faces + 1)}
+
+def dado_explosivo(faces):
+    """Um dado que rola de novo (e soma) sempre que cai no máximo."""
+    dist = {}
+    p_rodada = 1.0 / faces
+    base, massa = 0, 1.0
+    while massa > EPSILON_EXPLOSAO:
+        for valor in range(1, faces):
+            dist[base + valor] = dist.get(base + valor, 0.0) + massa * p_rodada
+        base += faces
+        massa *= p_rodada
+    return _checar(dist)
+
+def somar(a, b):
+    _checar_produto(a, b)
+    resultado = {}
+    for va, pa in a.items():
+        for vb, pb in b.items():
+            resultado[va + vb] = resultado.get(va + vb, 0.0) + pa * pb
+    return _checar(resultado)
+
+def multiplicar(a, b):
+    _checar_produto(a, b)
+    resultado = {}
+    for va, pa in a.items():
+        for vb, pb in b.items():
+            resultado[va * vb] = resultado.get(va * vb, 0.0) + pa * pb
+    return _checar(resultado)
+
+def negar(dist):
+    return {-valor: p for valor, p in dist.items()}
+
+def _checar_produto(a, b):
+    if len(a) * len(b) > LIMITE_SUPORTE * 100:
+        raise DistribuicaoGrande("combinação de resultados grande demais")
+
+def _custo_repetir(dist, n):
+    """Pares que repetir() vai somar, contando cada soma de k cópias com o suporte cheio (k × largura + 1)."""
+    largura = max(dist) - min(dist)
+    custo, copias, tamanho = 0, 0, 1
+    k, tamanho_potencia = 1, len(dist)
+    while n:
+        if n & 1:
+            custo += tamanho * tamanho_potencia
+            copias += k
+            tamanho = copias * largura + 1
+        n >>= 1
+        if n:
+            custo += tamanho_potencia * tamanho_potencia
+            k *= 2
+            tamanho_potencia = k * largura + 1
+    return custo
+
+def repetir(dist, n):
+    """Soma de n cópias independentes de `dist`."""
+    if n * (max(dist) - min(dist)) + 1 > LIMITE_SUPORTE:
+        raise DistribuicaoGrande(f"mais de {LIMITE_SUPORTE} resultados possíveis")
+    if _custo_repetir(dist, n) > LIMITE_CUSTO_SOMA:
+        raise DistribuicaoGrande("dados demais para calcular exato")
+    resultado = constante(0)
+    potencia = dist
+    while n:
+        if n & 1:
+            resultado = somar(resultado, potencia)
+        n >>= 1
+        if n:
+            potencia = somar(potencia, potencia)
+    return resultado
+
+def manter(qtd, faces, quantos, maiores=True):
+    """
+    Distribuição da soma dos `quantos` maiores (ou menores) de `qtd` dados de
+    `faces` lados. Percorre as faces da mais alta para a mais baixa (ou o
+    contrário) decidindo quantos dados caíram em cada uma; o estado é
+    (dados já colocados, dados mantidos, soma mantida) e o peso é o número de
+    jeitos de escolher quais dados foram.
+    """
+    if faces * qtd * qtd * (quantos + 1) * (quantos * faces + 1) > LIMITE_CUSTO_MANTER:
+        raise DistribuicaoGrande("manter/descartar com dados demais para calcular exato")
+    estados = {(0, 0, 0): 1}
+    ordem = range(faces, 0, -1) if maiores else range(1, faces + 1)
+    for face in ordem:
+        novos = {}
+        for (colocados, mantidos, soma), jeitos in estados.items():
+            livres = qtd - colocados
+            for c in range(livres + 1):
+                entram = min(c, quantos - mantidos)
+                chave = (colocados + c, mantidos + entram, soma + entram * face)
+                novos[chave] = novos.get(chave, 0) + jeitos * comb(livres, c)
+        estados = novos
+    total = faces ** qtd
+    dist = {}
+    for (colocados, _, soma), jeitos in estados.items():
+        if colocados == qtd:
+            dist[soma] = dist.get(soma, 0.0) + jeitos / total
+    return _checar(dist)
+
+# ----------------------------
+# Resumos
+# ----------------------------
+def media(dist):
+    return sum(valor * p for valor, p in dist.items())
+
+def percentil(dist, fracao):
+    """Menor valor v com P(X <= v) >= fracao."""
+    acumulado = 0.0
+    for valor in sorted(dist):
+        acumulado += dist[valor]
+        if acumulado >= fracao - 1e-12:
+            return valor
+    return max(dist)
+
+def chance_ao_menos(dist, alvo):
+    return sum(p for valor, p in dist.items() if valor >= alvo)
+
+def chance_d20(limite):
+    """
+    Teste do !rolar: d20 contra o limite efetivo. 1 é sempre sucesso crítico,
+    20 é sempre falha crítica; de 2 a 19 passa quem tirar <= limite.
+    """
+    normais = max(0, min(limite, 19) - 1)
+    return {
+        "sucesso": (1 + normais) / 20,
+        "critico": 1 / 20,
+        "falha_critica": 1 / 20,
+    }
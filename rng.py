@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import random
+import secrets
+import time
+
+import dados
+import db
+
+# ----------------------------
+# Fluxos de rolagem por canal
+# ----------------------------
+# Cada canal tem um fluxo (sessão) com semente própria. Toda rolagem de jogo
+# tira a sua aleatoriedade do fluxo numa ordem fixa e entra no registro
+# (tabela rolagens) com o número de sequência, então a sessão inteira pode ser
+# refeita a partir da semente e conferida rolagem a rolagem.
+#   • fórmulas: cada rolagem recebe uma semente derivada do fluxo e rola num
+#     random.Random próprio (pode ir para uma thread sem bagunçar a ordem);
+#   • d20 / d6 de !rolar, !precisão, !percepção...: saem de lotes sorteados
+#     de uma vez (LOTE_DADOS por reposição), que é o caminho mais quente.
+LOTE_DADOS = 256
+LOTE_REGISTRO = 64        # rolagens acumuladas antes de gravar no banco
+INTERVALO_REGISTRO = 10   # segundos máximos que uma rolagem espera para ser gravada
+
+class Fluxo:
+    def __init__(self, semente, canal_id=None, registrar=True):
+        self.semente = semente
+        self.canal_id = canal_id
+        self.sessao_id = None   # preenchido quando a linha de sessoes_rng é gravada
+        self.registra = registrar
+        self.seq = 0
+        self._mestre = random.Random(semente)
+        self._lotes = {}   # faces -> [valores, posição]
+
+    @property
+    def compromisso(self):
+        """Hash da semente: pode ser mostrado no início sem entregar a semente."""
+        return hashlib.sha256(self.semente.encode()).hexdigest()[:16]
+
+    def _proximo(self):
+        self.seq += 1
+        return self.seq
+
+    def dado(self, faces, user_id=None):
+        """Um dado de `faces` lados tirado do lote pré-sorteado."""
+        lote = self._lotes.get(faces)
+        if lote is None or lote[1] >= len(lote[0]):
+            gerador = random.Random(self._mestre.getrandbits(64))
+            lote = self._lotes[faces] = [gerador.choices(range(1, faces + 1), k=LOTE_DADOS), 0]
+        valor = lote[0][lote[1]]
+        lote[1] += 1
+        _anotar(self, self._proximo(), user_id, faces, None, valor)
+        return valor
+
+    def gerador(self):
+        """(seq, random.Random) para uma rolagem de fórmula; registre depois com registrar()."""
+        return self._proximo(), random.Random(self._mestre.getrandbits(64))
+
+    def registrar(self, seq, user_id, formula, total):
+        _anotar(self, seq, user_id, None, formula, total)
+
+# ----------------------------
+# Registro (gravado em lote)
+# ----------------------------
+_pendentes = []
+_ultima_gravacao = time.monotonic()
+_gravacoes = set()
+
+def _anotar(fluxo, seq, user_id, faces, formula, total):
+    global _ultima_gravacao
+    if not fluxo.registra:
+        return
+    _pendentes.append((fluxo, seq, None if user_id is None else str(user_id), faces, formula, total))
+    agora = time.monotonic()
+    if len(_pendentes) >= LOTE_REGISTRO or agora - _ultima_gravacao >= INTERVALO_REGISTRO:
+        _ultima_gravacao = agora
+        try:
+            tarefa = asyncio.get_running_loop().create_task(_gravar_pendentes())
+        except RuntimeError:
+            return
+        _gravacoes.add(tarefa)
+        tarefa.add_done_callback(_gravacoes.discard)
+
+def _gravar(cursor, linhas):
+    cursor.executemany("""INSERT OR REPLACE INTO rolagens (sessao_id, seq, user_id, dado, formula, total)
+                          VALUES (?, ?, ?, ?, ?, ?)""", linhas)
+
+async def _gravar_pendentes():
+    prontas = [p for p in _pendentes if p[0].sessao_id is not None]
+    if not prontas:
+        return
+    _pendentes[:] = [p for p in _pendentes if p[0].sessao_id is None]
+    linhas = [(fluxo.sessao_id, *resto) for fluxo, *resto in prontas]
+    try:
+        await db.transacao(_gravar, linhas)
+    except Exception:
+        _pendentes[:0] = prontas
+        raise
+
+async def descarregar():
+    """
+    Grava no banco as rolagens ainda em memória (as de sessões ainda sem id
+    esperam a próxima) e espera as gravações em lote já em andamento, que
+    podem ter levado as pendentes antes desta chamada.
+    """
+    await _gravar_pendentes()
+    loop = asyncio.get_running_loop()
+    em_andamento = [t for t in _gravacoes if t.get_loop() is loop]
+    if em_andamento:
+        await asyncio.wait(em_andamento)
+
+# ----------------------------
+# Sessões
+# ----------------------------
+_fluxos = {}
+
+def _nova_semente():
+    return secrets.token_hex(16)
+
+def _gravar_sessao(cursor, canal_id, semente):
+    return cursor.execute("INSERT INTO sessoes_rng (canal_id, semente) VALUES (?, ?)", (canal_id, semente)).lastrowid
+
+async def iniciar_sessao(canal_id, semente=None):
+    """Abre uma sessão nova no canal (a anterior fica encerrada no registro)."""
+    # O fluxo entra no dicionário antes do INSERT: rolagens que chegarem no
+    # meio já usam esta sessão e ficam pendentes até o id existir.
+    novo = _fluxos[str(canal_id)] = Fluxo(semente or _nova_semente(), str(canal_id))
+    novo.sessao_id = await db.transacao(_gravar_sessao, novo.canal_id, novo.semente)
+    return novo
+
+async def fluxo(canal_id):
+    """Fluxo do canal; o primeiro uso depois de subir o bot abre uma sessão com semente aleatória."""
+    atual = _fluxos.get(str(canal_id))
+    if atual is None:
+        atual = await iniciar_sessao(canal_id)
+    return atual
+
+# ----------------------------
+# Replay / auditoria
+# ----------------------------
+def refazer(semente, registros):
+    """
+    Refaz uma sessão a partir da semente e das linhas (seq, dado, formula, total)
+    em ordem de seq. Retorna (conferidas, divergencias, seq_faltando), onde
+    divergencias é uma lista de (seq, registrado, refeito) e seq_faltando é o
+    primeiro buraco no registro (a partir dele não dá para conferir) ou None.
+    """
+    refeito = Fluxo(semente, registrar=False)
+    conferidas, divergencias = 0, []
+    for seq, faces, formula, total in registros:
+        if seq != refeito.seq + 1:
+            return conferidas, divergencias, refeito.seq + 1
+        if faces is not None:
+            valor = refeito.dado(faces)
+        else:
+            _, gerador = refeito.gerador()
+            try:
+                valor = dados.compilar(formula).rolar(gerador).total
+            except dados.FormulaInvalida:
+                valor = None
+        if total is not None:
+            conferidas += 1
+            if valor != total:
+                divergencias.append((seq, total, valor))
+    return conferidas, divergencias, None
+
+class SessaoAberta(Exception):
+    """A sessão ainda é a atual do canal: revelar a semente entregaria as próximas rolagens."""
+
+async def auditar(sessao_id):
+    """
+    Confere uma sessão gravada. Retorna None se ela não existe, senão
+    ((id, canal_id, semente, inicio), total de registros, resultado de refazer()).
+    Levanta SessaoAberta se ela ainda é a mais recente do canal; para auditar
+    a sessão em uso, abra outra antes (iniciar_sessao).
+    """
+    await descarregar()
+    sessao = await db.buscar_um("SELECT id, canal_id, semente, inicio FROM sessoes_rng WHERE id = ?", (sessao_id,))
+    if not sessao:
+        return None
+    # Pelo banco, e não por _fluxos: com shards o canal pode ser de outro processo
+    ultima = await db.buscar_um("SELECT MAX(id) FROM sessoes_rng WHERE canal_id = ?", (sessao[1],))
+    if ultima[0] == sessao_id:
+        raise SessaoAberta(sessao[1])
+    registros = await db.buscar_todos("SELECT seq, dado, formula, total FROM rolagens WHERE sessao_id = ? ORDER BY seq",
+                                      (sessao_id,))
+    return sessao, len(registros), await asyncio.to_thread(refazer, sessao[2], registros)
@@ -0,0 +1,259 @@
+import multiprocessing
+import os
+import pickle
+import queue
+import secrets
+import signal
+import threading
+import time
+from multiprocessing.connection import Client, Listener, wait
+
+import db
+
+# ----------------------------
+# Shards em vários processos com um escritor só
+# ----------------------------
+# RPG_SHARDS liga o AutoShardedBot (app.py); com RPG_PROCESSOS > 1 os shards
+# são divididos entre processos na mesma máquina, e cada processo usa o seu
+# núcleo para o gateway e os comandos. O SQLite aguenta vários leitores mas
+# um escritor por vez: em vez de cada processo disputar o lock do arquivo
+# (SQLITE_BUSY e commits esperando busy_timeout), um processo escritor é o
+# único que abre rpg_fichas.db para escrita. Os shards mandam as transações
+# para ele por um socket local (multiprocessing.connection, com chave) e
+# continuam lendo direto do WAL, cada um com as suas conexões de leitura.
+#
+# O estado em memória (cache de fichas, personagem ativo, índices do
+# autocomplete) é de cada processo: o que um shard muda sai por
+# db.replicar() e o escritor repassa aos outros. Fichas vão só como
+# invalidação (o outro shard relê do banco quando precisar), então a ordem
+# de chegada não importa.
+#
+# As transações vão por pickle: funções de módulo, nunca lambdas. O escritor
+# importa o módulo da função na primeira vez que a recebe; depois de um
+# !recarregar que mude uma transação, reinicie o bot para o escritor pegar
+# a versão nova.
+INTERVALO_IDENTIFY = 5.0  # segundos entre IDENTIFYs de shards (max_concurrency 1 do Discord)
+
+def dividir(total, processos):
+    """IDs de shard de cada processo: o processo i fica com i, i + processos, ..."""
+    return [tuple(range(i, total, processos)) for i in range(processos)]
+
+# ----------------------------
+# Processo escritor
+# ----------------------------
+class Escritor:
+    """
+    Atende os shards numa thread só, a thread de escrita do db.py deste
+    processo: espera pedidos em todas as conexões ao mesmo tempo e grava
+    numa transação só (db.executar_lote) as escritas que chegaram juntas,
+    então vários shards escrevendo dividem o mesmo commit.
+    """
+
+    def __init__(self, ouvinte, chave):
+        self.ouvinte = ouvinte
+        self.chave = chave
+        self.parando = False
+        self.escritas = 0
+        self.commits = 0
+        self._conexoes = []     # conexões de pedidos, uma por shard (mais a do lançador no fim)
+        self._assinantes = {}   # origem -> conexão que recebe os avisos dos outros shards
+        self._novas = queue.SimpleQueue()
+        self._acordar, self._acordador = multiprocessing.Pipe(duplex=False)
+
+    def servir(self):
+        threading.Thread(target=self._aceitar, name="escritor-aceitar", daemon=True).start()
+        db._executores()[0].submit(self._atender).result()
+
+    def _aceitar(self):
+        while not self.parando:
+            try:
+                conn = self.ouvinte.accept()
+            except (OSError, multiprocessing.AuthenticationError):
+                continue
+            self._novas.put(conn)
+            self._acordador.send(None)
+
+    def _atender(self):
+        while not self.parando:
+            lote = []
+            for conn in wait(self._conexoes + [self._acordar]):
+                if conn is self._acordar:
+                    conn.recv()
+                    self._conexoes.append(self._novas.get())
+                else:
+                    self._ler(conn, lote)
+            if lote:
+                self._gravar(lote)
+
+    def _ler(self, conn, lote):
+        try:
+            pedido = conn.recv()
+        except (EOFError, OSError):
+            self._conexoes.remove(conn)
+            conn.close()
+            return
+        except Exception as e:
+            # Chegou, mas não desempacota aqui (função que não existe neste processo etc.)
+            self._responder(conn, ("erro", e))
+            return
+        tipo = pedido[0]
+        if tipo == "escrever":
+            lote.append((conn, pedido[1], pedido[2]))
+        elif tipo == "avisar":
+            # Depois do commit das escritas que o shard pediu antes deste aviso
+            self._repassar(pedido[1], pedido[2])
+        elif tipo == "assinar":
+            # Daqui em diante a conexão só recebe: quem escuta é o shard
+            self._conexoes.remove(conn)
+            self._assinantes[pedido[1]] = conn
+        elif tipo == "parar":
+            self.parando = True
+            self._responder(conn, ("ok", self.escritas))
+
+    def _gravar(self, lote):
+        try:
+            resultados = db.executar_lote([(fn, args) for _, fn, args in lote])
+        except Exception as e:
+            # O commit falhou: nada do lote ficou gravado
+            resultados = [("erro", e)] * len(lote)
+        self.escritas += len(lote)
+        self.commits += 1
+        for (conn, _, _), resultado in zip(lote, resultados):
+            self._responder(conn, resultado)
+
+    def _responder(self, conn, resposta):
+        try:
+            conn.send(resposta)
+        except (EOFError, OSError):
+            pass
+        except Exception as e:
+            # Resultado ou exceção que não vai por pickle: devolve como texto
+            conn.send(("erro", RuntimeError(f"{type(e).__name__}: {e} (resposta: {resposta[1]!r})")))
+
+    def _repassar(self, origem, dados):
+        for destino, conn in list(self._assinantes.items()):
+            if destino == origem:
+                continue
+            try:
+                conn.send_bytes(dados)
+            except (EOFError, OSError):
+                # Shard que já saiu
+                del self._assinantes[destino]
+                conn.close()
+
+def _processo_escritor(banco, chave, canal):
+    # Ctrl+C chega em todos os processos: o escritor só para quando o lançador
+    # mandar, depois que os shards gravaram o que faltava
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    db.DB_FILE = banco
+    db.iniciar_db()
+    with Listener(authkey=chave) as ouvinte:
+        escritor = Escritor(ouvinte, chave)
+        canal.send(ouvinte.address)
+        canal.close()
+        escritor.servir()
+    db.fechar()
+    print(f"[ESCRITOR] Encerrado depois de {escritor.escritas} transações em {escritor.commits} commits.")
+
+def parar_escritor(endereco, chave):
+    """Pede ao escritor para terminar. Retorna quantas transações ele gravou."""
+    with Client(endereco, authkey=chave) as conn:
+        conn.send(("parar",))
+        return conn.recv()[1]
+
+# ----------------------------
+# Ponta do shard
+# ----------------------------
+class Cliente:
+    """
+    Conexão de um shard com o processo escritor, para db.usar_escritor().
+    escrever() e avisar() rodam na thread de escrita do db.py (uma de cada
+    vez); os avisos dos outros shards chegam por uma segunda conexão.
+    """
+
+    def __init__(self, endereco, chave):
+        self.endereco = endereco
+        self.chave = chave
+        self.origem = os.getpid()
+        self._conn = Client(endereco, authkey=chave)
+        self._avisos = None
+
+    def escrever(self, fn, args):
+        self._conn.send(("escrever", fn, args))
+        estado, valor = self._conn.recv()
+        if estado == "erro":
+            raise valor
+        return valor
+
+    def avisar(self, fn, args):
+        try:
+            self._conn.send(("avisar", self.origem, pickle.dumps((fn, args))))
+        except Exception as e:
+            print(f"[SHARDS] Aviso não enviado aos outros shards ({fn!r}): {e}")
+
+    def escutar(self, loop):
+        """Começa a aplicar no event loop `loop` o que os outros shards replicarem."""
+        self._avisos = Client(self.endereco, authkey=self.chave)
+        self._avisos.send(("assinar", self.origem))
+        threading.Thread(target=self._receber, args=(self._avisos, loop), name="shards-avisos", daemon=True).start()
+
+    def _receber(self, conn, loop):
+        while True:
+            try:
+                fn, args = pickle.loads(conn.recv_bytes())
+            except (EOFError, OSError):
+                return
+            except Exception as e:
+                print(f"[SHARDS] Aviso de outro shard ignorado: {e}")
+                continue
+            try:
+                loop.call_soon_threadsafe(fn, *args)
+            except RuntimeError:
+                return   # event loop já fechou
+
+    def fechar(self):
+        self._conn.close()
+        if self._avisos is not None:
+            self._avisos.close()
+
+# ----------------------------
+# Lançador
+# ----------------------------
+def rodar_processos(cfg, alvo):
+    """
+    Sobe o processo escritor e um processo por fatia de shards, rodando
+    alvo(cfg_do_processo, (endereco, chave)) em cada um (app._rodar_bot).
+    Volta quando todos os shards terminarem.
+    """
+    contexto = multiprocessing.get_context("spawn")
+    chave = secrets.token_bytes(32)
+    recebe, envia = contexto.Pipe(duplex=False)
+    escritor = contexto.Process(target=_processo_escritor, args=(cfg.banco, chave, envia), name="rpg-escritor")
+    escritor.start()
+    envia.close()
+    try:
+        endereco = recebe.recv()
+    except EOFError:
+        escritor.join()
+        raise SystemExit("❌ O processo escritor não subiu (veja o erro acima).")
+    processos = []
+    try:
+        for ids in dividir(cfg.shards, cfg.processos):
+            if processos:
+                # Um IDENTIFY por vez na conta: o próximo processo só conecta
+                # depois que os shards do anterior já se identificaram
+                time.sleep(INTERVALO_IDENTIFY * len(ids))
+            processo = contexto.Process(target=alvo, args=(cfg._replace(shard_ids=ids, processos=1), (endereco, chave)),
+                                        name=f"rpg-shards-{ids[0]}")
+            processo.start()
+            processos.append(processo)
+            print(f"[SHARDS] Processo {processo.pid}: shards {', '.join(map(str, ids))} de {cfg.shards}")
+        for processo in processos:
+            processo.join()
+    except KeyboardInterrupt:
+        # Os shards também receberam o Ctrl+C: fecham sozinhos e ainda gravam pelo escritor
+        for processo in processos:
+            processo.join()
+    finally:
+        parar_escritor(endereco, chave)
+        escritor.join()
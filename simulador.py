@@ -0,0 +1,285 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+from bisect import bisect
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import dados
+import probabilidade
+
+# ----------------------------
+# Simulador de combate (Monte Carlo) entre duas fichas
+# ----------------------------
+# Modelo de cada luta, rodada a rodada (quem tem mais velocidade age primeiro;
+# empate sorteia):
+#   • com vida abaixo da metade e cura disponível (máx. CURAS_POR_LUTA), o
+#     personagem usa uma skill de cura em vez de atacar;
+#   • senão escolhe ao acaso entre a arma equipada e as skills de dano;
+#   • o ataque é um teste de d20 contra a força (1 = crítico, dano em dobro;
+#     20 = erro); um ataque normal ainda pode ser esquivado com d20 contra a
+#     esquiva do alvo;
+#   • o dano é a rolagem da ação menos a rolagem da armadura do alvo (mín. 0).
+# A luta acaba quando alguém chega a 0 de vida ou em LIMITE_RODADAS (empate).
+#
+# As lutas são divididas em lotes e rodadas num ProcessPoolExecutor, fora do
+# event loop do bot. Também roda pela linha de comando:
+#   python simulador.py "Kael" "Lyra" [-n 200000] [--db rpg_fichas.db] [--processos 4]
+LIMITE_RODADAS = 100
+CURAS_POR_LUTA = 3
+ATAQUE_DESARMADO = "1d4"
+LIMITE_DADOS_ACAO = 200   # sem distribuição exata, rolar mais que isso a cada golpe trava o lote
+LOTE = 20000   # lutas por tarefa enviada ao pool
+
+# ----------------------------
+# Combatentes
+# ----------------------------
+def combatente(ficha, skills=()):
+    """
+    Monta o combatente (dict simples, vai para outro processo) a partir de uma
+    ficha de fichas_equipadas e das linhas (nome_skill, dano_formula, tipo) das skills.
+    """
+    acoes, curas, ignoradas = [], [], []
+    if ficha.get("arma_item") is not None and ficha.get("arma_d6"):
+        acoes.append(f"{ficha['arma_d6']}d6")
+    for nome_skill, formula, tipo in skills:
+        if not formula or not dados.valida(formula):
+            continue
+        if not _simulavel(formula):
+            ignoradas.append(nome_skill)
+            continue
+        (curas if (tipo or "dano").lower() == "cura" else acoes).append(formula)
+    armadura = None
+    if ficha.get("armadura_item") is not None and ficha.get("armadura_d6"):
+        armadura = f"{ficha['armadura_d6']}d6"
+    return {
+        "nome": ficha["nome"],
+        "vida": max(1, (ficha["constituicao"] or 0) * 5),
+        "forca": ficha["forca"] or 0,
+        "esquiva": (ficha["esquiva"] or 0) + (ficha.get("armadura_bonus_esquiva") or 0),
+        "velocidade": (ficha["velocidade"] or 0) + (ficha.get("armadura_bonus_velocidade") or 0),
+        "acoes": acoes or [ATAQUE_DESARMADO],
+        "curas": curas,
+        "armadura": armadura,
+        "ignoradas": ignoradas,
+    }
+
+def _simulavel(formula):
+    """Tem distribuição exata ou é pequena o bastante para rolar a cada golpe."""
+    compilada = dados.compilar(formula)
+    if compilada.total_dados <= LIMITE_DADOS_ACAO:
+        return True
+    try:
+        compilada.distribuicao()
+        return True
+    except probabilidade.DistribuicaoGrande:
+        return False
+
+class _Amostrador:
+    """Sorteia o total de uma fórmula pela distribuição exata (um choices só); cai na rolagem se ela for grande demais."""
+
+    def __init__(self, formula):
+        self.formula = dados.compilar(formula)
+        try:
+            dist = self.formula.distribuicao()
+        except probabilidade.DistribuicaoGrande:
+            self.valores = None
+            return
+        self.valores = sorted(dist)
+        acumulado, self.pesos = 0.0, []
+        for valor in self.valores:
+            acumulado += dist[valor]
+            self.pesos.append(acumulado)
+
+    def sortear(self, rng):
+        if self.valores is None:
+            return self.formula.rolar(rng).total
+        i = bisect(self.pesos, rng.random() * self.pesos[-1])
+        return self.valores[min(i, len(self.valores) - 1)]
+
+def _d20(rng):
+    return int(rng.random() * 20) + 1
+
+def _passou(d, limite):
+    return d == 1 or (d != 20 and d <= limite)
+
+# ----------------------------
+# Simulação (roda nos processos do pool)
+# ----------------------------
+def simular_lote(a, b, lutas, semente):
+    rng = random.Random(semente)
+    amostradores = {}
+
+    def amostrador(formula):
+        if formula not in amostradores:
+            amostradores[formula] = _Amostrador(formula)
+        return amostradores[formula]
+
+    # Resolve as fórmulas uma vez por lote; o laço só sorteia
+    acoes = [[amostrador(f) for f in c["acoes"]] for c in (a, b)]
+    curas_de = [[amostrador(f) for f in c["curas"]] for c in (a, b)]
+    armaduras = [amostrador(c["armadura"]) if c["armadura"] else None for c in (a, b)]
+
+    # Chaves por lado (0 = a, 1 = b; None = empate): os nomes podem ser iguais
+    vitorias = Counter()
+    rodadas = Counter()
+    danos = (Counter(), Counter())
+    for _ in range(lutas):
+        vida = {0: a["vida"], 1: b["vida"]}
+        curas = {0: 0, 1: 0}
+        lados = (a, b)
+        if a["velocidade"] != b["velocidade"]:
+            ordem = (0, 1) if a["velocidade"] > b["velocidade"] else (1, 0)
+        else:
+            ordem = (0, 1) if rng.random() < 0.5 else (1, 0)
+        vencedor = None
+        rodada = 0
+        while vencedor is None and rodada < LIMITE_RODADAS:
+            rodada += 1
+            for i in ordem:
+                atacante, alvo = lados[i], lados[1 - i]
+                if curas_de[i] and curas[i] < CURAS_POR_LUTA and vida[i] * 2 < atacante["vida"]:
+                    curas[i] += 1
+                    cura = rng.choice(curas_de[i]).sortear(rng)
+                    vida[i] = min(atacante["vida"], vida[i] + max(0, cura))
+                    continue
+                d = _d20(rng)
+                if not _passou(d, atacante["forca"]):
+                    continue
+                critico = d == 1
+                if not critico and _passou(_d20(rng), alvo["esquiva"]):
+                    continue
+                dano = rng.choice(acoes[i]).sortear(rng) * (2 if critico else 1)
+                if armaduras[1 - i]:
+                    dano -= armaduras[1 - i].sortear(rng)
+                dano = max(0, dano)
+                danos[i][dano] += 1
+                vida[1 - i] -= dano
+                if vida[1 - i] <= 0:
+                    vencedor = i
+                    break
+        vitorias[vencedor] += 1
+        rodadas[rodada] += 1
+    return {"vitorias": vitorias, "rodadas": rodadas, "danos": danos}
+
+def _juntar(parciais):
+    total = {"vitorias": Counter(), "rodadas": Counter(), "danos": (Counter(), Counter())}
+    for parcial in parciais:
+        total["vitorias"].update(parcial["vitorias"])
+        total["rodadas"].update(parcial["rodadas"])
+        for lado in (0, 1):
+            total["danos"][lado].update(parcial["danos"][lado])
+    return total
+
+def _lotes(lutas, semente):
+    rng = random.Random(semente)
+    while lutas > 0:
+        n = min(LOTE, lutas)
+        lutas -= n
+        yield n, rng.getrandbits(64)
+
+# ----------------------------
+# Pool de processos
+# ----------------------------
+# "spawn" em vez de fork: o bot tem threads (db.py) e fork com threads vivas
+# pode herdar locks travados.
+_pool = None
+
+def pool():
+    global _pool
+    if _pool is None:
+        processos = int(os.environ.get("RPG_SIMULADOR_PROCESSOS", "0")) or os.cpu_count() or 1
+        # Os processos novos reimportam dados.py: levam os limites que criar_bot() aplicou
+        _pool = ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context("spawn"),
+                                    initializer=dados.configurar, initargs=(dados.LIMITE_DADOS, dados.LIMITE_FACES))
+    return _pool
+
+def fechar():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+async def simular(a, b, lutas, semente=None):
+    """Roda `lutas` combates a x b no pool sem bloquear o event loop."""
+    loop = asyncio.get_running_loop()
+    tarefas = [loop.run_in_executor(pool(), simular_lote, a, b, n, s) for n, s in _lotes(lutas, semente)]
+    return _juntar(await asyncio.gather(*tarefas))
+
+def simular_sync(a, b, lutas, semente=None, executor=None):
+    executor = executor or pool()
+    futuros = [executor.submit(simular_lote, a, b, n, s) for n, s in _lotes(lutas, semente)]
+    return _juntar(f.result() for f in futuros)
+
+# ----------------------------
+# Resumo
+# ----------------------------
+def _percentis(contagem, fracoes=(0.1, 0.5, 0.9)):
+    total = sum(contagem.values())
+    if not total:
+        return {}
+    dist = {valor: n / total for valor, n in contagem.items()}
+    return {f"p{int(f * 100)}": probabilidade.percentil(dist, f) for f in fracoes}
+
+def resumo(resultado, a, b):
+    lutas = sum(resultado["vitorias"].values())
+    saida = {
+        "lutas": lutas,
+        "vitorias": [resultado["vitorias"][lado] / lutas for lado in (0, 1)],
+        "empates": resultado["vitorias"][None] / lutas,
+        "rodadas": _percentis(resultado["rodadas"]),
+        "dano_por_acerto": [],
+    }
+    for lado in (0, 1):
+        contagem = resultado["danos"][lado]
+        acertos = sum(contagem.values())
+        saida["dano_por_acerto"].append({
+            "media": (sum(v * n for v, n in contagem.items()) / acertos) if acertos else 0.0,
+            **_percentis(contagem),
+        })
+    return saida
+
+# ----------------------------
+# Linha de comando
+# ----------------------------
+def _carregar(conn, nome):
+    cursor = conn.execute("SELECT * FROM fichas_equipadas WHERE lower(nome) = ?", (nome.lower(),))
+    row = cursor.fetchone()
+    if row is None:
+        raise SystemExit(f"Ficha não encontrada: {nome}")
+    ficha = dict(zip((col[0] for col in cursor.description), row))
+    skills = conn.execute("SELECT nome_skill, dano_formula, tipo FROM skills WHERE user_id = ? AND nome_personagem = ?",
+                          (ficha["user_id"], ficha["nome"])).fetchall()
+    return combatente(ficha, skills)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simula combates entre duas fichas.")
+    parser.add_argument("a")
+    parser.add_argument("b")
+    parser.add_argument("-n", "--lutas", type=int, default=100000)
+    parser.add_argument("--db", default="rpg_fichas.db")
+    parser.add_argument("--processos", type=int, default=0)
+    parser.add_argument("--semente", type=int, default=None)
+    args = parser.parse_args(argv)
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        a, b = _carregar(conn, args.a), _carregar(conn, args.b)
+    finally:
+        conn.close()
+    with ProcessPoolExecutor(max_workers=args.processos or None) as executor:
+        res = resumo(simular_sync(a, b, args.lutas, args.semente, executor), a, b)
+    print(f"{res['lutas']} lutas — {a['nome']} x {b['nome']}")
+    for c, taxa in zip((a, b), res["vitorias"]):
+        print(f"  vitórias {c['nome']:<20} {taxa:7.2%}")
+    print(f"  empates {'':<21} {res['empates']:7.2%}")
+    print(f"  rodadas por luta: {res['rodadas']}")
+    for nome, dano in zip((a["nome"], b["nome"]), res["dano_por_acerto"]):
+        print(f"  dano por acerto de {nome}: média {dano['media']:.2f}, "
+              + ", ".join(f"{k} {v}" for k, v in dano.items() if k != "media"))
+
+if __name__ == "__main__":
+    sys.exit(main())
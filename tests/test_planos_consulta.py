@@ -0,0 +1,10 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import planos_consulta
+
+def test_nenhuma_consulta_varre_tabela(monkeypatch):
+    # main() aponta db.DB_FILE para um banco temporário; o monkeypatch devolve o caminho depois
+    monkeypatch.setattr(planos_consulta.db, "DB_FILE", planos_consulta.db.DB_FILE)
+    assert planos_consulta.main() == 0
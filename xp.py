@@ -0,0 +1,82 @@
+from bisect import bisect_right
+
+# ----------------------------
+# Curvas de XP
+# ----------------------------
+# Subir do nível n para o n+1 custa `base + passo * n` XP (padrão: 25 + n*5).
+# A curva guarda a tabela acumulada desde o nível 1, então "que nível tem quem
+# juntou X de XP" é um bisect e um ganho de XP de qualquer tamanho não precisa
+# andar nível por nível.
+class CurvaXP:
+    def __init__(self, base=25, passo=5, nivel_max=20):
+        self.base = base
+        self.passo = passo
+        self.nivel_max = nivel_max
+        # _acumulado[i] = XP total para chegar ao nível i+1 (índice 0 = nível 1)
+        self._acumulado = [0]
+        for nivel in range(1, nivel_max):
+            self._acumulado.append(self._acumulado[-1] + self.custo(nivel))
+
+    def custo(self, nivel):
+        """XP necessário para sair de `nivel` e chegar ao seguinte."""
+        return self.base + self.passo * nivel
+
+    def xp_para_proximo(self, nivel):
+        return self.custo(nivel)
+
+    def total(self, nivel, xp=0):
+        """XP total acumulado de quem está em `nivel` com `xp` na barra."""
+        nivel = max(1, min(nivel, self.nivel_max))
+        return self._acumulado[nivel - 1] + xp
+
+    def nivel_por_total(self, total):
+        """Nível (1..nivel_max) e XP restante na barra para um total de XP."""
+        nivel = max(1, bisect_right(self._acumulado, total))
+        return nivel, total - self._acumulado[nivel - 1]
+
+    def aplicar(self, nivel, xp, quantidade):
+        """
+        Soma `quantidade` de XP e devolve (novo_nivel, novo_xp, niveis_ganhos).
+        XP não desce de nível: uma quantidade negativa no máximo zera a barra.
+        """
+        novo_nivel, novo_xp = self.nivel_por_total(max(self.total(nivel, xp) + quantidade, self.total(nivel)))
+        return novo_nivel, novo_xp, max(0, novo_nivel - max(1, nivel))
+
+PADRAO = CurvaXP()
+
+# ----------------------------
+# Curvas por campanha (servidor)
+# ----------------------------
+# RPG_CURVAS_XP="<guild_id>=<base>:<passo>[:<nivel_max>];..." troca a curva de
+# um servidor específico; os demais usam a PADRAO. O texto é lido em
+# config.carregar() (ler_curvas) e as curvas entram em criar_bot().
+_curvas = {}
+
+def registrar_curva(guild_id, curva):
+    _curvas[str(guild_id)] = curva
+
+def curva(guild_id=None):
+    if guild_id is None:
+        return PADRAO
+    return _curvas.get(str(guild_id), PADRAO)
+
+def ler_curvas(texto):
+    """{guild_id: CurvaXP} a partir do texto de RPG_CURVAS_XP. Levanta ValueError se estiver mal formado."""
+    curvas = {}
+    for item in filter(None, (parte.strip() for parte in texto.split(";"))):
+        guild_id, _, valores = item.partition("=")
+        try:
+            numeros = [int(v) for v in valores.split(":")]
+            if not guild_id.strip() or not 2 <= len(numeros) <= 3 or (len(numeros) == 3 and numeros[2] < 1):
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"RPG_CURVAS_XP: '{item}' não está no formato <guild_id>=<base>:<passo>[:<nivel_max>]") from None
+        # Custo de nível sempre >= 1 e sem descer: a tabela acumulada precisa crescer para o bisect
+        if numeros[0] < 1 or numeros[1] < 0:
+            raise ValueError(f"RPG_CURVAS_XP: '{item}' precisa de base >= 1 e passo >= 0")
+        curvas[guild_id.strip()] = CurvaXP(*numeros)
+    return curvas
+
+def carregar_curvas(curvas):
+    for guild_id, curva_servidor in curvas.items():
+        registrar_curva(guild_id, curva_servidor)